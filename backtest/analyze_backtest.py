@@ -1,20 +1,19 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+from autobot_trader.signal_store import read_signals
+from autobot_trader.metrics import pair_trades, equity_curve, max_drawdown, summarize_trades
 
 TRADING_FEE = 0.001  # 0.1% 수수료
 
 def load_log(strategy_name):
     # 항상 analyze_backtest.py 기준으로 파일을 찾음
-    file_path = os.path.join(os.path.dirname(__file__), f"backtest_{strategy_name}.csv")
-    df = pd.read_csv(file_path, names=["time", "ticker", "strategy", "signal", "price"])
-    df["time"] = pd.to_datetime(df["time"])
-    return df
+    base_dir = os.path.dirname(__file__)
+    return read_signals(strategy_name, root=os.path.join(base_dir, "signals"),
+                        legacy_csv=os.path.join(base_dir, f"backtest_{strategy_name}.csv"))
 
-def calculate_mdd(equity_curve):
-    peak = equity_curve.cummax()
-    drawdown = (equity_curve - peak) / peak
-    return drawdown.min() * 100
+def calculate_mdd(curve):
+    return max_drawdown(curve)
 
 def plot_signals(df, strategy):
     df_sorted = df.sort_values("time")
@@ -35,28 +34,15 @@ def plot_signals(df, strategy):
     plt.show()
 
 def calculate_profit(df, fee=TRADING_FEE):
-    df = df.sort_values("time")
-    buys = df[df["signal"] == "buy"].reset_index(drop=True)
-    sells = df[df["signal"] == "sell"].reset_index(drop=True)
+    trades = equity_curve(pair_trades(df, fee))
+    trades["profit_pct"] = trades["return_pct"]
+    summary = summarize_trades(trades)
 
-    trade_count = min(len(buys), len(sells))
-    trades = pd.DataFrame({
-        "buy_time": buys["time"].iloc[:trade_count],
-        "buy_price": buys["price"].iloc[:trade_count],
-        "sell_time": sells["time"].iloc[:trade_count],
-        "sell_price": sells["price"].iloc[:trade_count]
-    })
-
-    trades["profit_pct"] = (trades["sell_price"] * (1 - fee) - trades["buy_price"] * (1 + fee)) / (trades["buy_price"] * (1 + fee)) * 100
-    trades["cumulative"] = (1 + trades["profit_pct"] / 100).cumprod()
-    trades["cum_max"] = trades["cumulative"].cummax()
-    trades["drawdown"] = trades["cumulative"] / trades["cum_max"] - 1
-    max_dd = trades["drawdown"].min() * 100
-
-    total_profit = trades["profit_pct"].sum()
     print(trades)
-    print(f"\n📈 누적 수익률: {total_profit:.2f}%")
-    print(f"💥 최대 낙폭(MDD): {max_dd:.2f}%")
+    print(f"\n📈 누적 수익률: {summary['total_return']:.2f}%")
+    print(f"💥 최대 낙폭(MDD): {summary['mdd']:.2f}%")
+    print(f"📊 샤프: {summary['sharpe']:.2f} | 소르티노: {summary['sortino']:.2f} | 승률: {summary['win_rate']:.1f}% | "
+          f"노출: {summary['exposure'] * 100:.1f}% | 연간 회전: {summary['turnover']:.1f}회")
     return trades
 
 def compare_strategies(strategies):
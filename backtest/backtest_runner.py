@@ -1,10 +1,10 @@
-import pyupbit
 import pandas as pd
 from datetime import datetime, timedelta
-from autobot_trader.strategies.moving_average import get_moving_average_signal
-from autobot_trader.strategies.rsi import get_rsi_signal
-from autobot_trader.strategies.bollinger import get_bollinger_signal
-from autobot_trader.log_signal import log_signal
+from autobot_trader.strategies.moving_average import compute_moving_average_signals
+from autobot_trader.strategies.rsi import compute_rsi_signals
+from autobot_trader.strategies.bollinger import compute_bollinger_signals
+from autobot_trader.signal_store import write_signals
+from autobot_trader import candle_store
 
 # 백테스트 대상 코인
 TICKERS = ["KRW-BTC", "KRW-ETH", "KRW-TRX", "KRW-SOL"]
@@ -13,24 +13,30 @@ TO = datetime.now()
 FROM = TO - timedelta(days=365)
 
 def fetch_ohlcv(ticker):
-    return pyupbit.get_ohlcv(ticker, interval="day", to=TO.strftime("%Y-%m-%d"))
+    return candle_store.get_ohlcv(ticker, interval="day", to=TO.strftime("%Y-%m-%d"))
 
-def simulate_strategy(strategy_name, strategy_func):
+def load_frames():
+    """티커별 데이터는 한 번만 받아서 모든 전략이 같이 사용"""
+    frames = {}
     for ticker in TICKERS:
         df = fetch_ohlcv(ticker)
         if df is None:
             print(f"❌ {ticker} 데이터 없음")
             continue
+        frames[ticker] = df
+    return frames
 
-        for i in range(30, len(df)):
-            sliced = df.iloc[:i].copy()
-            price = df.iloc[i]["close"]
-            signal = strategy_func(sliced)
+def simulate_strategy(strategy_name, strategy_func, frames=None):
+    frames = load_frames() if frames is None else frames
+    for ticker, df in frames.items():
 
-            if signal in ["buy", "sell"]:
-                log_signal(strategy_name, ticker, signal, price, backtest=True)
+        # i 번째 봉의 체결은 i-1 번째 봉까지의 시그널 기준 → 한 칸 shift
+        signals = strategy_func(df)["signal"].shift(1).iloc[30:]
+        rows = df.iloc[30:][signals.isin(["buy", "sell"])]
+        write_signals(strategy_name, rows.index, [ticker] * len(rows), signals.loc[rows.index], rows["close"])
 
 if __name__ == "__main__":
-    simulate_strategy("moving_average", get_moving_average_signal)
-    simulate_strategy("rsi", get_rsi_signal)
-    simulate_strategy("bollinger", get_bollinger_signal)
+    frames = load_frames()
+    simulate_strategy("moving_average", compute_moving_average_signals, frames)
+    simulate_strategy("rsi", compute_rsi_signals, frames)
+    simulate_strategy("bollinger", compute_bollinger_signals, frames)
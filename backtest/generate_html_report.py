@@ -1,34 +1,35 @@
 from jinja2 import Environment, FileSystemLoader
 import pandas as pd
 import os
+from autobot_trader.signal_store import read_signals
+from autobot_trader.metrics import pair_trades, summarize_trades, report_rows
 
 TRADING_FEE = 0.001
+# 실행 위치와 관계없이 저장소 루트 기준으로 경로 계산 (백테스트 시그널은 backtest/signals)
+BACKTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BACKTEST_DIR)
+SIGNAL_ROOT = os.path.join(BACKTEST_DIR, "signals")
 
 def generate_report(strategy):
-    df = pd.read_csv(f"backtest_{strategy}.csv", names=["time", "ticker", "strategy", "signal", "price"])
-    df = df.sort_values("time")
-    buys = df[df["signal"] == "buy"].reset_index(drop=True)
-    sells = df[df["signal"] == "sell"].reset_index(drop=True)
-
-    trades = pd.DataFrame({
-        "buy": buys["price"].values[:len(sells)],
-        "sell": sells["price"].values[:len(buys)]
-    })
-    trades["profit"] = ((trades["sell"] * (1 - TRADING_FEE) - trades["buy"] * (1 + TRADING_FEE)) / (trades["buy"] * (1 + TRADING_FEE))) * 100
-    trades["profit"] = trades["profit"].round(2)
-
-    cumulative_return = trades["profit"].sum()
-
-    env = Environment(loader=FileSystemLoader("."))
+    df = read_signals(strategy, root=SIGNAL_ROOT, legacy_csv=os.path.join(BACKTEST_DIR, f"backtest_{strategy}.csv"))
+    if df.empty:
+        print(f"❌ 백테스트 기록 없음: {strategy}")
+        return
+    trades = pair_trades(df, TRADING_FEE)
+    summary = summarize_trades(trades)
+    cumulative_return = summary["total_return"]
+
+    env = Environment(loader=FileSystemLoader(BASE_DIR))
     template = env.get_template("report_template.html")
 
     output = template.render(
         strategy=strategy,
         cumulative_return=round(cumulative_return, 2),
-        trades=trades.to_dict(orient="records")
+        mdd=round(summary["mdd"], 2),
+        trades=report_rows(trades)
     )
 
-    with open(f"report_{strategy}.html", "w", encoding="utf-8") as f:
+    with open(os.path.join(BASE_DIR, f"report_{strategy}.html"), "w", encoding="utf-8") as f:
         f.write(output)
     print(f"✅ HTML 보고서 생성 완료: report_{strategy}.html")
 
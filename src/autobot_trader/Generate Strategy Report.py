@@ -1,7 +1,16 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import glob
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")  # 화면 없이 파일로만 그림
+from matplotlib.figure import Figure
 from jinja2 import Environment, FileSystemLoader
+from autobot_trader.signal_store import read_signals
+from autobot_trader.strategy_registry import STRATEGIES
+from autobot_trader.metrics import pair_trades, equity_curve, summarize_trades, report_rows
 
 TRADING_FEE = 0.001
 
@@ -9,58 +18,81 @@ TRADING_FEE = 0.001
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 BACKTEST_DIR = os.path.join(BASE_DIR, "backtest")
 REPORT_DIR = BASE_DIR
+CACHE_PATH = os.path.join(REPORT_DIR, ".report_cache.json")  # 전략 → 마지막 빌드 입력 해시
+STRATEGY_LIST = list(STRATEGIES)
+
+_TEMPLATE = None  # 프로세스마다 한 번만 컴파일
 
 def load_backtest(strategy_name):
     path = os.path.join(BACKTEST_DIR, f"backtest_{strategy_name}.csv")
-    if not os.path.exists(path):
-        print(f"❌ 파일 없음: {path}")
+    df = read_signals(strategy_name, root=os.path.join(BACKTEST_DIR, "signals"), legacy_csv=path)
+    if df.empty:
+        print(f"❌ 백테스트 기록 없음: {strategy_name}")
         return None
-    df = pd.read_csv(path, names=["time", "ticker", "strategy", "signal", "price"])
-    df["time"] = pd.to_datetime(df["time"])
     return df
 
 def analyze_trades(df):
-    buys = df[df["signal"] == "buy"].reset_index(drop=True)
-    sells = df[df["signal"] == "sell"].reset_index(drop=True)
-    trade_count = min(len(buys), len(sells))
+    trades = equity_curve(pair_trades(df, TRADING_FEE))
+    summary = summarize_trades(trades)
+    return trades, summary["total_return"], summary["mdd"]
+
+def input_hash(strategy_name):
+    """백테스트 입력 파일 해시 (시그널 파트 파일은 추가만 되므로 경로/크기로, 예전 CSV 와 템플릿은 내용으로)"""
+    digest = hashlib.sha256()
+    with open(os.path.join(REPORT_DIR, "report_template.html"), "rb") as f:
+        digest.update(f.read())
+    parts = sorted(glob.glob(os.path.join(BACKTEST_DIR, "signals", strategy_name, "*", "*.npz")))
+    for path in parts:
+        digest.update(f"{os.path.relpath(path, BACKTEST_DIR)}:{os.path.getsize(path)}\n".encode())
+    legacy = os.path.join(BACKTEST_DIR, f"backtest_{strategy_name}.csv")
+    if not parts and os.path.exists(legacy):
+        with open(legacy, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
 
-    trades = pd.DataFrame({
-        "buy_time": buys["time"].iloc[:trade_count],
-        "buy_price": buys["price"].iloc[:trade_count],
-        "sell_time": sells["time"].iloc[:trade_count],
-        "sell_price": sells["price"].iloc[:trade_count],
-    })
-    trades["return_pct"] = ((trades["sell_price"] * (1 - TRADING_FEE) - trades["buy_price"] * (1 + TRADING_FEE)) / (trades["buy_price"] * (1 + TRADING_FEE))) * 100
-    trades["cumulative"] = (1 + trades["return_pct"] / 100).cumprod()
-    trades["drawdown"] = trades["cumulative"] / trades["cumulative"].cummax() - 1
+def load_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
-    total_return = trades["cumulative"].iloc[-1] - 1
-    max_dd = trades["drawdown"].min() * 100
+def save_cache(cache):
+    tmp_path = CACHE_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, CACHE_PATH)
 
-    return trades, total_return * 100, max_dd
+def get_template():
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        env = Environment(loader=FileSystemLoader(REPORT_DIR))
+        _TEMPLATE = env.get_template("report_template.html")
+    return _TEMPLATE
 
 def plot_performance(trades, strategy):
-    plt.figure(figsize=(12, 6))
-    plt.plot(trades["sell_time"], trades["cumulative"], label=strategy)
-    plt.title(f"{strategy.upper()} 누적 수익률")
-    plt.xlabel("Date")
-    plt.ylabel("Cumulative Return")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
+    # pyplot 전역 상태 없이 Figure 를 직접 만들어 Agg 로 저장
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.plot(trades["sell_time"], trades["cumulative"], label=strategy)
+    ax.set_title(f"{strategy.upper()} 누적 수익률")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Cumulative Return")
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
     img_path = os.path.join(REPORT_DIR, f"report_{strategy}.png")
-    plt.savefig(img_path)
-    plt.close()
+    fig.savefig(img_path)
     return img_path
 
 def render_html_report(strategy, trades, total_return, max_dd, img_path):
-    env = Environment(loader=FileSystemLoader(REPORT_DIR))
-    template = env.get_template("report_template.html")
-    output = template.render(
+    output = get_template().render(
         strategy=strategy,
-        trades=trades.round(2).to_dict(orient="records"),
+        trades=report_rows(trades),
         total_return=round(total_return, 2),
+        cumulative_return=round(total_return, 2),
         max_dd=round(max_dd, 2),
+        mdd=round(max_dd, 2),
         image_path=os.path.basename(img_path)
     )
     html_path = os.path.join(REPORT_DIR, f"report_{strategy}.html")
@@ -68,19 +100,34 @@ def render_html_report(strategy, trades, total_return, max_dd, img_path):
         f.write(output)
     print(f"✅ {html_path} 생성 완료")
 
-def generate_all_reports():
-    strategy_list = [
-        "moving_average", "rsi", "bollinger",
-        "trend_following", "grid_trading",
-        "volatility_breakout", "momentum"
+def build_report(strategy):
+    """전략 하나의 리포트 생성 (워커 프로세스에서 실행) → 성공 여부"""
+    df = load_backtest(strategy)
+    if df is None or df.empty:
+        return False
+    trades, total_return, max_dd = analyze_trades(df)
+    img_path = plot_performance(trades, strategy)
+    render_html_report(strategy, trades, total_return, max_dd, img_path)
+    return True
+
+def generate_all_reports(strategy_list=STRATEGY_LIST, force=False, workers=None):
+    cache = load_cache()
+    hashes = {strategy: input_hash(strategy) for strategy in strategy_list}
+    targets = [
+        strategy for strategy in strategy_list
+        if force or cache.get(strategy) != hashes[strategy]
+        or not os.path.exists(os.path.join(REPORT_DIR, f"report_{strategy}.html"))
     ]
-    for strategy in strategy_list:
-        df = load_backtest(strategy)
-        if df is None or df.empty:
-            continue
-        trades, total_return, max_dd = analyze_trades(df)
-        img_path = plot_performance(trades, strategy)
-        render_html_report(strategy, trades, total_return, max_dd, img_path)
+    for strategy in (s for s in strategy_list if s not in targets):
+        print(f"⏭️ {strategy} 변경 없음, 건너뜀")
+    if not targets:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers or min(len(targets), os.cpu_count() or 1)) as pool:
+        for strategy, built in zip(targets, pool.map(build_report, targets)):
+            if built:
+                cache[strategy] = hashes[strategy]
+    save_cache(cache)
 
 if __name__ == "__main__":
     generate_all_reports()
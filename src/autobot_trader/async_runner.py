@@ -0,0 +1,160 @@
+# src/autobot_trader/async_runner.py
+# schedule 루프를 대체하는 asyncio 기반 전략 실행기
+# - 같은 시각에 도래한 (전략, 티커) 작업을 동시에 실행 (블로킹 HTTP 호출은 스레드로 위임)
+# - 세마포어 + 초당 시작 횟수 제한으로 업비트 요청 제한 준수
+# - 작업별 지연(예정 시각 대비 시작 지연)과 실행 시간 기록
+# - submit() 으로 봉 마감 같은 이벤트 작업도 같은 제한 아래 실행
+# - interval 작업은 해당 인터벌 봉 마감 시각(candle_scheduler)에 맞춰 실행
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+
+from autobot_trader.candle_scheduler import CLOSE_DELAY, next_candle_close
+
+MAX_CONCURRENT_JOBS = 8     # 동시에 실행할 작업 수
+MAX_JOB_STARTS_PER_SEC = 8  # 업비트 시세 API 초당 10회 제한 이내로 작업 시작 분산
+LATENCY_HISTORY = 100       # 작업별 보관할 최근 실행 기록 수
+
+
+class Job:
+    """주기(every, 초), 매일 특정 시각(at, "HH:MM") 또는 봉 마감(interval)마다 실행되는 작업
+
+    run 을 주면 실행기의 기본 함수 대신 run(name, func, ticker) 로 실행
+    """
+
+    def __init__(self, name, func, ticker, every=None, at=None, interval=None, run=None):
+        self.name = name
+        self.func = func
+        self.ticker = ticker
+        self.every = every
+        self.at = at
+        self.interval = interval
+        self.run = run
+        self.running = False
+        self.next_run = self._next_after(time.time())
+
+    @property
+    def key(self):
+        return f"{self.name}:{self.ticker}"
+
+    def _next_after(self, now):
+        if self.interval is not None:
+            return next_candle_close(self.interval, now) + CLOSE_DELAY
+        if self.at is None:
+            return now + self.every
+        hour, minute = map(int, self.at.split(":"))
+        current = datetime.fromtimestamp(now)
+        target = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= current:
+            target += timedelta(days=1)
+        return target.timestamp()
+
+    def schedule_next(self):
+        # 밀린 실행은 한 번으로 합치고 다음 예정 시각은 원래 주기에 맞춤
+        now = time.time()
+        while self.next_run <= now:
+            self.next_run = self._next_after(self.next_run)
+
+
+class RateLimiter:
+    """초당 시작 횟수 제한 (시작 간격을 1/rate 초 이상으로 유지)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncStrategyRunner:
+    def __init__(self, run_func, max_concurrency=MAX_CONCURRENT_JOBS, rate=MAX_JOB_STARTS_PER_SEC):
+        self.run_func = run_func
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.jobs = []
+        self.latency = defaultdict(lambda: deque(maxlen=LATENCY_HISTORY))  # key → (시작 지연, 실행 시간)
+        self.tasks = set()
+        self.semaphore = None
+        self.limiter = None
+
+    def _ensure_limits(self):
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.limiter = RateLimiter(self.rate)
+
+    def add_job(self, name, func, ticker, every=None, at=None, interval=None, run=None):
+        job = Job(name, func, ticker, every=every, at=at, interval=interval, run=run)
+        self.jobs.append(job)
+        return job
+
+    def submit(self, key, func, *args, scheduled_at=None):
+        """이벤트(봉 마감 등)로 발생한 작업을 즉시 실행 (이벤트 루프 안에서 호출)"""
+        self._ensure_limits()
+        task = asyncio.create_task(self._run_call(key, scheduled_at or time.time(), func, *args))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def run_forever(self):
+        self._ensure_limits()
+        while True:
+            now = time.time()
+            for job in self.jobs:
+                if job.next_run > now:
+                    continue
+                scheduled_at = job.next_run
+                job.schedule_next()
+                if job.running:
+                    print(f"⏭️ [{job.key}] 이전 실행이 끝나지 않아 건너뜀")
+                    continue
+                job.running = True
+                task = asyncio.create_task(self._run_job(job, scheduled_at))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+            # 가장 가까운 다음 실행 시각까지 정확히 대기
+            wake_at = min((job.next_run for job in self.jobs), default=now + 1)
+            await asyncio.sleep(max(0.0, wake_at - time.time()))
+
+    async def _run_job(self, job, scheduled_at):
+        try:
+            await self._run_call(job.key, scheduled_at, job.run or self.run_func, job.name, job.func, job.ticker)
+        finally:
+            job.running = False
+
+    async def _run_call(self, key, scheduled_at, func, *args):
+        async with self.semaphore:
+            await self.limiter.wait()
+            started = time.time()
+            try:
+                await asyncio.to_thread(func, *args)
+            except Exception as e:
+                print(f"⚠️ [{key}] 작업 실행 오류: {e}")
+            finished = time.time()
+        self.latency[key].append((started - scheduled_at, finished - started))
+
+    def latency_report(self):
+        """작업별 평균/최대 시작 지연과 실행 시간 (초)"""
+        report = {}
+        for key, samples in self.latency.items():
+            if not samples:
+                continue
+            delays = [delay for delay, _ in samples]
+            durations = [duration for _, duration in samples]
+            report[key] = {
+                "runs": len(samples),
+                "avg_delay": sum(delays) / len(delays),
+                "max_delay": max(delays),
+                "avg_duration": sum(durations) / len(durations),
+                "max_duration": max(durations),
+            }
+        return report
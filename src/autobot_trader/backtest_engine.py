@@ -0,0 +1,153 @@
+# src/autobot_trader/backtest_engine.py
+# 메모리 내 이벤트 기반 백테스트 엔진
+# - 시그널은 전략의 벡터화 함수(compute_*_signals)로 한 번에 계산
+# - run_multi_coin 과 같은 시그널 규약 적용: buy 는 amount(기본 전략 예산)만큼 매수,
+#   sell 은 amount=None → 해당 전략 보유 수량 전량 매도
+# - 익절/손절(봉 고가/저가 기준), 수수료, 슬리피지, 중복 매수 쿨다운, 전략별 예산 내 현금/포지션 추적
+#   (쿨다운은 실거래와 같이 마지막 체결이 매수일 때만 적용 → 매도 후 바로 다시 매수 가능)
+
+import numpy as np
+import pandas as pd
+
+from autobot_trader.metrics import curve_sharpe, max_drawdown
+from autobot_trader.strategy_registry import get_compute_function
+from autobot_trader.settings import (
+    STRATEGY_BUDGETS, DUPLICATE_BUY_COOLDOWN, TAKE_PROFIT, STOP_LOSS, MIN_ORDER_KRW,
+)
+
+FEE_RATE = 0.0005   # 업비트 KRW 마켓 수수료 0.05%
+SLIPPAGE = 0.0005   # 시장가 체결 슬리피지 가정 0.05%
+
+TRADE_COLUMNS = [
+    "time", "ticker", "strategy", "side", "price", "volume", "value", "fee", "reason", "pnl",
+]
+
+
+def get_signal_function(strategy_name):
+    """전략 이름 → 벡터화 시그널 함수 (전략 레지스트리의 compute 항목)"""
+    return get_compute_function(strategy_name)
+
+
+def run_backtest(df, strategy_name, ticker="KRW-BTC", signals=None, params=None,
+                 budget=None, initial_cash=None, fee=FEE_RATE, slippage=SLIPPAGE,
+                 take_profit=TAKE_PROFIT, stop_loss=STOP_LOSS, cooldown=None):
+    """단일 전략 백테스트 → (trades, equity) DataFrame
+
+    signals 를 주지 않으면 전략의 벡터화 함수로 계산하며 params 는 그 함수에 전달된다.
+    trades: 체결 내역 (익절/손절 포함), equity: 봉별 현금/보유 평가액/총자산
+    """
+    if signals is None:
+        signals = get_signal_function(strategy_name)(df, **(params or {}))["signal"]
+    budget = STRATEGY_BUDGETS.get(strategy_name, 10000) if budget is None else budget
+    start_cash = float(budget if initial_cash is None else initial_cash)
+    cooldown = DUPLICATE_BUY_COOLDOWN.get(strategy_name, 30) if cooldown is None else cooldown
+
+    index = df.index
+    times = index.values.astype("datetime64[s]").astype(np.int64)
+    closes = df["close"].to_numpy(dtype=np.float64)
+    highs = df["high"].to_numpy(dtype=np.float64)
+    lows = df["low"].to_numpy(dtype=np.float64)
+    codes = _signal_codes(signals)
+
+    # 포지션이 없을 때는 시그널이 있는 봉만 보면 되므로 이벤트 봉 위치를 미리 추려 둠
+    event_bars = np.flatnonzero(codes != 0)
+    cash_delta = np.zeros(len(df))
+    volume_delta = np.zeros(len(df))
+    trades = []
+
+    cash = start_cash
+    volume = cost = 0.0
+    last_buy_time = None   # 마지막 체결이 매수면 그 시각, 매도 후에는 None
+
+    def buy(bar, price, amount):
+        volume_filled = amount / (price * (1 + fee))
+        value = price * volume_filled
+        fee_paid = value * fee
+        cash_delta[bar] -= value + fee_paid
+        volume_delta[bar] += volume_filled
+        trades.append((index[bar], ticker, strategy_name, "buy", price, volume_filled, value, fee_paid, "signal", 0.0))
+        return volume_filled, value + fee_paid
+
+    def sell(bar, price, reason):
+        value = price * volume
+        fee_paid = value * fee
+        proceeds = value - fee_paid
+        cash_delta[bar] += proceeds
+        volume_delta[bar] -= volume
+        trades.append((index[bar], ticker, strategy_name, "sell", price, volume, value, fee_paid, reason, proceeds - cost))
+        return proceeds
+
+    i = 0
+    while i < len(df):
+        if volume == 0:
+            # 보유 중이 아니면 다음 시그널 봉으로 바로 이동
+            pos = np.searchsorted(event_bars, i)
+            if pos >= len(event_bars):
+                break
+            i = event_bars[pos]
+        else:
+            entry = cost / volume
+            stop_price = entry * (1 + stop_loss)
+            target_price = entry * (1 + take_profit)
+            exit_price, reason = None, None
+            if lows[i] <= stop_price:
+                exit_price, reason = min(stop_price, closes[i]) * (1 - slippage), "stop_loss"
+            elif highs[i] >= target_price:
+                exit_price, reason = max(target_price, closes[i]) * (1 - slippage), "take_profit"
+            if exit_price is not None:
+                cash += sell(i, exit_price, reason)
+                volume = cost = 0.0
+                last_buy_time = None
+                i += 1
+                continue
+
+        code = codes[i]
+        if code == 1:
+            in_cooldown = last_buy_time is not None and (times[i] - last_buy_time) < cooldown * 60
+            amount = min(budget, cash)
+            if not in_cooldown and amount >= MIN_ORDER_KRW:
+                volume_filled, spent = buy(i, closes[i] * (1 + slippage), amount)
+                cash -= spent
+                cost += spent
+                volume += volume_filled
+                last_buy_time = times[i]
+        elif code == -1 and volume > 0:
+            cash += sell(i, closes[i] * (1 - slippage), "signal")
+            volume = cost = 0.0
+            last_buy_time = None
+        i += 1
+
+    volume_curve = np.cumsum(volume_delta)
+    equity = pd.DataFrame({
+        "cash": start_cash + np.cumsum(cash_delta),
+        "position": volume_curve,
+        "position_value": volume_curve * closes,
+    }, index=index)
+    equity["equity"] = equity["cash"] + equity["position_value"]
+    return pd.DataFrame(trades, columns=TRADE_COLUMNS), equity
+
+
+def summarize(trades, equity):
+    """총수익률/MDD/샤프지수/거래 수/승률 요약"""
+    curve = equity["equity"]
+    start = curve.iloc[0] if len(curve) else 0
+    sells = trades[trades["side"] == "sell"] if not trades.empty else trades
+    return {
+        "total_return": (curve.iloc[-1] / start - 1) * 100 if start else 0.0,
+        "mdd": max_drawdown(curve),
+        "sharpe": curve_sharpe(curve),
+        "trade_count": len(sells),
+        "win_rate": (sells["pnl"] > 0).mean() * 100 if len(sells) else 0.0,
+    }
+
+
+def run_all(df, ticker="KRW-BTC", strategies=None, **kwargs):
+    """여러 전략을 같은 데이터로 백테스트 → 전략 이름 → (trades, equity)"""
+    strategies = strategies or list(STRATEGY_BUDGETS)
+    return {name: run_backtest(df, name, ticker=ticker, **kwargs) for name in strategies}
+
+
+def _signal_codes(signals):
+    """'buy' / 'sell' / None 시그널 컬럼 → 1 / -1 / 0 정수 배열"""
+    values = np.asarray(signals, dtype=object)
+    return np.where(values == "buy", 1, np.where(values == "sell", -1, 0)).astype(np.int8)
@@ -0,0 +1,108 @@
+# src/autobot_trader/backtest_matrix.py
+# 티커 × 전략 일괄 백테스트
+# - (티커, 인터벌) 별 OHLCV 는 candle_store 로 한 번만 로딩 (디스크 캐시로 다음 실행은 부족분만 수신)
+# - 로딩한 프레임은 공유 메모리에 올리고 티커 × 전략 조합을 프로세스 풀로 병렬 백테스트
+# - 결과는 하나의 CSV 로 저장
+#
+# 사용 예) python -m autobot_trader.backtest_matrix --all --interval day --count 365
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyupbit
+
+from autobot_trader import candle_store
+from autobot_trader.backtest_engine import run_backtest, summarize
+from autobot_trader.settings import STRATEGY_BUDGETS
+from autobot_trader.shared_frames import FRAMES, share_frames, attach_frames, release
+
+RESULT_DIR = "backtest"
+DEFAULT_TICKERS = ["KRW-BTC", "KRW-ETH", "KRW-TRX", "KRW-SOL"]
+MIN_ROWS = 30   # 이보다 짧은 이력(신규 상장 등)은 제외
+
+
+def load_frames(tickers, interval="day", count=365, to=None):
+    """티커 → OHLCV DataFrame (티커당 한 번만 조회, 실패/데이터 부족 티커는 제외)"""
+    frames = {}
+    for ticker in tickers:
+        try:
+            df = candle_store.get_ohlcv(ticker, interval=interval, count=count, to=to)
+        except Exception as e:
+            print(f"⚠️ {ticker} 데이터 로딩 오류: {e}")
+            continue
+        if df is None or len(df) < MIN_ROWS:
+            print(f"❌ {ticker} 데이터 없음")
+            continue
+        frames[ticker] = df
+    return frames
+
+
+def _evaluate(job):
+    ticker, strategy = job
+    df = FRAMES[ticker]
+    try:
+        trades, equity = run_backtest(df, strategy, ticker=ticker)
+        result = summarize(trades, equity)
+    except Exception as e:
+        print(f"⚠️ {ticker} {strategy} 백테스트 오류: {e}")
+        return None
+    return {
+        "ticker": ticker,
+        "strategy": strategy,
+        "start": df.index[0],
+        "end": df.index[-1],
+        "bars": len(df),
+        **result,
+    }
+
+
+def run_matrix(frames, strategies=None, workers=None):
+    """{티커: df} × 전략 전체를 병렬 백테스트 → 결과 DataFrame (티커, 수익률 순 정렬)"""
+    strategies = strategies or list(STRATEGY_BUDGETS)
+    jobs = [(ticker, name) for ticker in frames for name in strategies]
+    if not jobs:
+        return pd.DataFrame()
+    print(f"🧮 {len(frames)}개 티커 × {len(strategies)}개 전략 = {len(jobs)}건 백테스트 (워커 {workers or os.cpu_count()}개)")
+
+    blocks, metas = share_frames(frames)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_frames, initargs=(metas,)) as pool:
+            results = [r for r in pool.map(_evaluate, jobs, chunksize=max(1, len(jobs) // 64)) if r]
+    finally:
+        release(blocks)
+
+    table = pd.DataFrame(results)
+    if table.empty:
+        return table
+    return table.sort_values(["ticker", "total_return"], ascending=[True, False]).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="티커 × 전략 일괄 백테스트")
+    parser.add_argument("--tickers", nargs="*", default=None)
+    parser.add_argument("--all", action="store_true", help="KRW 마켓 전체 티커")
+    parser.add_argument("--interval", default="day")
+    parser.add_argument("--count", type=int, default=365)
+    parser.add_argument("--strategies", nargs="*", default=None, choices=list(STRATEGY_BUDGETS))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    tickers = pyupbit.get_tickers(fiat="KRW") if args.all else (args.tickers or DEFAULT_TICKERS)
+    frames = load_frames(tickers, interval=args.interval, count=args.count)
+    table = run_matrix(frames, args.strategies, workers=args.workers)
+    if table.empty:
+        print("❌ 백테스트 결과 없음")
+        return
+
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    path = os.path.join(RESULT_DIR, f"matrix_{args.interval}.csv")
+    table.to_csv(path, index=False)
+    best = table.sort_values("total_return", ascending=False).head(20)
+    print(best.to_string(index=False))
+    print(f"✅ 결과 저장: {path} ({len(table)}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,42 @@
-import pyupbit
-import pandas as pd
-from datetime import datetime
-from autobot_trader.log_signal import log_signal
-
-# 백테스트 파라미터
-TAKE_PROFIT = 0.05   # 5% 익절
-STOP_LOSS = -0.03    # -3% 손절
+from autobot_trader.signal_store import write_signals
+from autobot_trader import candle_store
+from autobot_trader.backtest_engine import run_backtest, summarize
+from autobot_trader.settings import TAKE_PROFIT, STOP_LOSS
+from autobot_trader.strategy_registry import STRATEGIES, get_compute_function
 
 def backtest_strategy(strategy_func, strategy_name, ticker="KRW-BTC", interval="day", count=365):
-    df = pyupbit.get_ohlcv(ticker, interval=interval, count=count)
+    """strategy_func 은 compute_*_signals 형태의 벡터화 함수 (전체 봉 시그널을 한 번에 계산)"""
+    df = candle_store.get_ohlcv(ticker, interval=interval, count=count)
     if df is None or df.empty:
         print(f"❌ 데이터 로딩 실패: {ticker}")
         return
 
-    holding = False
-    buy_price = 0
-
-    for i in range(1, len(df)):
-        current = df.iloc[i]
-        current_time = current.name.strftime("%Y-%m-%d %H:%M:%S")
-        price = current["close"]
+    try:
+        signals = strategy_func(df)["signal"]
+    except Exception as e:
+        print(f"⚠️ {strategy_name} 시그널 오류: {e}")
+        return
 
-        if holding:
-            pnl = (price - buy_price) / buy_price
-            if pnl >= TAKE_PROFIT:
-                log_signal(strategy_name, ticker, "sell", price, backtest=True)
-                print(f"[익절] {current_time} {ticker} {price} 수익률: {pnl*100:.2f}%")
-                holding = False
-                continue
-            elif pnl <= STOP_LOSS:
-                log_signal(strategy_name, ticker, "sell", price, backtest=True)
-                print(f"[손절] {current_time} {ticker} {price} 수익률: {pnl*100:.2f}%")
-                holding = False
-                continue
+    trades, equity = run_backtest(df, strategy_name, ticker=ticker, signals=signals,
+                                  take_profit=TAKE_PROFIT, stop_loss=STOP_LOSS)
+    labels = {"signal": "시그널", "take_profit": "익절", "stop_loss": "손절"}
+    for trade in trades.itertuples():
+        side = "매수" if trade.side == "buy" else labels[trade.reason]
+        print(f"[{side}] {trade.time:%Y-%m-%d %H:%M:%S} {ticker} {trade.price:,.0f}")
 
-        sliced_df = df.iloc[:i+1]
-        try:
-            signal = strategy_func(df=sliced_df) if "df" in strategy_func.__code__.co_varnames else strategy_func()
-        except Exception as e:
-            print(f"⚠️ {strategy_name} 시그널 오류: {e}")
-            continue
+    # 체결 내역은 컬럼 그대로 한 번에 기록
+    write_signals(strategy_name, trades["time"], trades["ticker"], trades["side"], trades["price"])
 
-        if signal == "buy" and not holding:
-            buy_price = price
-            log_signal(strategy_name, ticker, "buy", price, backtest=True)
-            print(f"[매수] {current_time} {ticker} {price}")
-            holding = True
+    summary = summarize(trades, equity)
+    print(f"📈 수익률: {summary['total_return']:.2f}% | 💥 MDD: {summary['mdd']:.2f}% | "
+          f"거래 {summary['trade_count']}회 | 승률 {summary['win_rate']:.1f}%")
+    return trades, equity
 
 # 전체 전략 일괄 실행
 def run_all_backtests():
-    from autobot_trader.strategies.moving_average import get_moving_average_signal
-    from autobot_trader.strategies.rsi import get_rsi_signal
-    from autobot_trader.strategies.bollinger import get_bollinger_signal
-    from autobot_trader.strategies.trend_following import get_trend_following_signal
-    from autobot_trader.strategies.grid_trading import get_grid_trading_signal
-    from autobot_trader.strategies.volatility_breakout import get_volatility_breakout_signal
-    from autobot_trader.strategies.momentum import get_momentum_signal
-
-    strategy_map = {
-        "moving_average": get_moving_average_signal,
-        "rsi": get_rsi_signal,
-        "bollinger": get_bollinger_signal,
-        "trend_following": get_trend_following_signal,
-        "grid_trading": get_grid_trading_signal,
-        "volatility_breakout": get_volatility_breakout_signal,
-        "momentum": get_momentum_signal
-    }
-
-    for name, func in strategy_map.items():
+    for name in STRATEGIES:
         print(f"\n=== ✅ {name.upper()} 전략 백테스트 시작 ===")
-        backtest_strategy(func, name, ticker="KRW-BTC")
+        backtest_strategy(get_compute_function(name), name, ticker="KRW-BTC")
 
 if __name__ == "__main__":
     run_all_backtests()
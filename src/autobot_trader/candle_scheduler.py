@@ -0,0 +1,69 @@
+# src/autobot_trader/candle_scheduler.py
+# 봉 마감 시각 기준 스케줄러
+# - 인터벌별 다음 봉 마감 시각 계산 (업비트 봉 경계: KST 09:00 = UTC 0시 기준, 주봉은 월요일, 월봉은 매월 1일)
+# - 같은 경계에 마감되는 작업은 한 번에 실행하고 다음 경계까지 정확히 대기 (1초 폴링 없음)
+# - 마감 직후에는 REST 응답에 새 봉이 늦게 반영될 수 있어 CLOSE_DELAY 초 뒤에 실행
+
+import time
+from datetime import datetime, timezone
+
+CLOSE_DELAY = 1.0  # 봉 마감 후 실행까지 대기 (초)
+
+INTERVAL_SECONDS = {
+    "minute1": 60,
+    "minute3": 3 * 60,
+    "minute5": 5 * 60,
+    "minute10": 10 * 60,
+    "minute15": 15 * 60,
+    "minute30": 30 * 60,
+    "minute60": 60 * 60,
+    "minute240": 240 * 60,
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+}
+WEEK_ORIGIN = 4 * 24 * 60 * 60  # 1970-01-05 (월요일) 0시 UTC
+
+
+def next_candle_close(interval, now=None):
+    """현재 형성 중인 봉의 마감 시각 (epoch 초)"""
+    now = time.time() if now is None else now
+    if interval == "month":
+        current = datetime.fromtimestamp(now, timezone.utc)
+        year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+        return datetime(year, month, 1, tzinfo=timezone.utc).timestamp()
+    span = INTERVAL_SECONDS.get(interval, INTERVAL_SECONDS["day"])
+    origin = WEEK_ORIGIN if interval == "week" else 0
+    return origin + ((now - origin) // span + 1) * span
+
+
+class CandleScheduler:
+    """동기 루프용: add(interval, func, *args) 로 등록한 작업을 해당 인터벌 봉 마감마다 실행"""
+
+    def __init__(self, delay=CLOSE_DELAY):
+        self.delay = delay
+        self.jobs = {}      # interval → [(func, args)]
+        self.next_run = {}  # interval → 다음 실행 시각 (epoch 초)
+
+    def add(self, interval, func, *args):
+        self.jobs.setdefault(interval, []).append((func, args))
+        self.next_run.setdefault(interval, next_candle_close(interval) + self.delay)
+
+    def run_pending(self, now=None):
+        """경계에 도달한 인터벌의 작업 실행 → 실행한 인터벌 목록"""
+        now = time.time() if now is None else now
+        due = [interval for interval, at in self.next_run.items() if at <= now]
+        for interval in due:
+            for func, args in self.jobs[interval]:
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(f"⚠️ [{interval}] 봉 마감 작업 오류: {e}")
+            # 실행이 길어져 지난 경계는 건너뛰고 다음 경계에 맞춤
+            self.next_run[interval] = next_candle_close(interval, max(now, time.time())) + self.delay
+        return due
+
+    def run_forever(self):
+        while True:
+            wake_at = min(self.next_run.values(), default=time.time() + 60)
+            time.sleep(max(0.0, wake_at - time.time()))
+            self.run_pending()
@@ -0,0 +1,233 @@
+# src/autobot_trader/candle_store.py
+# 실시간 루프와 백테스트가 함께 쓰는 OHLCV 캔들 저장소
+# - 메모리: (티커, 인터벌) 단위 LRU, 현재 형성 중인 봉이 마감되는 시점까지 유효
+# - 디스크: 티커/인터벌별 컬럼형(npz) 파일에 마감된 봉만 저장
+# - 갱신: 캐시에 없는 최근 봉(tail)만 pyupbit 로 추가 조회
+#   (캐시가 오래돼 빈 구간이 요청 봉 수보다 길면 빈 구간을 채우지 않고 최근 봉만 새로 받음)
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pyupbit
+
+CACHE_DIR = "candles"
+MAX_MEMORY_ENTRIES = 64
+FLUSH_ROWS = 60  # 새로 마감된 봉이 이만큼 쌓이면 디스크에 기록
+COLUMNS = ["open", "high", "low", "close", "volume", "value"]
+KST = timezone(timedelta(hours=9))
+
+INTERVAL_OFFSETS = {
+    "minute1": pd.Timedelta(minutes=1),
+    "minute3": pd.Timedelta(minutes=3),
+    "minute5": pd.Timedelta(minutes=5),
+    "minute10": pd.Timedelta(minutes=10),
+    "minute15": pd.Timedelta(minutes=15),
+    "minute30": pd.Timedelta(minutes=30),
+    "minute60": pd.Timedelta(minutes=60),
+    "minute240": pd.Timedelta(minutes=240),
+    "day": pd.Timedelta(days=1),
+    "week": pd.Timedelta(weeks=1),
+    "month": pd.DateOffset(months=1),
+}
+
+
+def now_kst():
+    """pyupbit 캔들 인덱스와 같은 KST 기준 naive datetime"""
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def candle_close_time(start, interval):
+    """봉 시작 시각(KST) → 봉 마감 시각(KST)"""
+    return start + INTERVAL_OFFSETS.get(interval, INTERVAL_OFFSETS["day"])
+
+
+def closed_candles(df, interval, now=None):
+    """마감된 봉만 남김 (pyupbit 응답의 마지막 행은 현재 형성 중인 봉일 수 있음)"""
+    if df is None or df.empty:
+        return df
+    now = now or now_kst()
+    if candle_close_time(df.index[-1], interval) > pd.Timestamp(now):
+        return df.iloc[:-1]
+    return df
+
+
+def count_since(start, interval, now=None):
+    """start 봉부터 현재 형성 중인 봉까지의 봉 개수 (월봉은 28일 기준으로 넉넉히 계산)"""
+    now = now or now_kst()
+    offset = INTERVAL_OFFSETS.get(interval, INTERVAL_OFFSETS["day"])
+    span = pd.Timedelta(days=28) if isinstance(offset, pd.DateOffset) else offset
+    return max(int((pd.Timestamp(now) - start) / span), 0) + 1
+
+
+class CandleStore:
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key → {"frame", "expires_at", "complete", "dirty"}
+        self.lock = threading.Lock()
+        self.key_locks = defaultdict(threading.Lock)
+
+    def get_ohlcv(self, ticker, interval="day", count=200, to=None, offline=False):
+        """pyupbit.get_ohlcv 와 같은 형식의 DataFrame 반환 (캐시 우선, 부족한 구간만 조회)"""
+        key = (ticker, interval)
+        with self._key_lock(key):
+            entry = self._entry(key)
+            if not offline:
+                to_ts = pd.Timestamp(to) if to is not None else None
+                if self._needs_tail(entry, interval, to_ts):
+                    self._fetch_tail(key, entry, count)
+                if len(self._select(entry["frame"], count, to_ts)) < count and not entry["complete"]:
+                    self._fetch_history(key, entry, count, to)
+            frame = entry["frame"]
+            if frame is None:
+                return None
+            return self._select(frame, count, pd.Timestamp(to) if to is not None else None).copy()
+
+    def flush(self):
+        """메모리에만 있는 마감 봉을 디스크에 기록"""
+        with self.lock:
+            items = list(self.entries.items())
+        for key, entry in items:
+            if entry["dirty"]:
+                self._save(key, entry)
+
+    def _key_lock(self, key):
+        with self.lock:
+            return self.key_locks[key]
+
+    def _entry(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+
+        frame, complete = self._load(key)
+        entry = {"frame": frame, "expires_at": 0.0, "complete": complete, "dirty": 0}
+        with self.lock:
+            self.entries[key] = entry
+            evicted = []
+            while len(self.entries) > self.max_entries:
+                evicted.append(self.entries.popitem(last=False))
+        for old_key, old_entry in evicted:
+            if old_entry["dirty"]:
+                self._save(old_key, old_entry)
+        return entry
+
+    def _needs_tail(self, entry, interval, to_ts):
+        if entry["frame"] is None or time.time() < entry["expires_at"]:
+            return False
+        if to_ts is not None:
+            # 요청 구간이 이미 캐시 안에서 끝나면 최신 봉은 필요 없음
+            return candle_close_time(entry["frame"].index[-1], interval) < min(to_ts, pd.Timestamp(now_kst()))
+        return True
+
+    def _fetch_tail(self, key, entry, count):
+        ticker, interval = key
+        missing = count_since(entry["frame"].index[-1], interval) + 1
+        if missing > count:
+            # 몇 주 묵은 캐시면 수만 봉을 페이지 단위로 받게 되므로 버리고 최근 count 봉부터 다시 쌓음
+            entry["frame"], entry["complete"] = None, False
+            missing = count
+        df = pyupbit.get_ohlcv(ticker, interval=interval, count=missing)
+        if df is not None and not df.empty:
+            self._merge(key, entry, df)
+
+    def _fetch_history(self, key, entry, count, to):
+        ticker, interval = key
+        df = pyupbit.get_ohlcv(ticker, interval=interval, count=count, to=to)
+        if df is None or df.empty:
+            return
+        if len(df) < count:
+            entry["complete"] = True  # 상장 이후 전체 구간을 이미 받음
+        self._merge(key, entry, df, history=to is not None)
+
+    def _merge(self, key, entry, df, history=False):
+        ticker, interval = key
+        df = df[COLUMNS]
+        frame = entry["frame"]
+        before = 0 if frame is None else len(frame)
+        if frame is not None:
+            df = pd.concat([frame, df])
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+        entry["frame"] = df
+        if not history:
+            entry["expires_at"] = self._expires_at(df.index[-1], interval)
+        entry["dirty"] += len(df) - before
+        if entry["dirty"] >= FLUSH_ROWS or before == 0:
+            self._save(key, entry)
+
+    @staticmethod
+    def _expires_at(last_start, interval):
+        close_time = candle_close_time(last_start, interval).to_pydatetime()
+        return close_time.replace(tzinfo=KST).timestamp()
+
+    @staticmethod
+    def _select(frame, count, to_ts):
+        if frame is None:
+            return []
+        if to_ts is not None:
+            frame = frame[frame.index < to_ts]
+        return frame.iloc[-count:] if count else frame.iloc[:0]
+
+    def _path(self, key):
+        ticker, interval = key
+        return os.path.join(self.cache_dir, f"{ticker}_{interval}.npz")
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None, False
+        try:
+            with np.load(path) as data:
+                frame = pd.DataFrame({col: data[col] for col in COLUMNS}, index=pd.to_datetime(data["index"]))
+                complete = bool(data["complete"])
+            return (frame if not frame.empty else None), complete
+        except Exception as e:
+            print(f"⚠️ 캔들 캐시 로드 실패 ({path}): {e}")
+            return None, False
+
+    def _save(self, key, entry):
+        frame = entry["frame"]
+        if frame is None:
+            return
+        ticker, interval = key
+        # 형성 중인 마지막 봉은 값이 바뀌므로 디스크에는 마감된 봉만 저장
+        closed = frame
+        if candle_close_time(frame.index[-1], interval) > pd.Timestamp(now_kst()):
+            closed = frame.iloc[:-1]
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    index=closed.index.values.astype("datetime64[ns]").astype(np.int64),
+                    complete=np.array(entry["complete"]),
+                    **{col: closed[col].to_numpy(dtype=np.float64) for col in COLUMNS},
+                )
+            os.replace(tmp_path, path)
+            entry["dirty"] = 0
+        except Exception as e:
+            print(f"⚠️ 캔들 캐시 저장 실패 ({path}): {e}")
+
+
+store = CandleStore()
+atexit.register(store.flush)
+
+
+def get_closed_ohlcv(ticker, interval="day", count=200):
+    """마감된 봉 count 개 (형성 중인 봉 1개를 더 받아 제외, 200개를 넘으면 pyupbit 가 나눠서 조회)"""
+    df = closed_candles(get_ohlcv(ticker, interval=interval, count=count + 1), interval)
+    return None if df is None else df.iloc[-count:]
+
+
+def get_ohlcv(ticker, interval="day", count=200, to=None, offline=False):
+    return store.get_ohlcv(ticker, interval=interval, count=count, to=to, offline=offline)
@@ -0,0 +1,161 @@
+# src/autobot_trader/capital_allocator.py
+# 전략별 주문 금액 배분 + 현금 예약
+# - KRW 잔고는 캐시해 두고 체결 금액으로 직접 증감 (작업마다 잔고 조회 없음, CASH_TTL 마다 거래소 값으로 재동기화)
+# - 매수 전에 reserve() 로 금액을 원자적으로 잡아 두고 체결/실패 시 release()
+#   → 동시에 실행되는 전략들이 같은 현금을 기준으로 주문해 초과 사용하는 일이 없음
+# - 배분 정책 (settings.ALLOCATION_POLICY)
+#   · fixed: 전략 기준 예산 그대로
+#   · volatility: 최근 변동성이 목표보다 크면 줄이고 작으면 늘림 (캔들 캐시만 사용)
+#   · performance: 거래 DB 의 전략별 실현 수익률로 가중
+# - 보유 현금이 기준 예산 합계보다 적으면 모든 전략 예산을 같은 비율로 축소 (기존 동적 예산과 동일)
+
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from autobot_trader import trade_store
+from autobot_trader.candle_scheduler import INTERVAL_SECONDS
+from autobot_trader.settings import (
+    STRATEGY_BUDGETS, STRATEGY_INTERVALS, MIN_ORDER_KRW,
+    ALLOCATION_POLICY, TARGET_DAILY_VOLATILITY,
+)
+from autobot_trader.strategy_registry import LazyFunction
+
+get_ohlcv = LazyFunction("autobot_trader.candle_store:get_ohlcv")  # 캔들 캐시(pandas)는 변동성 정책에서만 로드
+
+CASH_TTL = 60.0            # 캐시한 KRW 잔고를 거래소 값으로 다시 맞추는 주기 (예약이 없을 때만)
+PERFORMANCE_TTL = 300.0    # 전략별 실현 수익률 캐시 유지 시간
+VOLATILITY_LOOKBACK = 50   # 변동성 계산에 쓰는 봉 수
+WEIGHT_LIMITS = {"volatility": (0.5, 2.0), "performance": (0.5, 1.5)}
+POLICIES = ("fixed", "volatility", "performance")
+
+
+class CapitalAllocator:
+    def __init__(self, snapshot, budgets=STRATEGY_BUDGETS, policy=ALLOCATION_POLICY):
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 배분 정책: {policy} (가능: {', '.join(POLICIES)})")
+        self.snapshot = snapshot
+        self.budgets = dict(budgets)
+        self.policy = policy
+        self.lock = threading.Lock()
+        self.cash = None              # 캐시한 KRW 잔고 (None 이면 아직 모름)
+        self.cash_at = 0.0
+        self.reservations = {}        # 예약 ID → (전략, 금액)
+        self.ids = itertools.count(1)
+        self.performance = {}
+        self.performance_at = 0.0
+
+    # ----- 현금 -----
+
+    def refresh(self, force=False):
+        """예약이 없을 때 거래소 KRW 잔고로 캐시를 다시 맞춤"""
+        with self.lock:
+            if self.reservations or (not force and self.cash is not None and time.time() - self.cash_at < CASH_TTL):
+                return
+        balance = self.snapshot.get_balance("KRW")
+        if balance is None:
+            return
+        with self.lock:
+            if not self.reservations:
+                self.cash = balance
+                self.cash_at = time.time()
+
+    def available(self):
+        """예약분을 뺀 사용 가능 현금 (잔고를 모르면 None)"""
+        self.refresh()
+        with self.lock:
+            if self.cash is None:
+                return None
+            return self.cash - sum(amount for _, amount in self.reservations.values())
+
+    def reserve(self, strategy, amount):
+        """amount 만큼 현금 예약 → 예약 ID (가용 현금이 최소 주문 금액보다 적으면 None)
+
+        가용 현금이 amount 보다 적으면 남은 만큼만 예약하고, 실제 예약 금액은 reserved(id) 로 확인한다.
+        """
+        self.refresh()
+        with self.lock:
+            if self.cash is None:
+                return None
+            free = self.cash - sum(reserved for _, reserved in self.reservations.values())
+            amount = int(min(amount, free))
+            if amount < MIN_ORDER_KRW:
+                return None
+            reservation = next(self.ids)
+            self.reservations[reservation] = (strategy, amount)
+            return reservation
+
+    def reserved(self, reservation):
+        with self.lock:
+            return self.reservations.get(reservation, (None, 0))[1]
+
+    def release(self, reservation, spent=0.0):
+        """예약 해제 (체결되었으면 spent 만큼 현금 차감, 실패/취소면 0)"""
+        with self.lock:
+            self.reservations.pop(reservation, None)
+            if self.cash is not None:
+                self.cash -= spent
+
+    def credit(self, amount):
+        """매도 체결 대금 (수수료 차감 후) 반영"""
+        with self.lock:
+            if self.cash is not None:
+                self.cash += amount
+
+    # ----- 배분 -----
+
+    def budget(self, strategy, ticker=None):
+        """정책 가중치와 보유 현금 비율을 적용한 전략 주문 금액"""
+        base = self.budgets.get(strategy, 10000)
+        weight = self.weight(strategy, ticker)
+        amount = base * weight
+        total_base = sum(self.budgets.values())
+        cash = self.available()
+        if cash is not None and total_base > 0:
+            amount *= min(1.0, max(cash, 0) / total_base)
+        return int(amount)
+
+    def weight(self, strategy, ticker=None):
+        if self.policy == "volatility" and ticker is not None:
+            weight = self.volatility_weight(ticker, STRATEGY_INTERVALS.get(strategy, "day"))
+        elif self.policy == "performance":
+            weight = self.performance_weight(strategy)
+        else:
+            return 1.0
+        low, high = WEIGHT_LIMITS[self.policy]
+        return float(np.clip(weight, low, high))
+
+    def volatility_weight(self, ticker, interval):
+        """목표 일간 변동성 / 최근 일간 환산 변동성 (캐시에 캔들이 부족하면 1)"""
+        df = get_ohlcv(ticker, interval=interval, count=VOLATILITY_LOOKBACK + 1, offline=True)
+        if df is None or len(df) < VOLATILITY_LOOKBACK // 2:
+            return 1.0
+        closes = df["close"].to_numpy(dtype=np.float64)
+        bar_volatility = np.std(np.diff(closes) / closes[:-1])
+        if not bar_volatility:
+            return 1.0
+        day = INTERVAL_SECONDS["day"]
+        span = 28 * day if interval == "month" else INTERVAL_SECONDS.get(interval, day)
+        bars_per_day = day / span
+        daily_volatility = bar_volatility * np.sqrt(bars_per_day)
+        return TARGET_DAILY_VOLATILITY / daily_volatility
+
+    def performance_weight(self, strategy):
+        """1 + 실현 수익률 (실현손익 / 매수 금액), 거래 DB 집계를 PERFORMANCE_TTL 동안 캐시"""
+        if time.time() - self.performance_at >= PERFORMANCE_TTL:
+            self.performance = {
+                item["strategy"]: item["realized_pnl"] / item["buy_value"] if item["buy_value"] else 0.0
+                for item in trade_store.get_pnl_summary()
+            }
+            self.performance_at = time.time()
+        return 1.0 + self.performance.get(strategy, 0.0)
+
+    def status(self):
+        """명령어 응답용: 캐시 현금, 예약 합계, 전략별 예약"""
+        with self.lock:
+            reserved = {}
+            for strategy, amount in self.reservations.values():
+                reserved[strategy] = reserved.get(strategy, 0) + amount
+            return {"cash": self.cash, "reserved": sum(reserved.values()), "by_strategy": reserved}
@@ -1,72 +1,36 @@
-import sqlite3
 from datetime import datetime, timedelta
 from autobot_trader.telegram_bot import send_message
+from autobot_trader import trade_store
 
 
-DB_PATH = "trade_history.db"
+DB_PATH = trade_store.DB_PATH
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS trades (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            ticker TEXT,
-            side TEXT,
-            volume REAL,
-            price REAL,
-            strategy TEXT
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    trade_store.get_connection()
 
-def log_trade(ticker, side, volume, price, strategy):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO trades (timestamp, ticker, side, volume, price, strategy)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        ticker, side, volume, price, strategy
-    ))
-    conn.commit()
-    conn.close()
+def log_trade(ticker, side, volume, price, strategy, fee=0.0, order_uuid=None):
+    trade_store.insert_trade(ticker, side, volume, price, strategy, fee=fee, order_uuid=order_uuid)
 
 def get_last_trade_time(ticker, strategy):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        SELECT timestamp, side FROM trades
-        WHERE ticker = ? AND strategy = ?
-        ORDER BY timestamp DESC LIMIT 1
-    ''', (ticker, strategy))
-    row = c.fetchone()
-    conn.close()
+    row = trade_store.get_last_trade(ticker, strategy)
 
     if row:
-        last_time = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S")
+        last_time = datetime.strptime(row[0], trade_store.TIME_FORMAT)
         return last_time, row[1]
     else:
         return datetime.min, None
 
 def send_strategy_summary():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    summary = trade_store.get_pnl_summary()
 
-    c.execute("SELECT strategy, side, MAX(timestamp), SUM(price * volume) FROM trades GROUP BY strategy, side")
-    rows = c.fetchall()
-    conn.close()
-
-    if not rows:
+    if not summary:
         send_message("📋 거래 요약 없음 (아직 거래 없음)")
         return
 
     message = "📊 전략별 최근 거래 요약:\n"
-    for strategy, side, last_time, total in rows:
-        message += f"• {strategy} - {side.upper()} 총액: {total:,.0f}원\n   마지막: {last_time}\n"
+    for item in summary:
+        message += (f"• {item['strategy']} - 매수 {item['buy_value']:,.0f}원 / 매도 {item['sell_value']:,.0f}원 "
+                    f"/ 실현손익 {item['realized_pnl']:,.0f}원\n   마지막: {item['last_trade']}\n")
 
     send_message(message)
     
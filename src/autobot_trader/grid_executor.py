@@ -0,0 +1,171 @@
+# src/autobot_trader/grid_executor.py
+# 그리드 매매 주문 관리 (티커별 지정가 주문 묶음)
+# - 그리드 시그널(signal="grid")을 받으면
+#   1) 대기 중인 주문 상태를 uuid 묶음 조회 한 번으로 확인 → 체결분은 보유/청산으로 반영하고 on_fill 호출
+#   2) plan_grid_orders 로 새 매수/매도 지정가 주문과 취소할 주문 계산
+#      (매도는 체결 기록이 있는 보유 레벨만, 합계는 장부의 전략 보유 수량(volume_of) 이내)
+#   3) 취소는 묶음 취소 한 번, 새 주문은 묶음 전송
+# - 레벨 상태는 grid_state 저장소(메모리 + 저널)에 기록 → 재시작 후에도 대기 주문을 이어서 추적
+# - 매수 주문 금액은 자금 배분기에서 예약 후 주문 (주문이 걸려 있는 동안 현금에서 빠진 것으로 처리)
+#   → 체결되면 실제 체결 금액 + 수수료와의 차이를 정산
+
+import threading
+from datetime import datetime
+
+from autobot_trader import grid_state
+from autobot_trader.order_executor import FINAL_STATES, get_tick_size, summarize_order
+from autobot_trader.strategy_registry import LazyFunction
+
+# 그리드 전략 모듈(pandas 포함)은 첫 리밸런싱 때 import
+plan_grid_orders = LazyFunction("autobot_trader.strategies.grid_trading:plan_grid_orders")
+
+WAIT_STATES = ("buy_wait", "sell_wait", "cancelling")
+DUST_VOLUME = 1e-8
+
+
+class GridExecutor:
+    def __init__(self, executor, store=grid_state.store, allocator=None, on_fill=None, volume_of=None):
+        self.executor = executor
+        self.store = store
+        self.allocator = allocator
+        self.on_fill = on_fill        # on_fill(strategy, ticker, side, fill)
+        self.volume_of = volume_of    # volume_of(strategy, ticker) → 장부 보유 수량 (매도 한도)
+        self.locks = {}               # ticker → Lock (같은 티커의 동시 실행 방지)
+        self.locks_lock = threading.Lock()
+
+    def _lock(self, ticker):
+        with self.locks_lock:
+            return self.locks.setdefault(ticker, threading.Lock())
+
+    def rebalance(self, strategy, ticker, signal):
+        """그리드 시그널 → 체결 반영 + 주문 정리/배치. {"fills", "placed", "cancelled"} 반환"""
+        with self._lock(ticker):
+            fills = self.sync(strategy, ticker)
+            volume = self.volume_of(strategy, ticker) if self.volume_of is not None else None
+            orders, cancels = plan_grid_orders(signal, self.store.holdings(ticker), volume)
+            cancelled = self._cancel(ticker, cancels)
+            placed = self._place(strategy, ticker, orders)
+        return {"fills": fills, "placed": placed, "cancelled": cancelled}
+
+    # ----- 체결 반영 -----
+
+    def sync(self, strategy, ticker):
+        """대기 주문 상태 묶음 조회 → 완료/취소된 주문 반영, 체결 건수 반환"""
+        holdings = self.store.holdings(ticker)
+        waiting = {
+            info["uuid"]: level for level, info in holdings.items()
+            if info["state"] in WAIT_STATES and info.get("uuid")
+        }
+        if not waiting:
+            return 0
+        orders = self.executor.get_orders(list(waiting), ticker)
+        fills = 0
+        for order_uuid, level in waiting.items():
+            order = orders.get(order_uuid)
+            if order is None or order.get("state") not in FINAL_STATES:
+                continue
+            fill = summarize_order(order)
+            info = holdings[level]
+            if info["state"] == "sell_wait":
+                fills += self._settle_sell(strategy, ticker, level, info, fill)
+            else:
+                fills += self._settle_buy(strategy, ticker, level, info, fill)
+        return fills
+
+    def _settle_buy(self, strategy, ticker, level, info, fill):
+        volume = fill["executed_volume"]
+        if self.allocator is not None:
+            # 주문 시 뺀 금액 - (체결 금액 + 수수료) = 미체결 반환분 (수수료는 현금에서 차감)
+            self.allocator.credit(info["quantity"] * info["buy_price"] - fill["funds"] - fill["fee"])
+        if volume <= DUST_VOLUME:
+            self.store.close(ticker, level)
+            return 0
+        self.store.put(ticker, level, {
+            **info,
+            "state": "held",
+            "uuid": None,
+            "filled": True,
+            "quantity": volume,
+            "buy_price": fill["avg_price"] or info["buy_price"],
+            "timestamp": datetime.now().isoformat(),
+        })
+        self._emit(strategy, ticker, "buy", fill)
+        return 1
+
+    def _settle_sell(self, strategy, ticker, level, info, fill):
+        volume = fill["executed_volume"]
+        remaining = info["quantity"] - volume
+        if remaining > DUST_VOLUME:
+            held = {key: value for key, value in info.items() if key != "sell_volume"}
+            self.store.put(ticker, level, {**held, "state": "held", "uuid": None, "quantity": remaining})
+        else:
+            self.store.close(ticker, level)
+        if volume <= DUST_VOLUME:
+            return 0
+        if self.allocator is not None:
+            self.allocator.credit(fill["funds"] - fill["fee"])
+        self._emit(strategy, ticker, "sell", fill)
+        return 1
+
+    def _emit(self, strategy, ticker, side, fill):
+        if self.on_fill is None:
+            return
+        try:
+            self.on_fill(strategy, ticker, side, fill)
+        except Exception as e:
+            print(f"⚠️ [{strategy}] {ticker} 그리드 체결 기록 오류: {e}")
+
+    # ----- 주문 -----
+
+    def _cancel(self, ticker, levels):
+        holdings = self.store.holdings(ticker)
+        uuids = {holdings[level]["uuid"]: level for level in levels if holdings[level].get("uuid")}
+        if not uuids:
+            return 0
+        cancelled = self.executor.cancel_orders(list(uuids))
+        for order_uuid in cancelled:
+            level = uuids[order_uuid]
+            # 취소 완료와 취소 전 체결분은 다음 sync 에서 반영
+            self.store.put(ticker, level, {**holdings[level], "state": "cancelling"})
+        return len(cancelled)
+
+    def _place(self, strategy, ticker, orders):
+        batch, reservations = [], []
+        for order in orders:
+            # 거래소에 실제로 나가는 호가 단위 가격으로 예약/기록 (limit_order 와 같은 방향으로 맞춤)
+            order = {**order, "price": get_tick_size(order["price"], "floor" if order["side"] == "buy" else "ceil")}
+            reservation = None
+            if order["side"] == "buy" and self.allocator is not None:
+                reservation = self.allocator.reserve(strategy, order["price"] * order["volume"])
+                if reservation is None:
+                    continue  # 가용 현금 부족: 이번 실행에서는 이 레벨을 건너뜀
+                order["volume"] = round(self.allocator.reserved(reservation) / order["price"], 8)
+            batch.append({**order, "ticker": ticker})
+            reservations.append(reservation)
+
+        results = self.executor.place_orders(batch, strategy)
+        placed = 0
+        for order, reservation, result in zip(batch, reservations, results):
+            if reservation is not None:
+                # 걸어 둔 매수 주문 금액은 현금에서 뺀 상태로 유지 (취소되면 _settle_buy 에서 반환)
+                self.allocator.release(reservation, order["price"] * order["volume"] if result else 0.0)
+            if not result:
+                continue
+            placed += 1
+            if order["side"] == "buy":
+                info = {
+                    "state": "buy_wait",
+                    "uuid": result["uuid"],
+                    "buy_price": float(result.get("price") or order["price"]),
+                    "quantity": order["volume"],
+                    "timestamp": datetime.now().isoformat(),
+                }
+            else:
+                info = {
+                    **self.store.get(ticker, order["level"]),
+                    "state": "sell_wait",
+                    "uuid": result["uuid"],
+                    "sell_volume": order["volume"],  # 장부 한도로 잘렸으면 보유 수량보다 적음
+                }
+            self.store.put(ticker, order["level"], info)
+        return placed
@@ -0,0 +1,216 @@
+# src/autobot_trader/grid_state.py
+# 그리드 매매 레벨 상태 저장소 (매수 대기/보유/매도 대기 주문)
+# - 티커별 {레벨: 상태 dict} 를 메모리에 두고 레벨 조회/추가/삭제는 dict 연산 한 번 (O(1))
+# - 변경은 저널(JSONL)에 한 줄씩 추가만 함 → 호출마다 전체 상태를 다시 쓰지 않음
+# - 저널이 COMPACT_EVERY 줄을 넘으면 전체 상태를 스냅샷으로 원자적으로 기록(임시 파일 + os.replace)하고 저널을 비움
+# - 시작 시 스냅샷 + 그 이후 저널을 재생해 복구 (스냅샷 직후 저널을 비우기 전에 종료돼도 seq 로 중복 적용 방지)
+# - 기존 grid_state.json(티커 구분 없음)은 최초 로드 시 LEGACY_TICKER 상태로 옮기고 원본은 .migrated 로 보관
+#   → 주문 확인 없이 기록된 레벨이라 "inactive" 로 가져오고, 거래 DB 에 남은 grid_trading 보유 수량만큼만 "held" 로 인정
+#
+# 디렉터리 구조) <root>/snapshot.json, <root>/journal.jsonl
+
+import atexit
+import json
+import os
+import threading
+
+from autobot_trader import trade_store
+
+STATE_DIR = "grid_state"
+LEGACY_FILE = "grid_state.json"
+LEGACY_TICKER = "KRW-BTC"   # 기존 파일은 티커 구분이 없었으므로 기본 티커로 간주
+LEGACY_STRATEGY = "grid_trading"
+DUST_VOLUME = 1e-8
+COMPACT_EVERY = 1000        # 저널 줄 수가 이만큼 쌓이면 스냅샷으로 압축
+
+
+def recorded_volume(ticker):
+    """거래 DB 에 기록된 grid_trading 미청산 수량"""
+    found = trade_store.get_open_positions(LEGACY_STRATEGY, ticker)
+    return found[0]["volume"] if found else 0.0
+
+
+class GridStateStore:
+    def __init__(self, root=STATE_DIR, legacy_file=LEGACY_FILE, compact_every=COMPACT_EVERY,
+                 recorded_volume=recorded_volume):
+        self.root = root
+        self.legacy_file = legacy_file
+        self.compact_every = compact_every
+        self.recorded_volume = recorded_volume  # ticker → 거래 DB 보유 수량 (이전 형식 레벨 확인용)
+        self.snapshot_path = os.path.join(root, "snapshot.json")
+        self.journal_path = os.path.join(root, "journal.jsonl")
+        self.lock = threading.RLock()
+        self.state = None       # ticker → {level: {"state", "uuid", "buy_price", "quantity", "timestamp"}}
+                                # state: buy_wait | held | sell_wait | cancelling | inactive (확인 안 된 이전 기록)
+        self.seq = 0            # 마지막으로 적용한 변경 번호
+        self.journal = None
+        self.journal_lines = 0
+
+    # ----- 조회 -----
+
+    def holdings(self, ticker):
+        """티커의 보유 레벨 dict 복사본 {level: info}"""
+        with self.lock:
+            self._ensure_loaded()
+            return dict(self.state.get(ticker, {}))
+
+    def get(self, ticker, level):
+        with self.lock:
+            self._ensure_loaded()
+            return self.state.get(ticker, {}).get(level)
+
+    def tickers(self):
+        with self.lock:
+            self._ensure_loaded()
+            return [ticker for ticker, levels in self.state.items() if levels]
+
+    # ----- 변경 -----
+
+    def put(self, ticker, level, info):
+        """레벨 상태 기록 (있으면 교체)"""
+        info = dict(info)
+        with self.lock:
+            self._ensure_loaded()
+            self._append({"op": "put", "ticker": ticker, "level": level, "info": info})
+            self.state.setdefault(ticker, {})[level] = info
+            self._compact_if_due()
+
+    def close(self, ticker, level):
+        """레벨 삭제 → 삭제된 상태 (없으면 None)"""
+        with self.lock:
+            self._ensure_loaded()
+            if level not in self.state.get(ticker, {}):
+                return None
+            self._append({"op": "close", "ticker": ticker, "level": level})
+            closed = self.state[ticker].pop(level)
+            self._compact_if_due()
+            return closed
+
+    # ----- 저장 -----
+
+    def _append(self, entry):
+        self.seq += 1
+        entry["seq"] = self.seq
+        if self.journal is None:
+            os.makedirs(self.root, exist_ok=True)
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+        self.journal.write(json.dumps(entry) + "\n")
+        self.journal.flush()
+        self.journal_lines += 1
+
+    def _compact_if_due(self):
+        # 메모리 상태에 방금 변경을 반영한 뒤에 압축해야 스냅샷에 빠지지 않음
+        if self.journal_lines >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """전체 상태를 스냅샷으로 원자적으로 기록하고 저널을 비움"""
+        with self.lock:
+            if self.state is None:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            snapshot = {
+                "seq": self.seq,
+                "tickers": {
+                    ticker: {str(level): info for level, info in levels.items()}
+                    for ticker, levels in self.state.items() if levels
+                },
+            }
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = open(self.journal_path, "w", encoding="utf-8")
+            self.journal_lines = 0
+
+    def close_files(self):
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+    # ----- 복구 -----
+
+    def _ensure_loaded(self):
+        if self.state is not None:
+            return
+        self.state = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.seq = snapshot.get("seq", 0)
+            for ticker, levels in snapshot.get("tickers", {}).items():
+                self.state[ticker] = {int(level): info for level, info in levels.items()}
+        if os.path.exists(self.journal_path):
+            self._replay()
+        elif not os.path.exists(self.snapshot_path) and os.path.exists(self.legacy_file):
+            self._migrate_legacy()
+
+    def _replay(self):
+        legacy_tickers = set()
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # 기록 도중 종료된 마지막 줄
+                self.journal_lines += 1
+                if entry["seq"] <= self.seq:
+                    continue
+                self.seq = entry["seq"]
+                levels = self.state.setdefault(entry["ticker"], {})
+                if entry["op"] == "put":
+                    levels[entry["level"]] = entry["info"]
+                elif entry["op"] == "open":  # 주문 상태가 없던 이전 형식 → 거래 DB 로 확인 전까지 비활성
+                    info = {key: entry[key] for key in ("buy_price", "quantity", "timestamp")}
+                    levels[entry["level"]] = {"state": "inactive", "uuid": None, **info}
+                    legacy_tickers.add(entry["ticker"])
+                else:
+                    levels.pop(entry["level"], None)
+        if legacy_tickers:
+            for ticker in legacy_tickers:
+                self._confirm_legacy(ticker)
+            self.compact()
+
+    def _migrate_legacy(self):
+        with open(self.legacy_file, encoding="utf-8") as f:
+            legacy = json.load(f)
+        levels = {int(key.split("_")[1]): {"state": "inactive", "uuid": None, **info} for key, info in legacy.items()}
+        held = 0
+        if levels:
+            self.state[LEGACY_TICKER] = levels
+            held = self._confirm_legacy(LEGACY_TICKER)
+        self.compact()
+        os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        print(f"🗂️ {self.legacy_file} → {self.root}/ 이전 ({LEGACY_TICKER} 레벨 {len(levels)}개 중 보유 확인 {held}개)")
+
+    def _confirm_legacy(self, ticker):
+        """비활성 레벨을 거래 DB 보유 수량 안에서만 보유로 전환 → 전환한 레벨 수
+
+        이미 추적 중인 보유/매도 대기 수량을 먼저 빼고, 남은 수량을 넘는 레벨은 비활성으로 둔다
+        (수량 확인이 없는 레벨로 매도 주문이 나가지 않도록).
+        """
+        levels = self.state.get(ticker, {})
+        try:
+            volume = self.recorded_volume(ticker)
+        except Exception as e:
+            print(f"⚠️ {ticker} 그리드 이전 레벨 확인 실패: {e}")
+            return 0
+        volume -= sum(info["quantity"] for info in levels.values() if info["state"] in ("held", "sell_wait"))
+        confirmed = 0
+        for level in sorted(levels):
+            info = levels[level]
+            if info["state"] != "inactive" or info["quantity"] > volume + DUST_VOLUME:
+                continue
+            levels[level] = {**info, "state": "held", "filled": True}
+            volume -= info["quantity"]
+            confirmed += 1
+        return confirmed
+
+
+store = GridStateStore()
+atexit.register(store.close_files)
@@ -1,20 +1,11 @@
-import csv
-import os
 from datetime import datetime
 
-def log_signal(strategy, ticker, signal, price, backtest=False):
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    row = [now, ticker, strategy, signal, price]
+from autobot_trader import signal_store
 
-    # 기본 실행 로그 (원하는 경우만 사용)
-    with open("signal_log.csv", "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(row)
-
-    # 백테스트 로그 저장
+def log_signal(strategy, ticker, signal, price, backtest=False, timestamp=None):
+    # 행마다 파일을 열지 않고 기록기 버퍼에 모았다가 컬럼형 파일로 일괄 기록
+    timestamp = timestamp or datetime.now()
     if backtest:
-        os.makedirs("backtest", exist_ok=True)
-        filename = f"backtest/backtest_{strategy}.csv"
-        with open(filename, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(row)
+        signal_store.backtest_recorder.append(timestamp, ticker, strategy, signal, price)
+    else:
+        signal_store.recorder.append(timestamp, ticker, strategy, signal, price)
@@ -0,0 +1,339 @@
+# src/autobot_trader/market_feed.py
+# 업비트 WebSocket 체결 스트림 기반 실시간 시세/캔들
+# - trade 채널 하나로 추적 티커의 체결을 받아 현재가 갱신과 인터벌별 캔들 생성을 메모리에서 처리
+# - 봉이 마감되면 on_candle(ticker, interval, 봉 시작 시각(KST), candle) 콜백 호출 (REST 호출 없음)
+# - 체결이 없어도 거래소 시각 기준으로 마감 시점이 지나면 봉을 닫음
+# - 연결/끊김 시 만들던 봉을 버리고, 연결 후 처음 만든 봉(중간부터 받은 체결)은 전달하지 않음
+#   → 그 봉과 끊긴 동안의 봉은 run_multi_coin 의 REST 폴링(covers 로 판단)이 처리
+# - 테스트용 로컬 리플레이 서버: 녹화한 체결 메시지(JSONL)나 과거 캔들로 만든 체결을 같은 형식으로 송출
+#
+# 사용 예)
+#   python -m autobot_trader.market_feed record --tickers KRW-BTC KRW-ETH --out trades.jsonl
+#   python -m autobot_trader.market_feed synth --ticker KRW-BTC --interval minute1 --count 600 --out trades.jsonl
+#   python -m autobot_trader.market_feed serve --file trades.jsonl --port 8765 --speed 60
+#   MARKET_FEED_URL=ws://localhost:8765 python -m autobot_trader.run_multi_coin
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import websockets
+
+from autobot_trader.strategy_registry import LazyFunction
+
+UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+RECONNECT_DELAY = 1.0       # 재연결 대기 시작값 (초), 실패할 때마다 두 배
+MAX_RECONNECT_DELAY = 30.0
+CLOCK_INTERVAL = 0.2        # 마감 시점 확인 주기 (초)
+CLOSE_GRACE_MS = 300        # 마감 직후 늦게 도착하는 체결을 기다리는 시간
+
+KST_OFFSET_MS = 9 * 3600 * 1000
+INTERVAL_MS = {
+    "minute1": 60_000,
+    "minute3": 3 * 60_000,
+    "minute5": 5 * 60_000,
+    "minute10": 10 * 60_000,
+    "minute15": 15 * 60_000,
+    "minute30": 30 * 60_000,
+    "minute60": 60 * 60_000,
+    "minute240": 240 * 60_000,
+    "day": 86_400_000,  # 업비트 일봉은 UTC 00:00 (KST 09:00) 시작
+}
+Timestamp = LazyFunction("pandas:Timestamp")  # 러너 import 시 pandas 를 읽지 않도록 첫 봉 마감 때 로드
+
+
+def candle_start(ts_ms, interval):
+    """체결 시각(UTC epoch ms) → 해당 봉 시작 시각(UTC epoch ms)"""
+    size = INTERVAL_MS[interval]
+    return ts_ms - ts_ms % size
+
+
+def to_kst(ts_ms):
+    """UTC epoch ms → pyupbit 캔들 인덱스와 같은 KST naive Timestamp"""
+    return Timestamp(ts_ms + KST_OFFSET_MS, unit="ms")
+
+
+class CandleBuilder:
+    """체결을 모아 한 (티커, 인터벌) 의 봉을 만듦"""
+
+    def __init__(self, ticker, interval):
+        self.ticker = ticker
+        self.interval = interval
+        self.size = INTERVAL_MS[interval]
+        self.start = None
+        self.candle = None
+        self.first_full = None   # 초기화 후 처음부터 체결을 모두 받은 첫 봉의 시작 시각 (UTC epoch ms)
+
+    def reset(self):
+        """연결이 바뀌면 만들던 봉을 버림 (끊긴 동안의 체결이 빠진 봉을 완성된 봉으로 내보내지 않도록)"""
+        self.start = None
+        self.candle = None
+        self.first_full = None
+
+    def covers(self, start_ms):
+        """start_ms 에 시작한 봉을 빠짐없이 만들어 전달하는지"""
+        return self.first_full is not None and start_ms >= self.first_full
+
+    def add_trade(self, ts_ms, price, volume):
+        """체결 반영 → 새 봉으로 넘어가며 마감된 봉이 있으면 (시작 시각, candle)"""
+        start = candle_start(ts_ms, self.interval)
+        if self.start is not None and start < self.start:
+            return None  # 이미 닫은 봉의 늦은 체결은 무시
+        closed = None
+        if self.candle is not None and start > self.start:
+            closed = self._close()
+        if self.candle is None:
+            if self.first_full is None:
+                self.first_full = start + self.size  # 지금 봉은 중간부터 받은 체결이라 불완전
+            self.start = start
+            self.candle = {"open": price, "high": price, "low": price, "close": price, "volume": 0.0, "value": 0.0}
+        candle = self.candle
+        candle["high"] = max(candle["high"], price)
+        candle["low"] = min(candle["low"], price)
+        candle["close"] = price
+        candle["volume"] += volume
+        candle["value"] += price * volume
+        return closed
+
+    def close_if_due(self, now_ms):
+        """거래소 시각 기준 마감 시점(+유예)이 지났으면 봉을 닫음"""
+        if self.candle is not None and now_ms >= self.start + self.size + CLOSE_GRACE_MS:
+            return self._close()
+        return None
+
+    def _close(self):
+        closed = (to_kst(self.start), self.candle) if self.covers(self.start) else None
+        self.start += self.size
+        self.candle = None
+        return closed
+
+
+class MarketFeed:
+    def __init__(self, tickers, intervals, on_candle=None, on_price=None, url=UPBIT_WS_URL, record_path=None):
+        self.tickers = list(tickers)
+        self.intervals = sorted(set(intervals), key=INTERVAL_MS.get)
+        self.on_candle = on_candle
+        self.on_price = on_price
+        self.url = url
+        self.record_path = record_path
+        self.builders = {
+            (ticker, interval): CandleBuilder(ticker, interval)
+            for ticker in self.tickers for interval in self.intervals
+        }
+        self.last_trade_ms = None       # 마지막 체결의 거래소 시각
+        self.last_trade_clock = None    # 그 체결을 받은 로컬 monotonic 시각
+        self.connected = False
+
+    def exchange_now_ms(self):
+        """마지막 체결 시각 + 그 뒤 흐른 시간 (리플레이에서도 과거 시각 기준으로 동작)"""
+        if self.last_trade_ms is None:
+            return None
+        return self.last_trade_ms + int((time.monotonic() - self.last_trade_clock) * 1000)
+
+    def covers(self, ticker, interval, now_ms=None):
+        """방금 마감된 (ticker, interval) 봉을 스트림이 전달하는지 (아니면 REST 로 처리해야 함)"""
+        builder = self.builders.get((ticker, interval))
+        if not self.connected or builder is None:
+            return False
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        return builder.covers(candle_start(now_ms, interval) - INTERVAL_MS[interval])
+
+    def reset(self):
+        """연결/끊김 시 만들던 봉과 거래소 시각 추정을 버림"""
+        for builder in self.builders.values():
+            builder.reset()
+        self.last_trade_ms = None
+        self.last_trade_clock = None
+
+    async def run(self):
+        """연결이 끊기면 지수 백오프로 재연결하며 계속 수신"""
+        delay = RECONNECT_DELAY
+        clock = asyncio.create_task(self._clock())
+        record = open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+        try:
+            while True:
+                try:
+                    async with websockets.connect(self.url, ping_interval=60, max_size=None) as websocket:
+                        await websocket.send(json.dumps(self.subscription()))
+                        self.reset()
+                        self.connected = True
+                        delay = RECONNECT_DELAY
+                        print(f"🔌 시세 스트림 연결: {self.url} ({', '.join(self.tickers)})")
+                        async for message in websocket:
+                            if record is not None:
+                                record.write((message.decode("utf-8") if isinstance(message, bytes) else message) + "\n")
+                            self.handle_message(message)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"⚠️ 시세 스트림 끊김: {e} ({delay:.0f}초 후 재연결)")
+                self.connected = False
+                self.reset()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+        finally:
+            clock.cancel()
+            if record is not None:
+                record.close()
+
+    def subscription(self):
+        return [
+            {"ticket": str(uuid.uuid4())[:8]},
+            {"type": "trade", "codes": self.tickers, "isOnlyRealtime": True},
+        ]
+
+    def handle_message(self, message):
+        data = json.loads(message)
+        if data.get("type") != "trade":
+            return
+        ticker = data["code"]
+        price = float(data["trade_price"])
+        ts_ms = int(data["trade_timestamp"])
+        if self.last_trade_ms is None or ts_ms >= self.last_trade_ms:
+            self.last_trade_ms = ts_ms
+            self.last_trade_clock = time.monotonic()
+
+        if self.on_price is not None:
+            self.on_price(ticker, price)
+        for interval in self.intervals:
+            builder = self.builders.get((ticker, interval))
+            if builder is None:
+                continue
+            closed = builder.add_trade(ts_ms, price, float(data["trade_volume"]))
+            if closed is not None:
+                self._emit(ticker, interval, closed)
+
+    def _emit(self, ticker, interval, closed):
+        if self.on_candle is None:
+            return
+        timestamp, candle = closed
+        try:
+            self.on_candle(ticker, interval, timestamp, candle)
+        except Exception as e:
+            print(f"⚠️ [{ticker} {interval}] 봉 마감 처리 오류: {e}")
+
+    async def _clock(self):
+        # 체결이 뜸해도 마감 시점이 지나면 봉을 닫아 바로 전달
+        while True:
+            await asyncio.sleep(CLOCK_INTERVAL)
+            now_ms = self.exchange_now_ms()
+            if now_ms is None:
+                continue
+            for (ticker, interval), builder in self.builders.items():
+                closed = builder.close_if_due(now_ms)
+                if closed is not None:
+                    self._emit(ticker, interval, closed)
+
+
+# ----- 로컬 리플레이 서버 -----
+
+def ohlcv_to_trades(df, ticker, interval):
+    """과거 캔들 → 봉마다 시가/고가/저가/종가 순의 체결 4건 (업비트 trade 메시지 형식)"""
+    size = INTERVAL_MS[interval]
+    starts = df.index.values.astype("datetime64[ms]").astype("int64") - KST_OFFSET_MS
+    messages = []
+    for start, row in zip(starts, df.itertuples()):
+        volume = row.volume / 4
+        for step, price in enumerate((row.open, row.high, row.low, row.close)):
+            messages.append({
+                "type": "trade",
+                "code": ticker,
+                "trade_price": float(price),
+                "trade_volume": float(volume),
+                "trade_timestamp": int(start + size * step // 4),
+                "stream_type": "REALTIME",
+            })
+    return messages
+
+
+def load_messages(path):
+    with open(path, encoding="utf-8") as f:
+        messages = [json.loads(line) for line in f if line.strip()]
+    return sorted(messages, key=lambda m: m.get("trade_timestamp", 0))
+
+
+class ReplayServer:
+    """녹화된 체결을 업비트 WebSocket 과 같은 형식(바이너리 JSON)으로 송출
+
+    speed: 1 이면 실제 시간 간격 그대로, 60 이면 60배속, 0 이면 대기 없이 전부 전송
+    """
+
+    def __init__(self, messages, host="localhost", port=8765, speed=0):
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.speed = speed
+
+    async def _handle(self, websocket, *args):
+        request = json.loads(await websocket.recv())
+        codes = set()
+        for item in request:
+            codes.update(item.get("codes", []))
+        prev_ts = None
+        for message in self.messages:
+            if codes and message.get("code") not in codes:
+                continue
+            ts = message.get("trade_timestamp", 0)
+            if self.speed and prev_ts is not None and ts > prev_ts:
+                await asyncio.sleep((ts - prev_ts) / 1000 / self.speed)
+            prev_ts = ts
+            await websocket.send(json.dumps(message).encode("utf-8"))
+        await websocket.close()
+
+    async def start(self):
+        """송출 시작 → 서버 객체 (port=0 이면 비어 있는 포트를 골라 self.port 에 기록)"""
+        server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def serve_forever(self):
+        server = await self.start()
+        print(f"📼 리플레이 서버: ws://{self.host}:{self.port} ({len(self.messages)}건, {self.speed or '최대'}배속)")
+        try:
+            await asyncio.Future()
+        finally:
+            server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업비트 시세 스트림 녹화/리플레이")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="실시간 체결을 JSONL 로 녹화")
+    record.add_argument("--tickers", nargs="+", default=["KRW-BTC"])
+    record.add_argument("--out", default="trades.jsonl")
+
+    synth = sub.add_parser("synth", help="과거 캔들로 체결 JSONL 생성")
+    synth.add_argument("--ticker", default="KRW-BTC")
+    synth.add_argument("--interval", default="minute1", choices=list(INTERVAL_MS))
+    synth.add_argument("--count", type=int, default=600)
+    synth.add_argument("--out", default="trades.jsonl")
+
+    serve = sub.add_parser("serve", help="JSONL 체결을 로컬 WebSocket 으로 송출")
+    serve.add_argument("--file", default="trades.jsonl")
+    serve.add_argument("--host", default="localhost")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--speed", type=float, default=0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        feed = MarketFeed(args.tickers, [], record_path=args.out)
+        asyncio.run(feed.run())
+    elif args.command == "synth":
+        from autobot_trader import candle_store
+        df = candle_store.get_ohlcv(args.ticker, interval=args.interval, count=args.count)
+        if df is None or df.empty:
+            print(f"❌ 데이터 로딩 실패: {args.ticker}")
+            return
+        with open(args.out, "w", encoding="utf-8") as f:
+            for message in ohlcv_to_trades(df, args.ticker, args.interval):
+                f.write(json.dumps(message) + "\n")
+        print(f"✅ {len(df)}봉 → {args.out}")
+    else:
+        asyncio.run(ReplayServer(load_messages(args.file), args.host, args.port, args.speed).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# src/autobot_trader/market_snapshot.py
+# 현재가/잔고 스냅샷
+# - 추적 중인 모든 티커의 현재가를 한 번의 다중 티커 요청으로 조회
+# - 전체 잔고는 get_balances() 한 번으로 조회
+# - 짧은 TTL 동안 캐시하여 같은 틱의 여러 전략 작업이 공유
+# - 시세 스트림이 update_price 로 밀어 넣은 가격은 REST 조회 없이 사용
+
+import threading
+import time
+
+from autobot_trader.strategy_registry import LazyFunction
+
+PRICE_TTL = 2.0     # 현재가 캐시 유지 시간 (초)
+BALANCE_TTL = 5.0   # 잔고 캐시 유지 시간 (초)
+STREAM_PRICE_TTL = 30.0  # 시세 스트림 체결가 유지 시간 (체결이 뜸한 티커 고려)
+
+get_current_price = LazyFunction("pyupbit:get_current_price")  # 첫 REST 조회 때 pyupbit import
+
+
+def currency_of(ticker):
+    """'KRW-BTC' → 'BTC', 'KRW' → 'KRW'"""
+    return ticker.split("-")[-1]
+
+
+class MarketSnapshot:
+    def __init__(self, upbit=None, tickers=(), price_ttl=PRICE_TTL, balance_ttl=BALANCE_TTL):
+        self.upbit = upbit
+        self.tickers = set(tickers)
+        self.price_ttl = price_ttl
+        self.balance_ttl = balance_ttl
+        self.prices = {}
+        self.balances = {}
+        self.prices_at = 0.0
+        self.pushed_at = {}  # 티커 → 시세 스트림으로 마지막 갱신된 시각
+        self.balances_at = 0.0
+        self.price_lock = threading.Lock()
+        self.balance_lock = threading.Lock()
+
+    def track(self, *tickers):
+        self.tickers.update(tickers)
+
+    # ----- 현재가 -----
+
+    def get_prices(self, tickers=None):
+        """티커 → 현재가 dict (TTL 이 지났거나 새 티커가 있으면 한 번에 갱신)"""
+        if tickers is not None:
+            self.track(*tickers)
+        with self.price_lock:
+            now = time.time()
+            stale = any(
+                now - self.prices_at >= self.price_ttl and now - self.pushed_at.get(t, 0.0) >= STREAM_PRICE_TTL
+                for t in self.tickers
+            )
+            if stale or not self.tickers.issubset(self.prices):
+                self._refresh_prices()
+            prices = dict(self.prices)
+        return prices if tickers is None else {t: prices.get(t) for t in tickers}
+
+    def update_price(self, ticker, price):
+        """시세 스트림(WebSocket) 체결가 반영 → 스트림이 살아 있는 동안 REST 조회 없음"""
+        with self.price_lock:
+            self.prices[ticker] = price
+            self.pushed_at[ticker] = time.time()
+
+    def get_price(self, ticker):
+        return self.get_prices([ticker]).get(ticker)
+
+    def _refresh_prices(self):
+        tickers = sorted(self.tickers)
+        if not tickers:
+            return
+        try:
+            result = get_current_price(tickers)
+        except Exception as e:
+            print(f"❌ 현재가 일괄 조회 실패: {e}")
+            return
+        if isinstance(result, dict):
+            self.prices.update({ticker: float(price) for ticker, price in result.items() if price is not None})
+        elif result is not None and len(tickers) == 1:
+            self.prices[tickers[0]] = float(result)
+        else:
+            return
+        self.prices_at = time.time()
+
+    # ----- 잔고 -----
+
+    def get_balances(self):
+        """통화 → {"balance", "locked", "avg_buy_price"} dict"""
+        with self.balance_lock:
+            if time.time() - self.balances_at >= self.balance_ttl:
+                self._refresh_balances()
+            return dict(self.balances)
+
+    def get_balance(self, ticker):
+        """pyupbit.Upbit.get_balance 와 같이 주문 가능 수량 반환 (조회 실패 시 None)"""
+        balances = self.get_balances()
+        if not balances and self.balances_at == 0.0:
+            return None
+        entry = balances.get(currency_of(ticker))
+        return entry["balance"] if entry else 0.0
+
+    def invalidate_balances(self):
+        """주문 직후 잔고가 바뀌었으므로 다음 조회 때 다시 가져오도록 표시"""
+        with self.balance_lock:
+            self.balances_at = 0.0
+
+    def _refresh_balances(self):
+        if self.upbit is None:
+            return
+        try:
+            rows = self.upbit.get_balances()
+        except Exception as e:
+            print(f"❌ 잔고 일괄 조회 실패: {e}")
+            return
+        if not isinstance(rows, list):
+            print(f"❌ 잔고 일괄 조회 실패: {rows}")
+            return
+        self.balances = {
+            row["currency"]: {
+                "balance": float(row.get("balance", 0)),
+                "locked": float(row.get("locked", 0)),
+                "avg_buy_price": float(row.get("avg_buy_price", 0)),
+            }
+            for row in rows
+        }
+        self.balances_at = time.time()
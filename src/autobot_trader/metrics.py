@@ -0,0 +1,188 @@
+# src/autobot_trader/metrics.py
+# 시그널 로그 → 왕복 거래 매칭과 성과 지표
+# - 매칭: (티커, 전략) 별 포지션 기준 FIFO. 매수 시그널마다 같은 금액의 랏을 열고,
+#   매도 시그널은 run_multi_coin/백테스트 엔진과 같이 열린 랏 전체를 청산 (보유가 없으면 무시)
+# - 모든 계산은 반복문 없이 numpy/pandas 벡터 연산으로 수행
+# - 지표: 누적 수익률, MDD, 샤프, 소르티노, 승률, 노출 비율, 회전율
+#   (한 번의 매도로 청산된 랏들은 원가 가중 평균 수익률을 가진 거래 하나로 묶어 복리 계산)
+
+import numpy as np
+import pandas as pd
+
+TRADING_FEE = 0.001  # 0.1% 수수료 (리포트 기본값)
+GROUP_KEYS = ["ticker", "strategy"]
+EXIT_KEYS = GROUP_KEYS + ["sell_time"]  # 같은 매도로 청산된 랏 묶음
+TRADE_COLUMNS = [
+    "ticker", "strategy", "buy_time", "buy_price", "sell_time", "sell_price", "return_pct",
+]
+
+
+def pair_trades(signals, fee=TRADING_FEE):
+    """시그널 DataFrame[time, ticker, strategy, signal, price] → 왕복 거래 DataFrame (매도 시각순)
+
+    같은 시각의 시그널은 로그에 기록된 순서를 따른다. 마지막 매도 이후 열린 랏은 제외.
+    """
+    if signals.empty:
+        return pd.DataFrame(columns=TRADE_COLUMNS)
+
+    df = signals[signals["signal"].isin(["buy", "sell"])]
+    df = df.sort_values(GROUP_KEYS + ["time"], kind="stable").reset_index(drop=True)
+    group = df.groupby(GROUP_KEYS, sort=False, observed=True).ngroup().to_numpy()
+    is_sell = (df["signal"] == "sell").to_numpy()
+
+    # 각 행 이후(자기 포함) 처음 나오는 매도 행 위치 (뒤에서부터 누적 최소)
+    n = len(df)
+    positions = np.where(is_sell, np.arange(n), n)
+    next_sell = np.minimum.accumulate(positions[::-1])[::-1]
+
+    buys = np.flatnonzero(~is_sell)
+    exits = next_sell[buys]
+    matched = exits < n
+    buys, exits = buys[matched], exits[matched]
+    same_group = group[exits] == group[buys]
+    buys, exits = buys[same_group], exits[same_group]
+
+    buy_price = df["price"].to_numpy(dtype=np.float64)[buys]
+    sell_price = df["price"].to_numpy(dtype=np.float64)[exits]
+    trades = pd.DataFrame({
+        "ticker": df["ticker"].to_numpy()[buys],
+        "strategy": df["strategy"].to_numpy()[buys],
+        "buy_time": df["time"].to_numpy()[buys],
+        "buy_price": buy_price,
+        "sell_time": df["time"].to_numpy()[exits],
+        "sell_price": sell_price,
+        "return_pct": (sell_price * (1 - fee) - buy_price * (1 + fee)) / (buy_price * (1 + fee)) * 100,
+        "exit_row": exits,
+    })
+    trades = trades.sort_values(["sell_time", "exit_row"], kind="stable")
+    return trades.drop(columns="exit_row").reset_index(drop=True)
+
+
+def exit_returns(trades):
+    """매도(청산) 단위 수익률 배열 (%, 매도 시각순)
+
+    랏은 매수 시그널마다 같은 금액으로 열리므로 원가 가중 평균 = 랏 수익률의 단순 평균.
+    """
+    if trades.empty:
+        return np.zeros(0)
+    grouped = trades.groupby(EXIT_KEYS, observed=True, sort=False)["return_pct"].mean()
+    return grouped.to_numpy(dtype=np.float64)
+
+
+def equity_curve(trades):
+    """매도 단위 수익률을 매도 시각순으로 복리 누적 → cumulative / drawdown 컬럼 추가
+
+    같은 매도로 청산된 랏 행들은 그 매도 이후의 같은 누적값을 가진다.
+    """
+    trades = trades.copy()
+    per_exit = trades.groupby(EXIT_KEYS, observed=True, sort=False)["return_pct"].transform("mean")
+    first = ~trades.duplicated(EXIT_KEYS).to_numpy()
+    growth = np.where(first, 1 + per_exit.to_numpy(dtype=np.float64) / 100, 1.0)
+    trades["cumulative"] = np.cumprod(growth)
+    trades["drawdown"] = trades["cumulative"] / trades["cumulative"].cummax() - 1
+    return trades
+
+
+def max_drawdown(curve):
+    """자산 곡선 → 최대 낙폭(%), 음수"""
+    values = np.asarray(curve, dtype=np.float64)
+    if len(values) == 0:
+        return 0.0
+    return float((values / np.maximum.accumulate(values) - 1).min() * 100)
+
+
+def sharpe_ratio(returns, periods_per_year=1.0):
+    """수익률 배열 → 연환산 샤프지수 (무위험수익률 0)"""
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < 2:
+        return 0.0
+    std = returns.std()
+    if std == 0 or np.isnan(std):
+        return 0.0
+    return float(returns.mean() / std * np.sqrt(periods_per_year))
+
+
+def sortino_ratio(returns, periods_per_year=1.0):
+    """수익률 배열 → 연환산 소르티노지수 (하방 편차 기준)"""
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < 2:
+        return 0.0
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    if downside == 0 or np.isnan(downside):
+        return 0.0
+    return float(returns.mean() / downside * np.sqrt(periods_per_year))
+
+
+def curve_sharpe(curve):
+    """시간 인덱스가 있는 자산 곡선 → 봉 간격 기준 연환산 샤프지수"""
+    if len(curve) < 3:
+        return 0.0
+    values = curve.to_numpy(dtype=np.float64)
+    bar_seconds = np.median(np.diff(curve.index.values).astype("timedelta64[s]").astype(np.int64))
+    return sharpe_ratio(np.diff(values) / values[:-1], 365 * 86400 / max(bar_seconds, 1))
+
+
+def exposure(trades, start=None, end=None):
+    """포지션 보유 시간 / 전체 기간 (0~1)
+
+    한 번의 매도로 청산되는 랏들은 첫 매수부터 매도까지 하나의 보유 구간으로 본다.
+    """
+    if trades.empty:
+        return 0.0
+    start = pd.Timestamp(start) if start is not None else trades["buy_time"].min()
+    end = pd.Timestamp(end) if end is not None else trades["sell_time"].max()
+    span = (end - start).total_seconds()
+    if span <= 0:
+        return 0.0
+    holds = trades.groupby(EXIT_KEYS, observed=True)["buy_time"].min()
+    held = (holds.index.get_level_values("sell_time").to_numpy() - holds.to_numpy()).astype("timedelta64[s]").astype(np.int64).sum()
+    groups = trades.groupby(GROUP_KEYS, observed=True).ngroups
+    return float(min(held / (span * max(groups, 1)), 1.0))
+
+
+def summarize_trades(trades, start=None, end=None):
+    """왕복 거래 → 성과 지표 dict (수익률/MDD 는 %, 노출 비율은 0~1, 회전율은 연간 왕복 횟수)"""
+    if trades.empty:
+        return {
+            "total_return": 0.0, "mdd": 0.0, "sharpe": 0.0, "sortino": 0.0,
+            "win_rate": 0.0, "exposure": 0.0, "turnover": 0.0, "trade_count": 0,
+        }
+    returns = exit_returns(trades) / 100
+    cumulative = np.cumprod(1 + returns)
+    first = pd.Timestamp(start) if start is not None else trades["buy_time"].min()
+    last = pd.Timestamp(end) if end is not None else trades["sell_time"].max()
+    years = max((last - first).total_seconds() / (365 * 86400), 1 / 365)
+    trades_per_year = len(returns) / years
+    return {
+        "total_return": float(cumulative[-1] - 1) * 100,
+        "mdd": min(max_drawdown(np.concatenate([[1.0], cumulative])), 0.0),
+        "sharpe": sharpe_ratio(returns, trades_per_year),
+        "sortino": sortino_ratio(returns, trades_per_year),
+        "win_rate": float((returns > 0).mean() * 100),
+        "exposure": exposure(trades, first, last),
+        "turnover": trades_per_year,
+        "trade_count": len(returns),
+    }
+
+
+def summarize_by(trades, keys=("strategy",)):
+    """그룹별 성과 지표 DataFrame"""
+    keys = list(keys)
+    if trades.empty:
+        return pd.DataFrame(columns=keys)
+    rows = [
+        {**dict(zip(keys, name if isinstance(name, tuple) else (name,))), **summarize_trades(group)}
+        for name, group in trades.groupby(keys, observed=True)
+    ]
+    return pd.DataFrame(rows)
+
+
+def report_rows(trades):
+    """리포트 템플릿용 거래 행 (buy / sell / profit, 소수 둘째 자리)"""
+    return pd.DataFrame({
+        "buy_time": trades["buy_time"],
+        "buy": trades["buy_price"].round(2),
+        "sell_time": trades["sell_time"],
+        "sell": trades["sell_price"].round(2),
+        "profit": trades["return_pct"].round(2),
+    }).to_dict(orient="records")
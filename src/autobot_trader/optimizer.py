@@ -0,0 +1,97 @@
+# src/autobot_trader/optimizer.py
+# 전략 파라미터 스윕 최적화
+# - OHLCV 는 공유 메모리에 한 번만 올리고 워커는 복사 없이 붙어서 사용 (pickle 전송 없음)
+# - 파라미터 조합별 벡터화 백테스트를 프로세스 풀로 모든 코어에서 실행
+# - 수익률/MDD/샤프/거래 수 순위표를 CSV 로 저장
+#
+# 사용 예) python -m autobot_trader.optimizer --ticker KRW-BTC --interval minute60 --count 8760 --strategies rsi bollinger
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from autobot_trader import candle_store
+from autobot_trader.backtest_engine import run_backtest, summarize
+from autobot_trader.shared_frames import FRAMES, share_frames, attach_frames, release
+
+RESULT_DIR = "backtest"
+
+PARAM_GRIDS = {
+    "volatility_breakout": {"k": [0.3, 0.4, 0.5, 0.6, 0.7]},
+    "bollinger": {"window": [10, 20, 30, 40], "num_std": [1.5, 2, 2.5, 3]},
+    "moving_average": {"short": [3, 5, 10, 15], "long": [20, 30, 60, 120]},
+    "trend_following": {"short": [10, 20, 50], "long": [100, 150, 200]},
+    "rsi": {"period": [7, 14, 21], "lower": [20, 25, 30], "upper": [70, 75, 80]},
+    "momentum": {"period": [7, 14, 21], "upper": [60, 70, 80], "lower": [20, 30, 40]},
+}
+
+def expand_grid(grid):
+    """{"a": [1, 2], "b": [3]} → [{"a": 1, "b": 3}, {"a": 2, "b": 3}] (단기 < 장기 조건 위반 조합 제외)"""
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    return [p for p in combos if p.get("short", 0) < p.get("long", float("inf"))
+            and p.get("lower", 0) < p.get("upper", float("inf"))]
+
+
+def _evaluate(job):
+    strategy, params, ticker = job
+    try:
+        trades, equity = run_backtest(FRAMES[ticker], strategy, ticker=ticker, params=params)
+        result = summarize(trades, equity)
+    except Exception as e:
+        print(f"⚠️ {strategy} {params} 백테스트 오류: {e}")
+        return None
+    return {"strategy": strategy, "params": params, **result}
+
+
+def optimize(df, strategies=None, grids=None, ticker="KRW-BTC", sort_by="sharpe", workers=None):
+    """전략 × 파라미터 조합 전체를 병렬 백테스트 → 순위표 DataFrame"""
+    grids = grids or PARAM_GRIDS
+    strategies = strategies or list(grids)
+    jobs = [(name, params, ticker) for name in strategies for params in expand_grid(grids.get(name, {}))]
+    print(f"🔎 {len(jobs)}개 조합 최적화 시작 ({len(df)}봉, 워커 {workers or os.cpu_count()}개)")
+
+    blocks, metas = share_frames({ticker: df})
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_frames, initargs=(metas,)) as pool:
+            results = [r for r in pool.map(_evaluate, jobs, chunksize=max(1, len(jobs) // 64)) if r]
+    finally:
+        release(blocks)
+
+    table = pd.DataFrame(results)
+    if table.empty:
+        return table
+    table["params"] = table["params"].map(lambda p: ", ".join(f"{k}={v}" for k, v in p.items()))
+    table = table.sort_values(sort_by, ascending=False).reset_index(drop=True)  # MDD 는 음수라 큰 값이 유리
+    table.insert(0, "rank", table.index + 1)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전략 파라미터 스윕 최적화")
+    parser.add_argument("--ticker", default="KRW-BTC")
+    parser.add_argument("--interval", default="minute60")
+    parser.add_argument("--count", type=int, default=24 * 365)
+    parser.add_argument("--strategies", nargs="*", default=None, choices=list(PARAM_GRIDS))
+    parser.add_argument("--sort", default="sharpe", choices=["sharpe", "total_return", "mdd", "trade_count", "win_rate"])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    df = candle_store.get_ohlcv(args.ticker, interval=args.interval, count=args.count)
+    if df is None or df.empty:
+        print(f"❌ 데이터 로딩 실패: {args.ticker}")
+        return
+
+    table = optimize(df, args.strategies, ticker=args.ticker, sort_by=args.sort, workers=args.workers)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    path = os.path.join(RESULT_DIR, f"optimize_{args.ticker}_{args.interval}.csv")
+    table.to_csv(path, index=False)
+    print(table.head(20).to_string(index=False))
+    print(f"✅ 결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,287 @@
 # src/autobot_trader/order_executor.py
-import pyupbit
+# 주문 실행 서비스
+# - 프로세스 전체가 공유하는 업비트 클라이언트 하나 (실행 스크립트들은 여기의 upbit 를 사용)
+#   → pyupbit(pandas 포함)는 클라이언트/호가 단위를 처음 쓸 때 import (러너 시작 시간 단축)
+# - 주문 요청은 keep-alive 세션으로 전송 (매번 새 연결을 맺지 않음)
+# - 주문마다 identifier(클라이언트 주문 ID) 부여 → 응답 유실 시 같은 ID 로 조회해 중복 주문 방지
+# - 체결 완료까지 주문 상태를 조회해 실제 평균 체결가/체결 수량/수수료 반환
+# - 지정가 주문 묶음 처리: 여러 주문을 동시에 전송하고, 상태 조회/취소는 uuid 묶음 단위 요청 하나로 처리
+
+import hashlib
 import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import jwt
+import requests
 from dotenv import load_dotenv
 
+from autobot_trader.strategy_registry import LazyFunction
+
 load_dotenv()
 
 ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
 SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
 
-upbit = pyupbit.Upbit(ACCESS_KEY, SECRET_KEY)
+API_URL = "https://api.upbit.com/v1"
+REQUEST_TIMEOUT = (3.05, 10)   # (연결, 응답) 초
+MAX_RETRIES = 3
+FILL_POLL_INTERVAL = 0.2       # 체결 조회 시작 간격 (초), 조회할 때마다 1.5배
+FILL_TIMEOUT = 10.0            # 이 시간 안에 체결이 끝나지 않으면 그때까지의 체결로 반환
+FINAL_STATES = ("done", "cancel")
+BATCH_WORKERS = 4              # 주문 묶음 동시 전송 수
+ORDER_INTERVAL = 1 / 8         # 주문 요청 최소 간격 (업비트 주문 API 초당 8회 제한)
+UUID_BATCH = 100               # uuid 묶음 조회 최대 개수
+CANCEL_BATCH = 20              # uuid 묶음 취소 최대 개수
+
+get_tick_size = LazyFunction("pyupbit:get_tick_size")
+
+
+class OrderError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status} {message}")
+        self.status = status
+
+    @property
+    def retryable(self):
+        return self.status == 429 or self.status >= 500
+
+
+class OrderExecutor:
+    def __init__(self, access_key, secret_key):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self._upbit = None
+        self.local = threading.local()  # 스레드별 keep-alive 세션
+        self.order_lock = threading.Lock()
+        self.next_order_at = 0.0
+        self.pool = None
+
+    @property
+    def upbit(self):
+        """pyupbit 클라이언트 (처음 접근할 때 생성)"""
+        if self._upbit is None:
+            import pyupbit
+            self._upbit = pyupbit.Upbit(self.access_key, self.secret_key)
+        return self._upbit
+
+    @property
+    def session(self):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            self.local.session = session
+        return session
+
+    # ----- 주문 -----
+
+    def market_buy(self, ticker, amount_krw, strategy=None):
+        params = {"market": ticker, "side": "bid", "price": str(amount_krw), "ord_type": "price"}
+        return self._execute(params, strategy)
+
+    def market_sell(self, ticker, volume, strategy=None):
+        params = {"market": ticker, "side": "ask", "volume": str(volume), "ord_type": "market"}
+        return self._execute(params, strategy)
+
+    def limit_order(self, ticker, side, price, volume, strategy=None):
+        """지정가 주문 접수 → 주문 응답 dict (체결을 기다리지 않음)"""
+        price = get_tick_size(price, "floor" if side == "buy" else "ceil")
+        params = {
+            "market": ticker,
+            "side": "bid" if side == "buy" else "ask",
+            "volume": f"{volume:.8f}",
+            "price": f"{price:f}".rstrip("0").rstrip("."),
+            "ord_type": "limit",
+        }
+        params["identifier"] = new_identifier(strategy, ticker, params["side"])
+        return self._place(params)
+
+    def place_orders(self, orders, strategy=None):
+        """지정가 주문 묶음 [{"ticker", "side", "price", "volume"}] → 같은 순서의 주문 응답 목록 (실패는 None)
+
+        업비트에는 주문 생성 묶음 API 가 없으므로 keep-alive 세션으로 동시에 전송하되 초당 제한은 지킨다.
+        """
+        if not orders:
+            return []
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="order")
+
+        def submit(order):
+            try:
+                return self.limit_order(order["ticker"], order["side"], order["price"], order["volume"], strategy)
+            except Exception as e:
+                print(f"❌ 지정가 주문 실패 ({order['ticker']} {order['side']} {order['price']}): {e}")
+                return None
+
+        return list(self.pool.map(submit, orders))
+
+    def get_orders(self, uuids, ticker=None):
+        """uuid 목록 → {uuid: 주문 dict} (UUID_BATCH 개씩 묶어 조회)"""
+        found = {}
+        uuids = list(uuids)
+        for start in range(0, len(uuids), UUID_BATCH):
+            params = {"uuids[]": uuids[start:start + UUID_BATCH]}
+            if ticker:
+                params["market"] = ticker
+            try:
+                for order in self._request("GET", "/orders/uuids", params):
+                    found[order["uuid"]] = order
+            except (requests.RequestException, OrderError) as e:
+                print(f"⚠️ 주문 묶음 조회 실패: {e}")
+        return found
+
+    def cancel_orders(self, uuids):
+        """uuid 목록 일괄 취소 → 취소 요청이 받아들여진 uuid 목록"""
+        cancelled = []
+        uuids = list(uuids)
+        for start in range(0, len(uuids), CANCEL_BATCH):
+            params = {"uuids[]": uuids[start:start + CANCEL_BATCH]}
+            try:
+                result = self._request("DELETE", "/orders/uuids", params)
+                cancelled.extend(order["uuid"] for order in result.get("success", {}).get("orders", []))
+            except (requests.RequestException, OrderError) as e:
+                print(f"⚠️ 주문 일괄 취소 실패: {e}")
+        return cancelled
+
+    def _execute(self, params, strategy):
+        params["identifier"] = new_identifier(strategy, params["market"], params["side"])
+        order = self._place(params)
+        if order.get("state") not in FINAL_STATES:
+            order = self.wait_for_fill(order["uuid"]) or order
+        return summarize_order(order)
+
+    def _place(self, params):
+        """주문 전송. 응답을 못 받았으면 identifier 로 조회해 이미 접수됐는지 확인 후 재전송"""
+        error = None
+        for attempt in range(1, MAX_RETRIES + 1):
+            self._wait_order_slot()
+            try:
+                return self._request("POST", "/orders", params)
+            except requests.RequestException as e:
+                error = e
+            except OrderError as e:
+                error = e
+                if not e.retryable:
+                    break
+            existing = self.get_order(identifier=params["identifier"])
+            if existing:
+                return existing
+            print(f"⚠️ 주문 재시도 {attempt}/{MAX_RETRIES}: {error}")
+            time.sleep(0.2 * 2 ** attempt)
+        existing = self.get_order(identifier=params["identifier"])
+        if existing:
+            return existing
+        raise OrderError(getattr(error, "status", 0), f"주문 실패 ({params['market']} {params['side']}): {error}")
+
+    def _wait_order_slot(self):
+        with self.order_lock:
+            now = time.monotonic()
+            delay = self.next_order_at - now
+            self.next_order_at = max(now, self.next_order_at) + ORDER_INTERVAL
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_order(self, order_uuid=None, identifier=None):
+        params = {"uuid": order_uuid} if order_uuid else {"identifier": identifier}
+        try:
+            return self._request("GET", "/order", params)
+        except (requests.RequestException, OrderError):
+            return None
+
+    def wait_for_fill(self, order_uuid, timeout=FILL_TIMEOUT):
+        """주문이 done/cancel 이 될 때까지 조회 (시장가는 보통 1초 안에 끝남)"""
+        deadline = time.monotonic() + timeout
+        delay = FILL_POLL_INTERVAL
+        order = None
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            order = self.get_order(order_uuid) or order
+            if order and order.get("state") in FINAL_STATES:
+                return order
+            delay = min(delay * 1.5, 1.0)
+        print(f"⚠️ 체결 확인 시간 초과: {order_uuid}")
+        return order
+
+    # ----- 요청 -----
+
+    def _headers(self, params):
+        payload = {"access_key": self.access_key, "nonce": str(uuid.uuid4())}
+        if params:
+            # 배열 파라미터(uuids[])는 대괄호를 인코딩하지 않은 문자열로 해시 (업비트 규칙)
+            query = urlencode(params, doseq=True).replace("%5B%5D=", "[]=").encode()
+            payload["query_hash"] = hashlib.sha512(query).hexdigest()
+            payload["query_hash_alg"] = "SHA512"
+        return {"Authorization": f"Bearer {jwt.encode(payload, self.secret_key, algorithm='HS256')}"}
+
+    def _request(self, method, path, params):
+        url = API_URL + path
+        headers = self._headers(params)
+        if method in ("GET", "DELETE"):
+            response = self.session.request(method, url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        else:
+            response = self.session.post(url, json=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code >= 400:
+            raise OrderError(response.status_code, response.text[:200])
+        return response.json()
+
+
+def new_identifier(strategy, ticker, side):
+    """전략/티커/방향 + 임의값 (업비트 identifier 는 계정 내에서 유일해야 함)"""
+    return f"{strategy or 'manual'}-{ticker}-{side}-{uuid.uuid4().hex[:16]}"
+
+
+def summarize_order(order):
+    """주문 조회 결과 → 체결 요약 dict (평균 체결가는 체결 내역 기준)"""
+    trades = order.get("trades") or []
+    volume = sum(float(t["volume"]) for t in trades) or float(order.get("executed_volume") or 0)
+    funds = sum(float(t.get("funds") or float(t["price"]) * float(t["volume"])) for t in trades)
+    if not trades:
+        # 묶음 조회 응답에는 체결 내역이 없음 → 체결 금액 필드, 지정가는 주문 가격으로 계산
+        funds = float(order.get("executed_funds") or 0)
+        if not funds and order.get("ord_type") == "limit":
+            funds = volume * float(order.get("price") or 0)
+    avg_price = funds / volume if volume else 0.0
+    return {
+        "uuid": order.get("uuid"),
+        "identifier": order.get("identifier"),
+        "ticker": order.get("market"),
+        "side": "buy" if order.get("side") == "bid" else "sell",
+        "state": order.get("state"),
+        "executed_volume": volume,
+        "avg_price": avg_price,
+        "funds": funds,
+        "fee": float(order.get("paid_fee") or 0),
+        "filled": volume > 0,
+    }
+
+
+executor = OrderExecutor(ACCESS_KEY, SECRET_KEY)
+
+
+def __getattr__(name):
+    # upbit: 잔고 조회 등에 쓰는 공유 클라이언트 (import 하는 시점에 생성)
+    if name == "upbit":
+        return executor.upbit
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def market_buy(ticker, amount_krw):
+def market_buy(ticker, amount_krw, strategy=None):
     try:
-        result = upbit.buy_market_order(ticker, amount_krw)
-        print(f"✅ 매수 실행: {ticker} - {amount_krw} KRW")
-        return result
+        result = executor.market_buy(ticker, amount_krw, strategy)
+        print(f"✅ 매수 체결: {ticker} - {amount_krw} KRW → {result['executed_volume']} @ {result['avg_price']:,.0f} (수수료 {result['fee']:,.2f})")
+        return result if result["filled"] else None
     except Exception as e:
         print(f"❌ 매수 실패: {e}")
         return None
 
-def market_sell(ticker, volume):
+def market_sell(ticker, volume, strategy=None):
     try:
-        result = upbit.sell_market_order(ticker, volume)
-        print(f"✅ 매도 실행: {ticker} - {volume} 개")
-        return result
+        result = executor.market_sell(ticker, volume, strategy)
+        print(f"✅ 매도 체결: {ticker} - {result['executed_volume']} 개 @ {result['avg_price']:,.0f} (수수료 {result['fee']:,.2f})")
+        return result if result["filled"] else None
     except Exception as e:
         print(f"❌ 매도 실패: {e}")
         return None
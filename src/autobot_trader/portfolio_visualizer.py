@@ -3,39 +3,42 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import os
 from dotenv import load_dotenv
+from autobot_trader.market_snapshot import MarketSnapshot
+from autobot_trader.order_executor import upbit
 
 # .env 불러오기
 load_dotenv()
 
-ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
-SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
-
 # 한글 폰트 설정
 plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
-# 업비트 API 객체
-upbit = pyupbit.Upbit(ACCESS_KEY, SECRET_KEY)
+snapshot = MarketSnapshot(upbit)
 
 # 마켓 필터
 valid_tickers = pyupbit.get_tickers(fiat="KRW")
-balances = upbit.get_balances()
-
-labels = []
-values = []
+balances = snapshot.get_balances()
 
-for b in balances:
-    currency = b['currency']
-    if b['balance'] == '0' or currency == "KRW":
+holdings = {}
+for currency, b in balances.items():
+    if b['balance'] == 0 or currency == "KRW":
         continue
 
     ticker = f"KRW-{currency}"
     if ticker not in valid_tickers:
         print(f"❌ 제외됨: {ticker}")
         continue
+    holdings[ticker] = b['balance']
+
+# 보유 종목 현재가를 한 번에 조회
+prices = snapshot.get_prices(list(holdings)) if holdings else {}
+
+labels = []
+values = []
 
-    amount = float(b['balance'])
-    price = pyupbit.get_current_price(ticker)
+for ticker, amount in holdings.items():
+    currency = ticker.split("-")[1]
+    price = prices.get(ticker)
     if price is None:
         print(f"❌ 가격 조회 실패: {ticker}")
         continue
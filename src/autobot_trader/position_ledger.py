@@ -0,0 +1,89 @@
+# src/autobot_trader/position_ledger.py
+# 전략별 보유 수량 장부 (같은 코인을 여러 전략이 보유할 때 서로의 수량을 팔지 않도록)
+# - 전략/티커별 수량은 거래 DB 의 FIFO 미청산 수량(pnl_summary) 기준 → 재시작해도 유지
+# - 매도 시 거래소 잔고 조회 대신 장부 수량을 사용 (작업마다 private API 호출 없음)
+# - reconcile(): 주기적으로 get_balances() 와 대사
+#   · 거래소 잔고 < 장부 합계 (수동 매도, 출금 등): 두 번 연속 확인되면 전략별 수량을 비율대로 줄임
+#   · 거래소 잔고 > 장부 합계 (추적 이전 보유분, 수동 매수): 어느 전략에도 배정하지 않고 보고만 함
+
+import threading
+
+from autobot_trader import trade_store
+from autobot_trader.market_snapshot import currency_of
+
+DUST_VOLUME = 1e-8  # 이 이하 차이는 부동소수점 오차로 봄
+
+
+class PositionLedger:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.lock = threading.Lock()
+        self.volumes = {}     # (strategy, ticker) → 보유 수량
+        self.shortfalls = {}  # ticker → 직전 대사에서 확인된 부족 수량
+
+    def load(self):
+        rows = trade_store.get_open_positions()
+        with self.lock:
+            self.volumes = {(row["strategy"], row["ticker"]): row["volume"] for row in rows}
+        print(f"📒 포지션 장부: {len(rows)}개 (전략, 티커)")
+
+    def sync(self, strategy, ticker):
+        """체결 후 (전략, 티커) 수량을 DB 기준으로 갱신"""
+        found = trade_store.get_open_positions(strategy, ticker)
+        with self.lock:
+            if found:
+                self.volumes[(strategy, ticker)] = found[0]["volume"]
+            else:
+                self.volumes.pop((strategy, ticker), None)
+
+    def get_volume(self, strategy, ticker):
+        with self.lock:
+            return self.volumes.get((strategy, ticker), 0.0)
+
+    def totals(self):
+        """티커 → 전 전략 보유 수량 합계"""
+        totals = {}
+        with self.lock:
+            for (_, ticker), volume in self.volumes.items():
+                totals[ticker] = totals.get(ticker, 0.0) + volume
+        return totals
+
+    def reconcile(self):
+        """거래소 잔고와 장부 대사 → 티커별 {"ledger", "exchange", "unassigned", "adjusted"} 목록
+
+        주문 체결과 장부 기록 사이에 대사가 끼어드는 경우를 피하려고 부족분은 연속 두 번 확인된 뒤에만 반영한다.
+        """
+        self.snapshot.invalidate_balances()
+        balances = self.snapshot.get_balances()
+        if self.snapshot.balances_at == 0.0:
+            print("⚠️ 잔고 조회 실패로 장부 대사를 건너뜀")
+            return []
+
+        report = []
+        shortfalls = {}
+        for ticker, total in self.totals().items():
+            entry = balances.get(currency_of(ticker)) or {}
+            held = entry.get("balance", 0.0) + entry.get("locked", 0.0)
+            tolerance = max(DUST_VOLUME, total * 1e-6)
+            item = {"ticker": ticker, "ledger": total, "exchange": held, "unassigned": 0.0, "adjusted": 0.0}
+            if total - held > tolerance:
+                shortfall = total - held
+                if ticker in self.shortfalls:
+                    self._shrink(ticker, total, min(shortfall, self.shortfalls[ticker]))
+                    item["adjusted"] = min(shortfall, self.shortfalls[ticker])
+                else:
+                    shortfalls[ticker] = shortfall
+            elif held - total > tolerance:
+                item["unassigned"] = held - total
+            report.append(item)
+        self.shortfalls = shortfalls
+        return report
+
+    def _shrink(self, ticker, total, shortfall):
+        with self.lock:
+            holders = [(strategy, volume) for (strategy, t), volume in self.volumes.items() if t == ticker]
+        for strategy, volume in holders:
+            cut = volume * shortfall / total
+            trade_store.adjust_position(strategy, ticker, cut, f"잔고 대사: 거래소 잔고 {shortfall:.8f} 부족")
+            self.sync(strategy, ticker)
+        print(f"📒 {ticker} 장부 수량 {shortfall:.8f} 차감 (거래소 잔고 부족)")
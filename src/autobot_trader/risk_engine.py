@@ -0,0 +1,181 @@
+# src/autobot_trader/risk_engine.py
+# 포트폴리오 리스크 엔진 (익절/손절/트레일링 스탑)
+# - 포지션은 거래 DB 의 FIFO 미청산 수량/원가(pnl_summary)를 그대로 사용 → 재시작해도 유지
+# - 보유 중 최고가는 position_peaks 테이블에 주기적으로 저장
+# - 가격이 들어올 때마다 해당 티커의 모든 (전략, 티커) 포지션을 numpy 배열 연산 한 번으로 검사
+# - 조건에 걸리면 on_exit(strategy, ticker, volume, reason) 호출 → 전략 실행 주기와 무관하게 청산
+# - 평가 금액이 최소 주문 금액보다 작은 소액 포지션은 매도할 수 없으므로 청산 요청 대신 한 번만 알리고 제외
+
+import threading
+import time
+
+import numpy as np
+
+from autobot_trader import trade_store
+from autobot_trader.settings import TAKE_PROFIT, STOP_LOSS, TRAILING_STOP, MIN_ORDER_KRW
+
+EXIT_RETRY_SECONDS = 60.0  # 청산 요청 후 포지션이 남아 있으면 이 시간 뒤에 다시 요청
+
+
+class RiskEngine:
+    def __init__(self, on_exit, take_profit=TAKE_PROFIT, stop_loss=STOP_LOSS, trailing_stop=TRAILING_STOP, exclude=(),
+                 min_order=MIN_ORDER_KRW):
+        self.on_exit = on_exit
+        self.min_order = min_order
+        self.exclude = set(exclude)         # 자체 청산 주문을 관리하는 전략 (예: 그리드 지정가 매도)
+        self.take_profit = take_profit
+        self.stop_loss = stop_loss
+        self.trailing_stop = trailing_stop
+        self.lock = threading.Lock()
+        self.keys = []                      # 행 번호 → (strategy, ticker)
+        self.volume = np.zeros(0)
+        self.entry = np.zeros(0)            # 수수료 포함 평균 매수가
+        self.peak = np.zeros(0)
+        self.retry_at = np.zeros(0)         # 청산 요청 후 재요청 가능 시각 (monotonic, 소액 포지션은 inf)
+        self.rows_by_ticker = {}            # ticker → 행 번호 배열
+        self.dirty = False                  # 저장하지 않은 최고가 변경 여부
+
+    # ----- 포지션 -----
+
+    def load(self):
+        """거래 DB 의 미청산 포지션 전체를 불러옴 (시작 시 1회)"""
+        rows = [row for row in trade_store.get_open_positions() if row["strategy"] not in self.exclude]
+        with self.lock:
+            self._set_rows([self._row(item) for item in rows])
+        print(f"🛡️ 리스크 엔진: 포지션 {len(rows)}개 감시")
+
+    def sync(self, strategy, ticker):
+        """체결 후 (전략, 티커) 포지션을 DB 기준으로 갱신"""
+        if strategy in self.exclude:
+            return
+        found = trade_store.get_open_positions(strategy, ticker)
+        with self.lock:
+            rows = self._rows()
+            index = {key: i for i, key in enumerate(self.keys)}
+            i = index.get((strategy, ticker))
+            if found:
+                row = self._row(found[0])
+                if i is None:
+                    row["peak"] = row["entry"]  # 새로 연 포지션은 최고가를 매수가부터 다시 추적
+                    rows.append(row)
+                else:
+                    row["peak"] = max(rows[i]["peak"], row["entry"])
+                    rows[i] = row
+            elif i is not None:
+                rows.pop(i)
+            self._set_rows(rows)
+        if not found:
+            trade_store.delete_peak(strategy, ticker)
+
+    def positions(self):
+        """현재 감시 중인 포지션 목록 (명령어 응답용)"""
+        with self.lock:
+            return self._rows()
+
+    @staticmethod
+    def _row(item):
+        entry = item["cost"] / item["volume"]
+        return {
+            "strategy": item["strategy"],
+            "ticker": item["ticker"],
+            "volume": item["volume"],
+            "entry": entry,
+            "peak": max(item["peak_price"] or entry, entry),
+            "retry_at": 0.0,
+        }
+
+    def _rows(self):
+        return [
+            {"strategy": strategy, "ticker": ticker, "volume": float(self.volume[i]),
+             "entry": float(self.entry[i]), "peak": float(self.peak[i]), "retry_at": float(self.retry_at[i])}
+            for i, (strategy, ticker) in enumerate(self.keys)
+        ]
+
+    def _set_rows(self, rows):
+        self.keys = [(row["strategy"], row["ticker"]) for row in rows]
+        self.volume = np.array([row["volume"] for row in rows], dtype=np.float64)
+        self.entry = np.array([row["entry"] for row in rows], dtype=np.float64)
+        self.peak = np.array([row["peak"] for row in rows], dtype=np.float64)
+        self.retry_at = np.array([row["retry_at"] for row in rows], dtype=np.float64)
+        tickers = np.array([ticker for _, ticker in self.keys], dtype=object)
+        self.rows_by_ticker = {ticker: np.flatnonzero(tickers == ticker) for ticker in set(tickers)}
+        self.dirty = True
+
+    # ----- 가격 검사 -----
+
+    def on_price(self, ticker, price):
+        """체결 가격 1건 → 해당 티커 포지션 전체 검사 (시세 스트림 콜백, 이벤트 루프에서 호출)"""
+        with self.lock:
+            rows = self.rows_by_ticker.get(ticker)
+            if rows is None:
+                return
+            exits = self._evaluate(rows, np.full(len(rows), float(price)))
+        self._emit(exits)
+
+    def check_prices(self, prices):
+        """{ticker: price} → 전체 포지션 검사 (시세 스트림이 없을 때 REST 현재가로 호출)"""
+        with self.lock:
+            if not self.keys:
+                return
+            current = np.array([prices.get(ticker, np.nan) for _, ticker in self.keys], dtype=np.float64)
+            rows = np.flatnonzero(~np.isnan(current))
+            exits = self._evaluate(rows, current[rows])
+        self._emit(exits)
+
+    def _evaluate(self, rows, prices):
+        peak = np.maximum(self.peak[rows], prices)
+        if (peak != self.peak[rows]).any():
+            self.peak[rows] = peak
+            self.dirty = True
+        entry = self.entry[rows]
+        change = prices / entry - 1
+        take_profit = change >= self.take_profit
+        stop_loss = change <= self.stop_loss
+        trailing = np.zeros(len(rows), dtype=bool)
+        if self.trailing_stop > 0:
+            # 고점이 매수가보다 trailing_stop 이상 오른 뒤에만 적용 (수익 보존용)
+            armed = peak >= entry * (1 + self.trailing_stop)
+            trailing = armed & (prices <= peak * (1 - self.trailing_stop))
+        now = time.monotonic()
+        hit = (take_profit | stop_loss | trailing) & (self.retry_at[rows] <= now)
+        if not hit.any():
+            return []
+
+        exits = []
+        for j in np.flatnonzero(hit):
+            i = rows[j]
+            strategy, ticker = self.keys[i]
+            if self.volume[i] * prices[j] < self.min_order:
+                # 최소 주문 금액 미만은 주문이 거절되므로 재요청하지 않음 (추가 매수로 sync 되면 다시 감시)
+                self.retry_at[i] = np.inf
+                print(f"⚠️ [{strategy}] {ticker} 소액 포지션 ({self.volume[i] * prices[j]:,.0f}원) → 청산 불가, 감시 제외")
+                continue
+            self.retry_at[i] = now + EXIT_RETRY_SECONDS
+            if stop_loss[j]:
+                reason = f"손절 {change[j] * 100:.2f}%"
+            elif take_profit[j]:
+                reason = f"익절 {change[j] * 100:.2f}%"
+            else:
+                reason = f"트레일링 스탑 (고점 {peak[j]:,.0f} 대비 {(prices[j] / peak[j] - 1) * 100:.2f}%)"
+            exits.append((strategy, ticker, float(self.volume[i]), reason))
+        return exits
+
+    def _emit(self, exits):
+        for strategy, ticker, volume, reason in exits:
+            print(f"🛡️ [{strategy}] {ticker} {reason} → 청산 요청")
+            try:
+                self.on_exit(strategy, ticker, volume, reason)
+            except Exception as e:
+                print(f"⚠️ [{strategy}] {ticker} 청산 요청 실패: {e}")
+
+    # ----- 저장 -----
+
+    def save(self):
+        """변경된 최고가를 DB 에 저장 (가격마다 쓰지 않고 주기적으로 호출)"""
+        with self.lock:
+            if not self.dirty:
+                return
+            rows = [(strategy, ticker, float(peak)) for (strategy, ticker), peak in zip(self.keys, self.peak)]
+            self.dirty = False
+        if rows:
+            trade_store.save_peaks(rows)
@@ -1,39 +1,46 @@
-import time
-import schedule
-import pyupbit
-import os
 from dotenv import load_dotenv
 from datetime import datetime
 
-from autobot_trader.strategies.moving_average import get_moving_average_signal
-from autobot_trader.strategies.rsi import get_rsi_signal
-from autobot_trader.strategies.bollinger import get_bollinger_signal
-from autobot_trader.strategies.trend_following import get_trend_following_signal
-from autobot_trader.strategies.grid_trading import get_grid_trading_signal
-from autobot_trader.strategies.volatility_breakout import get_volatility_breakout_signal
-from autobot_trader.strategies.momentum import get_momentum_signal
-
 from autobot_trader.telegram_bot import send_message
-from autobot_trader.log_signal import log_signal
-from autobot_trader.order_executor import market_buy, market_sell
+from autobot_trader.order_executor import market_buy, market_sell, executor
 from autobot_trader.db_logger import log_trade, init_db, get_last_trade_time
+from autobot_trader.market_snapshot import MarketSnapshot
+from autobot_trader.position_ledger import PositionLedger
+from autobot_trader.candle_scheduler import CandleScheduler
+from autobot_trader.strategy_registry import STRATEGIES, LazyFunction, get_signal_function, get_lookback
+from autobot_trader.settings import STRATEGY_BUDGETS, STRATEGY_INTERVALS
+
+# 캔들 캐시/시그널 기록 모듈(pandas, pyupbit 포함)은 처음 쓸 때 import
+get_closed_ohlcv = LazyFunction("autobot_trader.candle_store:get_closed_ohlcv")
+log_signal = LazyFunction("autobot_trader.log_signal:log_signal")
 
-# ✅ 환경변수 로드 및 Upbit 연결
+# ✅ 환경변수 로드 (Upbit 잔고 조회 클라이언트는 main 에서 연결)
 load_dotenv()
-ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
-SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
-upbit = pyupbit.Upbit(ACCESS_KEY, SECRET_KEY)
+TICKER = "KRW-BTC"
+snapshot = MarketSnapshot(tickers=[TICKER])
+ledger = PositionLedger(snapshot)
 
 # ✅ DB 초기화
 init_db()
+ledger.load()
 
 # ✅ 전략 실행 함수
 def run_strategy(name, func):
     print(f"⏱️ [{name}] 전략 실행 중...")
     try:
-        signal = func()
-        ticker = "KRW-BTC"
-        price = pyupbit.get_current_price(ticker)
+        ticker = TICKER
+        lookback = get_lookback([name])
+        df = get_closed_ohlcv(ticker, interval=STRATEGY_INTERVALS.get(name, "day"), count=lookback)
+        if df is None or len(df) < lookback:
+            print(f"❌ OHLCV 데이터 부족 ({0 if df is None else len(df)}/{lookback}봉)")
+            return
+        result = func(df, amount=STRATEGY_BUDGETS.get(name, 10000))
+        signal = result.get("signal") if result else None
+        if signal == "grid":
+            print(f"⏭️ [{name}] 그리드 지정가 주문은 run_multi_coin 에서만 실행")
+            return
+
+        price = snapshot.get_price(ticker)
 
         if price is None:
             print("❌ 가격 조회 실패")
@@ -49,33 +56,38 @@ def run_strategy(name, func):
                 return
 
         if signal == "buy":
-            amount = 10000
+            amount = result.get("amount") or STRATEGY_BUDGETS.get(name, 10000)
             if amount < 5000:
                 print("⛔ 최소 주문 금액 미만 (5,000원)")
                 return
 
             try:
-                result = market_buy(ticker, amount)
-                if result:
-                    volume = float(result['executed_volume'])
-                    log_trade(ticker, "buy", volume, price, name)
-                    log_signal(name, ticker, signal, price)
-                    send_message(f"📈 <b>[{name}] 매수 완료</b>\n가격: <code>{price:,.0f}원</code>")
+                fill = market_buy(ticker, amount, name)
+                snapshot.invalidate_balances()
+                if fill:
+                    fill_price = fill["avg_price"] or price
+                    log_trade(ticker, "buy", fill["executed_volume"], fill_price, name, fill["fee"], fill["uuid"])
+                    ledger.sync(name, ticker)
+                    log_signal(name, ticker, signal, fill_price)
+                    send_message(f"📈 <b>[{name}] 매수 완료</b>\n가격: <code>{fill_price:,.0f}원</code>")
             except Exception as e:
                 send_message(f"❌ <b>[{name}] 매수 에러</b>: {e}")
 
         elif signal == "sell":
-            balance = upbit.get_balance(ticker)
-            if balance is None or balance < 0.0001:
+            balance = ledger.get_volume(name, ticker)  # 이 전략이 산 수량만 매도
+            if balance < 0.0001:
                 print("⛔ 매도할 잔고 부족")
                 return
 
             try:
-                result = market_sell(ticker, balance)
-                if result:
-                    log_trade(ticker, "sell", balance, price, name)
-                    log_signal(name, ticker, signal, price)
-                    send_message(f"📉 <b>[{name}] 매도 완료</b>\n가격: <code>{price:,.0f}원</code>")
+                fill = market_sell(ticker, balance, name)
+                snapshot.invalidate_balances()
+                if fill:
+                    fill_price = fill["avg_price"] or price
+                    log_trade(ticker, "sell", fill["executed_volume"], fill_price, name, fill["fee"], fill["uuid"])
+                    ledger.sync(name, ticker)
+                    log_signal(name, ticker, signal, fill_price)
+                    send_message(f"📉 <b>[{name}] 매도 완료</b>\n가격: <code>{fill_price:,.0f}원</code>")
             except Exception as e:
                 send_message(f"❌ <b>[{name}] 매도 에러</b>: {e}")
         else:
@@ -86,22 +98,17 @@ def run_strategy(name, func):
 
 # ✅ 메인 실행 루프
 def main():
-    print("🚀 전략 다중화 자동매매 루프 시작 (1분마다 실행)")
-
-    # 기존 전략
-    schedule.every(1).minutes.do(lambda: run_strategy("moving_average", get_moving_average_signal))
-    schedule.every(1).minutes.do(lambda: run_strategy("rsi", get_rsi_signal))
-    schedule.every(1).minutes.do(lambda: run_strategy("bollinger", get_bollinger_signal))
-
-    # 추가 전략
-    schedule.every(1).minutes.do(lambda: run_strategy("trend_following", get_trend_following_signal))
-    schedule.every(1).minutes.do(lambda: run_strategy("grid_trading", get_grid_trading_signal))
-    schedule.every(1).minutes.do(lambda: run_strategy("volatility_breakout", get_volatility_breakout_signal))
-    schedule.every(1).minutes.do(lambda: run_strategy("momentum", get_momentum_signal))
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    print("🚀 전략 다중화 자동매매 루프 시작 (전략 인터벌 봉 마감마다 실행)")
+    snapshot.upbit = executor.upbit
+    scheduler = CandleScheduler()
+
+    # 레지스트리의 전략 전체 (전략 모듈은 첫 실행 때 import)
+    for name in STRATEGIES:
+        scheduler.add(STRATEGY_INTERVALS.get(name, "day"), run_strategy, name, get_signal_function(name))
+
+    # 포지션 장부 ↔ 거래소 잔고 대사
+    scheduler.add("minute5", ledger.reconcile)
+    scheduler.run_forever()
 
 if __name__ == "__main__":
     main()
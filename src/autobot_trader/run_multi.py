@@ -1,84 +1,51 @@
-import time
-import schedule
-import pyupbit
 import os
 from dotenv import load_dotenv
 from datetime import datetime
-from inspect import signature
-
-from autobot_trader.strategies.moving_average import get_moving_average_signal
-from autobot_trader.strategies.rsi import get_rsi_signal
-from autobot_trader.strategies.bollinger import get_bollinger_signal
-from autobot_trader.strategies.trend_following import get_trend_following_signal
-from autobot_trader.strategies.grid_trading import get_grid_trading_signal
-from autobot_trader.strategies.volatility_breakout import get_volatility_breakout_signal
-from autobot_trader.strategies.momentum import get_momentum_signal
 
 from autobot_trader.telegram_bot import send_message
-from autobot_trader.log_signal import log_signal
-from autobot_trader.order_executor import market_buy, market_sell
+from autobot_trader.order_executor import market_buy, market_sell, executor
 from autobot_trader.db_logger import log_trade, init_db, get_last_trade_time
-
-# ✅ 환경 변수 및 API 초기화
+from autobot_trader.market_snapshot import MarketSnapshot
+from autobot_trader.position_ledger import PositionLedger
+from autobot_trader.candle_scheduler import CandleScheduler
+from autobot_trader.strategy_registry import STRATEGIES, LazyFunction, get_signal_function, get_lookback
+from autobot_trader.settings import (
+    STRATEGY_BUDGETS, STRATEGY_INTERVALS, DUPLICATE_BUY_COOLDOWN, TAKE_PROFIT, STOP_LOSS,
+)
+
+# 캔들 캐시/시그널 기록 모듈(pandas, pyupbit 포함)은 처음 쓸 때 import
+get_closed_ohlcv = LazyFunction("autobot_trader.candle_store:get_closed_ohlcv")
+log_signal = LazyFunction("autobot_trader.log_signal:log_signal")
+
+# ✅ 환경 변수 및 API 초기화 (Upbit 잔고 조회 클라이언트는 main 에서 연결)
 load_dotenv()
-ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
-SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
-upbit = pyupbit.Upbit(ACCESS_KEY, SECRET_KEY)
 init_db()
 
-# ✅ 전략별 자금 설정 (KRW 단위)
-STRATEGY_BUDGETS = {
-    "moving_average": 10000,
-    "rsi": 8000,
-    "bollinger": 12000,
-    "trend_following": 15000,
-    "grid_trading": 10000,
-    "volatility_breakout": 10000,
-    "momentum": 10000
-}
-
-# ✅ 전략별 사용 OHLCV interval 설정
-STRATEGY_INTERVALS = {
-    "rsi": "minute1",
-    "bollinger": "minute15",
-    "moving_average": "minute30",
-    "trend_following": "minute60",
-    "grid_trading": "minute1",
-    "volatility_breakout": "day",
-    "momentum": "minute15"
-}
-
-# ✅ 전략별 중복 매수 제한 시간 (분 단위)
-DUPLICATE_BUY_COOLDOWN = {
-    "moving_average": 30,
-    "rsi": 10,
-    "bollinger": 30,
-    "trend_following": 60,
-    "grid_trading": 5,
-    "volatility_breakout": 1440,  # 1일
-    "momentum": 30
-}
-
-# ✅ 손절/익절 기준
-TAKE_PROFIT = 0.05
-STOP_LOSS = -0.03
+TICKERS = ["KRW-BTC", "KRW-ETH"]
+snapshot = MarketSnapshot(tickers=TICKERS)
+ledger = PositionLedger(snapshot)
+ledger.load()
+
 POSITION_HISTORY = {}
 
-def run_strategy(name, func, ticker):
+def run_strategy(name, func, ticker, df=None):
     print(f"\n⏱️ [{name}] 전략 실행 중... ({ticker})")
     try:
-        sig = signature(func)
-        if "df" in sig.parameters:
+        lookback = get_lookback([name])
+        if df is None:
             interval = STRATEGY_INTERVALS.get(name, "day")
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=50)
-            if df is None or len(df) < 2:
-                print("❌ OHLCV 데이터 부족")
-                return
-            signal = func(df)
-        else:
-            signal = func()
+            df = get_closed_ohlcv(ticker, interval=interval, count=lookback)
+        if df is None or len(df) < lookback:
+            print(f"❌ OHLCV 데이터 부족 ({0 if df is None else len(df)}/{lookback}봉)")
+            return
+        budget = STRATEGY_BUDGETS.get(name, 10000)
+        result = func(df, amount=budget)
+        signal = result.get("signal") if result else None
+        if signal == "grid":
+            print(f"⏭️ [{name}] 그리드 지정가 주문은 run_multi_coin 에서만 실행")
+            return
 
-        price = pyupbit.get_current_price(ticker)
+        price = snapshot.get_price(ticker)
         if price is None:
             print("❌ 현재가 조회 실패")
             return
@@ -92,21 +59,24 @@ def run_strategy(name, func, ticker):
             return
 
         if signal == "buy":
-            amount = STRATEGY_BUDGETS.get(name, 10000)
+            amount = result.get("amount") or budget
             if amount < 5000:
                 print("⛔ 최소 주문 금액 미만")
                 return
-            result = market_buy(ticker, amount)
-            if result:
-                volume = float(result['executed_volume'])
-                log_trade(ticker, "buy", volume, price, name)
-                log_signal(name, ticker, signal, price)
-                POSITION_HISTORY[name + ticker] = (price, volume)
-                send_message(f"📈 <b>[{name}] {ticker} 매수 완료</b>\n<code>{price:,.0f}원</code>")
+            fill = market_buy(ticker, amount, name)
+            snapshot.invalidate_balances()
+            if fill:
+                volume = fill["executed_volume"]
+                fill_price = fill["avg_price"] or price
+                log_trade(ticker, "buy", volume, fill_price, name, fill["fee"], fill["uuid"])
+                ledger.sync(name, ticker)
+                log_signal(name, ticker, signal, fill_price)
+                POSITION_HISTORY[name + ticker] = (fill_price, volume)
+                send_message(f"📈 <b>[{name}] {ticker} 매수 완료</b>\n<code>{fill_price:,.0f}원</code>")
 
         elif signal == "sell":
-            balance = upbit.get_balance(ticker)
-            if balance is None or balance < 0.0001:
+            balance = ledger.get_volume(name, ticker)  # 이 전략이 산 수량만 매도
+            if balance < 0.0001:
                 print("⛔ 매도할 잔고 부족")
                 return
             key = name + ticker
@@ -117,11 +87,14 @@ def run_strategy(name, func, ticker):
                     print(f"📉 [{name}] 손절 조건 실행: {pnl*100:.2f}%")
                 elif pnl > TAKE_PROFIT:
                     print(f"💰 [{name}] 익절 조건 실행: {pnl*100:.2f}%")
-            result = market_sell(ticker, balance)
-            if result:
-                log_trade(ticker, "sell", balance, price, name)
-                log_signal(name, ticker, signal, price)
-                send_message(f"📉 <b>[{name}] {ticker} 매도 완료</b>\n<code>{price:,.0f}원</code>")
+            fill = market_sell(ticker, balance, name)
+            snapshot.invalidate_balances()
+            if fill:
+                fill_price = fill["avg_price"] or price
+                log_trade(ticker, "sell", fill["executed_volume"], fill_price, name, fill["fee"], fill["uuid"])
+                ledger.sync(name, ticker)
+                log_signal(name, ticker, signal, fill_price)
+                send_message(f"📉 <b>[{name}] {ticker} 매도 완료</b>\n<code>{fill_price:,.0f}원</code>")
                 POSITION_HISTORY.pop(key, None)
         else:
             print(f"💤 [{name}] 시그널 없음")
@@ -129,37 +102,31 @@ def run_strategy(name, func, ticker):
     except Exception as e:
         send_message(f"⚠️ <b>[{name}] 전략 실행 오류 ({ticker})</b>: {e}")
 
-def schedule_strategies():
-    print("🛠️ 전략별 실행 주기 스케줄링...")
-    strategies = {
-        "moving_average": get_moving_average_signal,
-        "rsi": get_rsi_signal,
-        "bollinger": get_bollinger_signal,
-        "trend_following": get_trend_following_signal,
-        "grid_trading": get_grid_trading_signal,
-        "volatility_breakout": get_volatility_breakout_signal,
-        "momentum": get_momentum_signal
-    }
-
-    tickers = ["KRW-BTC", "KRW-ETH"]
-
-    for name, func in strategies.items():
-        for ticker in tickers:
-            if name in ["grid_trading", "rsi"]:
-                schedule.every(1).minutes.do(run_strategy, name, func, ticker)
-            elif name in ["bollinger", "momentum"]:
-                schedule.every(15).minutes.do(run_strategy, name, func, ticker)
-            elif name in ["moving_average", "trend_following"]:
-                schedule.every(30).minutes.do(run_strategy, name, func, ticker)
-            elif name == "volatility_breakout":
-                schedule.every().day.at("09:01").do(run_strategy, name, func, ticker)
+def run_candle_batch(interval, names, ticker):
+    """같은 봉 마감에 실행되는 전략 묶음 → OHLCV 한 번 조회 후 전략별로 실행"""
+    df = get_closed_ohlcv(ticker, interval=interval, count=get_lookback(names))
+    for name in names:
+        run_strategy(name, get_signal_function(name), ticker, df)
+
+def schedule_strategies(scheduler):
+    """인터벌별 봉 마감 시각(KST)에 같은 인터벌 전략을 티커별 묶음으로 실행"""
+    print("🛠️ 봉 마감 기준 전략 스케줄링...")
+    groups = {}
+    for name in STRATEGIES:
+        groups.setdefault(STRATEGY_INTERVALS.get(name, "day"), []).append(name)
+    for interval, names in groups.items():
+        for ticker in TICKERS:
+            scheduler.add(interval, run_candle_batch, interval, names, ticker)
+
+    # 포지션 장부 ↔ 거래소 잔고 대사
+    scheduler.add("minute5", ledger.reconcile)
 
 def main():
     print("🚀 전략 다중 자동매매 루프 시작")
-    schedule_strategies()
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    snapshot.upbit = executor.upbit
+    scheduler = CandleScheduler()
+    schedule_strategies(scheduler)
+    scheduler.run_forever()
 
 if __name__ == "__main__":
     main()
@@ -1,129 +1,207 @@
 # run_multi_coin.py - 전략별 모니터링 명령어 확장 포함 (정렬된 함수 순서)
 
+import asyncio
+import threading
 import time
-import schedule
-import pyupbit
 import os
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from inspect import signature
-import sqlite3
-from collections import defaultdict
-
-from autobot_trader.strategies.moving_average import get_moving_average_signal
-from autobot_trader.strategies.rsi import get_rsi_signal
-from autobot_trader.strategies.bollinger import get_bollinger_signal
-from autobot_trader.strategies.trend_following import get_trend_following_signal
-from autobot_trader.strategies.grid_trading import get_grid_trading_signal
-from autobot_trader.strategies.volatility_breakout import get_volatility_breakout_signal
-from autobot_trader.strategies.momentum import get_momentum_signal
-
-from autobot_trader.telegram_bot import send_message, listen_for_commands
-from autobot_trader.log_signal import log_signal
-from autobot_trader.order_executor import market_buy, market_sell
+
+from autobot_trader.telegram_bot import send_message, start_command_listener, stop_command_listener
+from autobot_trader.order_executor import market_buy, market_sell, executor
+from autobot_trader.grid_executor import GridExecutor
 from autobot_trader.db_logger import log_trade, init_db, get_last_trade_time, log_trade_reason
+from autobot_trader.trade_store import get_pnl_summary
+from autobot_trader.async_runner import AsyncStrategyRunner
+from autobot_trader.market_snapshot import MarketSnapshot
+from autobot_trader.market_feed import MarketFeed, UPBIT_WS_URL, INTERVAL_MS
+from autobot_trader.risk_engine import RiskEngine
+from autobot_trader.position_ledger import PositionLedger
+from autobot_trader.capital_allocator import CapitalAllocator
+from autobot_trader.strategy_registry import (
+    STRATEGIES as REGISTRY, LazyFunction, get_signal_function, get_stream_class, get_lookback, has_stream,
+)
+from autobot_trader.settings import STRATEGY_BUDGETS, STRATEGY_INTERVALS, DUPLICATE_BUY_COOLDOWN, MIN_ORDER_KRW
 
 load_dotenv()
-ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
-SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
-upbit = pyupbit.Upbit(ACCESS_KEY, SECRET_KEY)
 init_db()
 
-STRATEGY_BUDGETS = {
-    "moving_average": 10000,
-    "rsi": 8000,
-    "bollinger": 12000,
-    "trend_following": 15000,
-    "grid_trading": 10000,
-    "volatility_breakout": 10000,
-    "momentum": 10000
-}
-
-STRATEGY_INTERVALS = {
-    "rsi": "minute1",
-    "bollinger": "minute15",
-    "moving_average": "minute30",
-    "trend_following": "minute60",
-    "grid_trading": "minute1",
-    "volatility_breakout": "day",
-    "momentum": "minute15"
-}
-
-DUPLICATE_BUY_COOLDOWN = {
-    "moving_average": 30,
-    "rsi": 10,
-    "bollinger": 30,
-    "trend_following": 60,
-    "grid_trading": 5,
-    "volatility_breakout": 1440,
-    "momentum": 30
-}
-
-TAKE_PROFIT = 0.05
-STOP_LOSS = -0.03
-POSITION_HISTORY = {}
+TICKERS = ["KRW-BTC", "KRW-ETH"]
+snapshot = MarketSnapshot(tickers=TICKERS)  # 잔고 조회 클라이언트는 main 에서 연결
+ledger = PositionLedger(snapshot)  # 전략별 보유 수량 (매도 수량의 기준)
+allocator = CapitalAllocator(snapshot)  # 전략별 주문 금액 + 현금 예약
+USE_MARKET_FEED = os.getenv("MARKET_FEED", "1") != "0"        # 0 이면 REST 폴링만 사용
+MARKET_FEED_URL = os.getenv("MARKET_FEED_URL", UPBIT_WS_URL)  # 리플레이 서버 주소로 바꿔 테스트 가능
+
+STRATEGIES = {name: get_signal_function(name) for name in REGISTRY}  # 전략 모듈은 첫 실행 때 import
+
+# 캔들 캐시/시그널 기록 모듈(pandas, pyupbit 포함)도 처음 쓸 때 import
+get_ohlcv = LazyFunction("autobot_trader.candle_store:get_ohlcv")
+get_closed_ohlcv = LazyFunction("autobot_trader.candle_store:get_closed_ohlcv")
+closed_candles = LazyFunction("autobot_trader.candle_store:closed_candles")
+count_since = LazyFunction("autobot_trader.candle_store:count_since")
+candle_close_time = LazyFunction("autobot_trader.candle_store:candle_close_time")
+log_signal = LazyFunction("autobot_trader.log_signal:log_signal")
+
 TRADE_REASON_LOG = "trade_reason_log.csv"
+STRATEGY_STREAMS = {}  # (전략, 티커) → 증분 지표 상태
+RUNNER = None
+RISK = None
+FEED = None
+RISK_CHECK_SECONDS = 5    # 시세 스트림이 끊겼을 때 REST 현재가로 리스크 검사하는 주기
+RISK_SAVE_SECONDS = 30    # 트레일링 스탑 최고가 저장 주기
+RECONCILE_SECONDS = 300   # 포지션 장부와 거래소 잔고 대사 주기
+
+# 명령어 응답용 캐시 (체결 시 갱신) - 핸들러가 매번 DB 를 읽지 않도록 유지
+LAST_TRADES = {}              # (티커, 전략) → (마지막 체결 시각, 방향)
+PNL_CACHE = {"rows": None}    # 전략별 실현손익, 체결 시 무효화
+STATE_LOCK = threading.Lock()
+ORDER_LOCKS = {}              # (전략, 티커) → 주문 잠금
+COMMAND_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="command")
+
+def get_last_trade(ticker, strategy):
+    key = (ticker, strategy)
+    with STATE_LOCK:
+        cached = LAST_TRADES.get(key)
+    if cached is None:
+        cached = get_last_trade_time(ticker, strategy)
+        with STATE_LOCK:
+            LAST_TRADES.setdefault(key, cached)
+    return cached
+
+def get_cached_pnl_summary():
+    with STATE_LOCK:
+        rows = PNL_CACHE["rows"]
+    if rows is None:
+        rows = get_pnl_summary()
+        with STATE_LOCK:
+            PNL_CACHE["rows"] = rows
+    return rows
 
-def get_dynamic_budget(strategy, base_budget):
+def record_trade(ticker, side, volume, price, name, fee=0.0, order_uuid=None):
+    """체결 기록 + 명령어 캐시 갱신"""
+    log_trade(ticker, side, volume, price, name, fee=fee, order_uuid=order_uuid)
+    with STATE_LOCK:
+        LAST_TRADES[(ticker, name)] = (datetime.now(), side)
+        PNL_CACHE["rows"] = None
+    ledger.sync(name, ticker)
+    if RISK is not None:
+        RISK.sync(name, ticker)
+
+def on_tick(ticker, price):
+    """시세 스트림 체결 가격 → 스냅샷 갱신 + 리스크 검사"""
+    snapshot.update_price(ticker, price)
+    RISK.on_price(ticker, price)
+
+def record_grid_fill(name, ticker, side, fill):
+    """그리드 지정가 주문 체결 → 거래 기록 + 알림"""
+    record_trade(ticker, side, fill["executed_volume"], fill["avg_price"], name, fill["fee"], fill["uuid"])
+    log_signal(name, ticker, side, fill["avg_price"])
+    icon = "📈" if side == "buy" else "📉"
+    send_message(f"{icon} <b>[{name}] {ticker} 그리드 {'매수' if side == 'buy' else '매도'} 체결</b>\n"
+                 f"수량: {fill['executed_volume']} @ {fill['avg_price']:,.0f}")
+
+GRID = GridExecutor(executor, allocator=allocator, on_fill=record_grid_fill, volume_of=ledger.get_volume)
+
+def request_exit(name, ticker, volume, reason):
+    """리스크 엔진 청산 요청 → 해당 전략 보유 수량만 시장가 매도 (이벤트 루프에서 호출)"""
+    result = {"signal": "sell", "reason": reason}
+    RUNNER.submit(f"risk:{name}:{ticker}", execute_signal, name, ticker, result, 0)
+
+def get_budget(strategy, ticker=None):
     try:
-        total_base = sum(STRATEGY_BUDGETS.values())
-        krw_balance = upbit.get_balance("KRW")
-        if krw_balance is None or total_base == 0:
-            return base_budget
-        scale = min(1.0, krw_balance / total_base)
-        dynamic = int(base_budget * scale)
-        print(f"[BUDGET] {strategy}: 동적 예산 {dynamic:,}원 (보유 KRW: {krw_balance:,})")
-        return dynamic
+        budget = allocator.budget(strategy, ticker)
+        print(f"[BUDGET] {strategy}: 예산 {budget:,}원 ({allocator.policy})")
+        return budget
     except Exception as e:
         print(f"[BUDGET] 예산 계산 오류: {e}")
-        return base_budget
+        return STRATEGY_BUDGETS.get(strategy, 10000)
+
+def get_stream_signal(name, ticker, interval, budget):
+    """마감된 새 봉만 증분 지표에 push 하여 시그널 계산
+
+    실행이 늦어 여러 봉이 밀렸으면 마지막 반영 봉 이후 봉을 모두 조회해 차례로 push 하고,
+    밀린 봉이 워밍업 길이를 넘을 때만 처음부터 다시 워밍업한다.
+    """
+    key = (name, ticker)
+    stream = STRATEGY_STREAMS.get(key)
+    if stream is not None and stream.ready and stream.last_time is not None:
+        # 마지막 반영 봉 ~ 형성 중인 봉 (+1 봉 여유)
+        count = count_since(stream.last_time, interval) + 1
+        if count > stream.warmup + 1:
+            stream = None
+    if stream is None or not stream.ready or stream.last_time is None:
+        stream = get_stream_class(name)()
+        count = stream.warmup + 1
+
+    df = get_ohlcv(ticker, interval=interval, count=count)
+    if df is None or len(df) < 2:
+        print("❌ OHLCV 데이터 부족")
+        return None
+
+    closed = closed_candles(df, interval)  # 형성 중인 마지막 봉 제외
+    if stream.last_time is not None:
+        if closed.index[0] > stream.last_time:
+            # 조회 구간이 마지막 반영 봉까지 닿지 않으면 (봉 누락) 처음부터 다시 워밍업
+            STRATEGY_STREAMS.pop(key, None)
+            return get_stream_signal(name, ticker, interval, budget)
+        closed = closed[closed.index > stream.last_time]
+    STRATEGY_STREAMS[key] = stream
+
+    result = None
+    for timestamp, candle in zip(closed.index, closed.to_dict("records")):
+        result = stream.update(candle, timestamp, amount=budget)
+    return result
+
+def push_stream_candle(name, ticker, interval, timestamp, candle, budget):
+    """시세 스트림에서 마감된 봉 하나를 증분 지표에 push (상태가 없거나 봉이 빠졌으면 REST 로 다시 워밍업)"""
+    stream = STRATEGY_STREAMS.get((name, ticker))
+    if stream is None or not stream.ready or stream.last_time is None:
+        return get_stream_signal(name, ticker, interval, budget)
+    if timestamp <= stream.last_time:
+        return None
+    if timestamp > candle_close_time(stream.last_time, interval):
+        STRATEGY_STREAMS.pop((name, ticker), None)
+        return get_stream_signal(name, ticker, interval, budget)
+    return stream.update(candle, timestamp, amount=budget)
+
+def on_candle(ticker, interval, timestamp, candle):
+    """시세 스트림 봉 마감 이벤트 → 해당 인터벌 전략을 바로 실행 (이벤트 루프에서 호출)"""
+    for name, func in STRATEGIES.items():
+        if STRATEGY_INTERVALS.get(name, "day") == interval:
+            RUNNER.submit(f"{name}:{ticker}", run_candle_strategy, name, func, ticker, timestamp, candle)
 
 def handle_command(command):
     if command == "/내포지션":
-        if not POSITION_HISTORY:
+        positions = RISK.positions() if RISK else []
+        if not positions:
             send_message("📭 현재 보유 중인 포지션이 없습니다.")
             return
         msg = "📦 <b>보유 포지션 현황</b>\n"
-        for key, (price, volume) in POSITION_HISTORY.items():
-            msg += f"• {key} | 매수가: {price:,.0f} | 수량: {volume:.4f}\n"
+        for item in positions:
+            msg += (f"• {item['strategy']} {item['ticker']} | 매수가: {item['entry']:,.0f} | "
+                    f"고점: {item['peak']:,.0f} | 수량: {item['volume']:.4f}\n")
         send_message(msg)
 
     elif command == "/실현손익":
-        conn = sqlite3.connect("trade_history.db")
-        c = conn.cursor()
-        c.execute("SELECT strategy, side, price * volume FROM trades")
-        rows = c.fetchall()
-        pnl = defaultdict(lambda: {"buy": 0, "sell": 0})
-        for strategy, side, value in rows:
-            pnl[strategy][side] += value
-        conn.close()
-        msg = "💹 <b>전략별 실현 손익</b>\n"
-        for strategy, data in pnl.items():
-            gain = data["sell"] - data["buy"]
-            msg += f"• {strategy}: {gain:,.0f}원 (매수 {data['buy']:,.0f} / 매도 {data['sell']:,.0f})\n"
+        msg = "💹 <b>전략별 실현 손익 (FIFO)</b>\n"
+        for item in get_cached_pnl_summary():
+            msg += (f"• {item['strategy']}: {item['realized_pnl']:,.0f}원 "
+                    f"(매수 {item['buy_value']:,.0f} / 매도 {item['sell_value']:,.0f} / 미청산 {item['open_cost']:,.0f})\n")
         send_message(msg)
 
     elif command == "/이익랭킹":
-        conn = sqlite3.connect("trade_history.db")
-        c = conn.cursor()
-        c.execute("SELECT strategy, side, price * volume FROM trades")
-        rows = c.fetchall()
-        pnl = defaultdict(lambda: {"buy": 0, "sell": 0})
-        for strategy, side, value in rows:
-            pnl[strategy][side] += value
-        ranking = sorted(pnl.items(), key=lambda kv: kv[1]["sell"] - kv[1]["buy"], reverse=True)
         msg = "🏆 <b>전략 이익 랭킹</b>\n"
-        for i, (strategy, data) in enumerate(ranking, 1):
-            gain = data["sell"] - data["buy"]
-            msg += f"{i}. {strategy}: {gain:,.0f}원\n"
+        for i, item in enumerate(get_cached_pnl_summary(), 1):
+            msg += f"{i}. {item['strategy']}: {item['realized_pnl']:,.0f}원\n"
         send_message(msg)
 
     elif command == "/다음매수예정":
         msg = "⏳ <b>전략별 다음 매수 가능 시점</b>\n"
         for strategy in STRATEGY_BUDGETS:
-            last_time, last_side = get_last_trade_time("KRW-BTC", strategy)
+            last_time, last_side = get_last_trade("KRW-BTC", strategy)
             if last_side != "buy":
                 continue
             cooldown = DUPLICATE_BUY_COOLDOWN.get(strategy, 30)
@@ -136,44 +214,111 @@ def handle_command(command):
         send_message(msg)
     
     elif command == "/현금잔고":
-        krw = upbit.get_balance("KRW")
-        msg = f"💰 <b>현재 보유 현금</b>\n{krw:,.0f}원" if krw is not None else "잔고 조회 실패"
+        status = allocator.status()
+        if status["cash"] is None:
+            send_message("잔고 조회 실패")
+            return
+        msg = f"💰 <b>현재 보유 현금</b>\n{status['cash']:,.0f}원 (주문 대기 예약 {status['reserved']:,.0f}원)"
         send_message(msg)
         return
 
     elif command == "/전략예산":
         msg = "📊 <b>전략별 현재 적용 예산</b>\n"
         for strategy, base in STRATEGY_BUDGETS.items():
-            dynamic = get_dynamic_budget(strategy, base)
-            msg += f"• {strategy}: {dynamic:,}원 (기준: {base:,})\n"
+            budget = allocator.budget(strategy, TICKERS[0])
+            msg += f"• {strategy}: {budget:,}원 (기준: {base:,}, 정책: {allocator.policy})\n"
         send_message(msg)
         return
 
-def run_strategy(name, func, ticker):
+    elif command == "/실행지연":
+        report = RUNNER.latency_report() if RUNNER else {}
+        if not report:
+            send_message("📭 아직 실행 기록이 없습니다.")
+            return
+        msg = "⏱️ <b>작업별 실행 지연 (평균/최대, 초)</b>\n"
+        for key, stats in sorted(report.items()):
+            msg += (f"• {key}: 지연 {stats['avg_delay']:.2f}/{stats['max_delay']:.2f} | "
+                    f"실행 {stats['avg_duration']:.2f}/{stats['max_duration']:.2f} ({stats['runs']}회)\n")
+        send_message(msg)
+        return
+
+def run_strategy(name, func, ticker, df=None):
+    """df 를 주면 (같은 봉 마감 묶음에서 미리 조회한 마감 봉) 다시 조회하지 않음"""
     print(f"\n⏱️ [{name}] 전략 실행 중... ({ticker})")
     try:
         interval = STRATEGY_INTERVALS.get(name, "day")
-        df = pyupbit.get_ohlcv(ticker, interval=interval, count=50)
-        if df is None or len(df) < 2:
-            print("❌ OHLCV 데이터 부족")
-            return
+        budget = get_budget(name, ticker)
+        if has_stream(name):
+            result = get_stream_signal(name, ticker, interval, budget)
+        else:
+            lookback = get_lookback([name])
+            if df is None:
+                df = get_closed_ohlcv(ticker, interval=interval, count=lookback)
+            if df is None or len(df) < lookback:
+                print(f"❌ OHLCV 데이터 부족 ({0 if df is None else len(df)}/{lookback}봉)")
+                return
+            result = func(df, amount=budget)
+        execute_signal(name, ticker, result, budget)
+    except Exception as e:
+        send_message(f"⚠️ <b>[{name}] 전략 실행 오류 ({ticker})</b>: {e}")
 
-        budget = get_dynamic_budget(name, STRATEGY_BUDGETS.get(name, 10000))
-        result = func(df, amount=budget)
-        if result is None or "signal" not in result:
-            print(f"💤 [{name}] 시그널 없음")
-            return
+def run_candle_batch(interval, names, ticker):
+    """같은 봉 마감에 실행되는 전략 묶음 → OHLCV 한 번 조회 후 전략별로 실행
+    (증분 지표 전략도 방금 갱신된 candle_store 메모리 캐시를 읽으므로 추가 조회 없음)"""
+    if FEED is not None and FEED.covers(ticker, interval):
+        return  # 시세 스트림이 이 봉을 온전히 받았으면 on_candle 이 같은 봉 마감을 처리
+    print(f"\n🕯️ [{interval}] 봉 마감 → 전략 {len(names)}개 실행 ({ticker})")
+    # 묶음에서 가장 긴 워밍업만큼만 조회 (candle_store 가 티커/인터벌별로 새 봉만 이어 붙임)
+    df = get_closed_ohlcv(ticker, interval=interval, count=get_lookback(names))
+    for name in names:
+        run_strategy(name, STRATEGIES[name], ticker, df)
+
+def run_candle_strategy(name, func, ticker, timestamp, candle):
+    """시세 스트림 봉 마감 시 실행 (증분 지표 전략은 REST 조회 없이 해당 봉만 반영)"""
+    if not has_stream(name):
+        run_strategy(name, func, ticker)
+        return
+    print(f"\n⚡ [{name}] 봉 마감 {timestamp} ({ticker})")
+    try:
+        interval = STRATEGY_INTERVALS.get(name, "day")
+        budget = get_budget(name, ticker)
+        result = push_stream_candle(name, ticker, interval, timestamp, candle, budget)
+        execute_signal(name, ticker, result, budget)
+    except Exception as e:
+        send_message(f"⚠️ <b>[{name}] 전략 실행 오류 ({ticker})</b>: {e}")
+
+def order_lock(name, ticker):
+    """(전략, 티커) 주문 잠금 - 전략 작업과 리스크 청산이 같은 포지션을 동시에 매매하지 않도록 공유"""
+    with STATE_LOCK:
+        return ORDER_LOCKS.setdefault((name, ticker), threading.Lock())
+
+def execute_signal(name, ticker, result, budget):
+    if result is None or "signal" not in result:
+        print(f"💤 [{name}] 시그널 없음")
+        return
+    # 작업 스레드에서 실행되므로 asyncio 잠금 대신 스레드 잠금 사용.
+    # 매도 수량은 잠금 안에서 장부를 다시 읽으므로 먼저 끝난 매도 이후의 잔량만 매도됨
+    with order_lock(name, ticker):
+        _execute_signal(name, ticker, result, budget)
 
+def _execute_signal(name, ticker, result, budget):
+    try:
         signal = result["signal"]
         reason = result.get("reason", "N/A")
         amount = result.get("amount", budget)
 
-        price = pyupbit.get_current_price(ticker)
+        if signal == "grid":
+            # 그리드는 레벨별 지정가 주문 묶음으로 실행 (체결은 record_grid_fill 로 기록)
+            summary = GRID.rebalance(name, ticker, result)
+            print(f"🧱 [{name}] {ticker} {reason} | 체결 {summary['fills']} / 신규 {summary['placed']} / 취소 {summary['cancelled']}")
+            return
+
+        price = snapshot.get_price(ticker)
         if price is None:
             print("❌ 가격 조회 실패")
             return
 
-        last_time, last_side = get_last_trade_time(ticker, name)
+        last_time, last_side = get_last_trade(ticker, name)
         cooldown = DUPLICATE_BUY_COOLDOWN.get(name, 30)
         time_diff = (datetime.now() - last_time).total_seconds() / 60
 
@@ -182,74 +327,132 @@ def run_strategy(name, func, ticker):
             return
 
         if signal == "buy":
-            if amount < 5000:
+            if amount < MIN_ORDER_KRW:
                 print("⛔ 최소 주문 금액 미만")
                 return
-            result_order = market_buy(ticker, amount)
-            if result_order:
-                volume = float(result_order['executed_volume'])
-                log_trade(ticker, "buy", volume, price, name)
+            # 주문 전에 현금을 예약해 동시에 실행되는 전략과 같은 현금을 쓰지 않도록 함
+            reservation = allocator.reserve(name, amount)
+            if reservation is None:
+                print(f"⛔ [{name}] 가용 현금 부족")
+                return
+            amount = allocator.reserved(reservation)
+            fill = None
+            try:
+                fill = market_buy(ticker, amount, name)
+            finally:
+                allocator.release(reservation, fill["funds"] + fill["fee"] if fill else 0.0)
+            snapshot.invalidate_balances()
+            if fill:
+                volume = fill["executed_volume"]
+                fill_price = fill["avg_price"] or price
+                record_trade(ticker, "buy", volume, fill_price, name, fill["fee"], fill["uuid"])
                 log_trade_reason(ticker, "buy", name, reason)
-                log_signal(name, ticker, signal, price)
-                POSITION_HISTORY[name + ticker] = (price, volume)
-                send_message(f"📈 <b>[{name}] {ticker} 매수 완료</b>\n수량: {volume} ({amount:,}원)\n이유: {reason}")
+                log_signal(name, ticker, signal, fill_price)
+                send_message(f"📈 <b>[{name}] {ticker} 매수 완료</b>\n수량: {volume} @ {fill_price:,.0f} ({amount:,}원)\n이유: {reason}")
 
         elif signal == "sell":
-            balance = upbit.get_balance(ticker)
-            if balance is None or balance < 0.0001:
-                print("⛔ 매도할 잔고 부족")
+            # 다른 전략이 산 수량은 건드리지 않도록 이 전략의 장부 수량만 매도
+            balance = ledger.get_volume(name, ticker)
+            if balance * price < MIN_ORDER_KRW:
+                print(f"⛔ [{name}] 매도할 보유 수량 부족 ({balance})")
                 return
-            key = name + ticker
-            buy_price, volume = POSITION_HISTORY.get(key, (None, None))
-            if buy_price:
-                pnl = (price - buy_price) / buy_price
-                if pnl < STOP_LOSS:
-                    print(f"📉 [{name}] 손절 조건 실행: {pnl*100:.2f}%")
-                elif pnl > TAKE_PROFIT:
-                    print(f"💰 [{name}] 익절 조건 실행: {pnl*100:.2f}%")
-            result_order = market_sell(ticker, balance)
-            if result_order:
-                log_trade(ticker, "sell", balance, price, name)
+            fill = market_sell(ticker, balance, name)
+            snapshot.invalidate_balances()
+            if fill:
+                allocator.credit(fill["funds"] - fill["fee"])
+                volume = fill["executed_volume"]
+                fill_price = fill["avg_price"] or price
+                record_trade(ticker, "sell", volume, fill_price, name, fill["fee"], fill["uuid"])
                 log_trade_reason(ticker, "sell", name, reason)
-                log_signal(name, ticker, signal, price)
-                send_message(f"📉 <b>[{name}] {ticker} 매도 완료</b>\n수량: {balance}\n이유: {reason}")
-                POSITION_HISTORY.pop(key, None)
+                log_signal(name, ticker, signal, fill_price)
+                send_message(f"📉 <b>[{name}] {ticker} 매도 완료</b>\n수량: {volume} @ {fill_price:,.0f}\n이유: {reason}")
 
     except Exception as e:
         send_message(f"⚠️ <b>[{name}] 전략 실행 오류 ({ticker})</b>: {e}")
 
 
-def schedule_strategies():
-    print("🛠️ 전략별 실행 주기 스케줄링...")
-    strategies = {
-        "moving_average": get_moving_average_signal,
-        "rsi": get_rsi_signal,
-        "bollinger": get_bollinger_signal,
-        "trend_following": get_trend_following_signal,
-        "grid_trading": get_grid_trading_signal,
-        "volatility_breakout": get_volatility_breakout_signal,
-        "momentum": get_momentum_signal
-    }
-    tickers = ["KRW-BTC", "KRW-ETH"]
-
-    for name, func in strategies.items():
-        for ticker in tickers:
-            if name in ["grid_trading", "rsi"]:
-                schedule.every(1).minutes.do(run_strategy, name, func, ticker)
-            elif name in ["bollinger", "momentum"]:
-                schedule.every(15).minutes.do(run_strategy, name, func, ticker)
-            elif name in ["moving_average", "trend_following"]:
-                schedule.every(30).minutes.do(run_strategy, name, func, ticker)
-            elif name == "volatility_breakout":
-                schedule.every().day.at("09:01").do(run_strategy, name, func, ticker)
-                
+def schedule_strategies(runner):
+    """인터벌별 봉 마감 시각(KST)에 같은 인터벌 전략을 (인터벌, 티커) 묶음 작업 하나로 실행
+    시세 스트림이 처리하는 인터벌도 작업은 등록해 두고, 스트림이 끊긴 동안에만 실행 (run_candle_batch)"""
+    print("🛠️ 봉 마감 기준 전략 스케줄링...")
+    groups = {}
+    for name in STRATEGIES:
+        groups.setdefault(STRATEGY_INTERVALS.get(name, "day"), []).append(name)
+    for interval, names in groups.items():
+        for ticker in TICKERS:
+            runner.add_job(interval, names, ticker, interval=interval, run=run_candle_batch)
+
+async def watch_risk(feed):
+    """시세 스트림이 없거나 끊긴 동안 REST 현재가로 리스크 검사 + 최고가 주기 저장"""
+    last_save = time.monotonic()
+    while True:
+        await asyncio.sleep(RISK_CHECK_SECONDS)
+        try:
+            if feed is None or not feed.connected:
+                prices = await asyncio.to_thread(snapshot.get_prices, TICKERS)
+                RISK.check_prices(prices)
+            if time.monotonic() - last_save >= RISK_SAVE_SECONDS:
+                await asyncio.to_thread(RISK.save)
+                last_save = time.monotonic()
+        except Exception as e:
+            print(f"⚠️ 리스크 검사 오류: {e}")
+
+def reconcile_ledger():
+    report = ledger.reconcile()
+    allocator.refresh(force=True)  # 같은 잔고 조회로 캐시 현금도 다시 맞춤
+    adjusted = [item for item in report if item["adjusted"]]
+    if adjusted:
+        msg = "📒 <b>포지션 장부 대사: 거래소 잔고 부족분 차감</b>\n"
+        for item in adjusted:
+            msg += f"• {item['ticker']}: 장부 {item['ledger']:.8f} / 거래소 {item['exchange']:.8f}\n"
+        send_message(msg)
+    for item in report:
+        if item["unassigned"]:
+            print(f"📒 {item['ticker']}: 전략에 배정되지 않은 보유 수량 {item['unassigned']:.8f}")
+    if adjusted:
+        # 줄어든 수량을 리스크 엔진에도 반영 (최고가는 저장 후 다시 읽음)
+        RISK.save()
+        RISK.load()
+
+async def watch_ledger():
+    while True:
+        try:
+            await asyncio.to_thread(reconcile_ledger)
+        except Exception as e:
+            print(f"⚠️ 장부 대사 오류: {e}")
+        await asyncio.sleep(RECONCILE_SECONDS)
+
+async def run_live(feed):
+    """전략 실행기, 시세 스트림, 텔레그램 명령 수신을 하나의 이벤트 루프에서 함께 실행"""
+    app = None
+    try:
+        app = await start_command_listener(handle_command, COMMAND_EXECUTOR)
+    except Exception as e:
+        print(f"⚠️ 텔레그램 명령어 수신 시작 실패 (매매는 계속): {e}")
+    tasks = [RUNNER.run_forever(), watch_risk(feed), watch_ledger()]
+    if feed is not None:
+        tasks.append(feed.run())
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        RISK.save()
+        if app is not None:
+            await stop_command_listener(app)
+
 def main():
+    global RUNNER, RISK, FEED
     print("🚀 전략 다중 자동매매 루프 시작")
-    schedule_strategies()
-    listen_for_commands(handle_command)
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    RUNNER = AsyncStrategyRunner(run_strategy)
+    snapshot.upbit = executor.upbit
+    ledger.load()
+    RISK = RiskEngine(on_exit=request_exit, exclude=["grid_trading"])
+    RISK.load()
+    if USE_MARKET_FEED:
+        # 체결로 봉을 만들 수 있는 인터벌만 스트림에 맡김 (주봉/월봉은 항상 REST)
+        intervals = {interval for interval in STRATEGY_INTERVALS.values() if interval in INTERVAL_MS}
+        FEED = MarketFeed(TICKERS, intervals, on_candle=on_candle, on_price=on_tick, url=MARKET_FEED_URL)
+    schedule_strategies(RUNNER)
+    asyncio.run(run_live(FEED))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,18 @@
+# src/autobot_trader/settings.py
+# 전략별 공통 설정 (실거래 루프와 백테스트가 함께 사용)
+
+from autobot_trader.strategy_registry import STRATEGIES
+
+# 전략 목록과 전략별 설정은 strategy_registry 한 곳에서 선언 (아래는 기존 이름으로 보는 뷰)
+STRATEGY_BUDGETS = {name: spec["budget"] for name, spec in STRATEGIES.items()}
+STRATEGY_INTERVALS = {name: spec["interval"] for name, spec in STRATEGIES.items()}
+DUPLICATE_BUY_COOLDOWN = {name: spec["cooldown"] for name, spec in STRATEGIES.items()}
+STRATEGY_WARMUP = {name: spec["warmup"] for name, spec in STRATEGIES.items()}
+
+TAKE_PROFIT = 0.05
+STOP_LOSS = -0.03
+MIN_ORDER_KRW = 5000
+TRAILING_STOP = 0.02  # 고점 대비 하락률 (수익이 이만큼 난 뒤부터 적용, 0 이면 사용 안 함)
+
+ALLOCATION_POLICY = "fixed"      # fixed | volatility | performance
+TARGET_DAILY_VOLATILITY = 0.03   # volatility 정책의 목표 일간 변동성
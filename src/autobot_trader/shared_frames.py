@@ -0,0 +1,54 @@
+# src/autobot_trader/shared_frames.py
+# 프로세스 풀 워커와 OHLCV DataFrame 을 공유 메모리로 공유
+# - 부모: share_frames() 로 프레임마다 한 블록씩 복사 (앞: int64 인덱스 ns, 뒤: (n, 5) float64 값)
+# - 워커: attach_frames() 를 initializer 로 지정하면 FRAMES[key] 로 복사 없이 접근
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+FRAMES = {}    # 워커 프로세스: key → 공유 메모리를 감싼 DataFrame
+_BLOCKS = []   # 워커가 붙은 블록 (GC 로 해제되지 않도록 보관)
+
+
+def _views(shm, n):
+    index = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+    values = np.ndarray((n, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=shm.buf, offset=n * 8)
+    return index, values
+
+
+def share_frames(frames):
+    """{key: df} → (블록 목록, 워커에 넘길 메타정보 dict)"""
+    blocks, metas = [], {}
+    try:
+        for key, df in frames.items():
+            n = len(df)
+            shm = shared_memory.SharedMemory(create=True, size=max(n * 8 * (len(OHLCV_COLUMNS) + 1), 1))
+            blocks.append(shm)
+            index, values = _views(shm, n)
+            index[:] = df.index.values.astype("datetime64[ns]").astype(np.int64)
+            values[:] = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+            metas[key] = {"name": shm.name, "rows": n}
+    except Exception:
+        release(blocks)
+        raise
+    return blocks, metas
+
+
+def attach_frames(metas):
+    """워커 initializer: 공유 메모리 블록에 붙어 FRAMES 채움"""
+    for key, meta in metas.items():
+        shm = shared_memory.SharedMemory(name=meta["name"])
+        _BLOCKS.append(shm)
+        index, values = _views(shm, meta["rows"])
+        FRAMES[key] = pd.DataFrame(values, index=pd.to_datetime(index), columns=OHLCV_COLUMNS, copy=False)
+
+
+def release(blocks):
+    """부모 프로세스에서 작업이 끝난 뒤 블록 해제"""
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,159 @@
+# src/autobot_trader/signal_store.py
+# 시그널/체결 기록 저장소
+# - 기록: 행을 메모리에 모았다가 한 번에 기록 (행마다 파일을 열지 않음)
+# - 형식: 전략/일 단위로 나눈 컬럼형(npz) 파트 파일 (time int64, ticker 코드, signal int8, price float64)
+# - 읽기: 요청 기간의 일 파티션만 열어 컬럼 배열을 이어 붙여 DataFrame 반환
+#   (npz 는 읽을 때 배열을 메모리로 복사함 — 줄어드는 건 CSV 파싱/날짜 문자열 변환 비용)
+#
+# 디렉터리 구조) <root>/<strategy>/<YYYY-MM-DD>/part-<ns>-<pid>.npz
+
+import atexit
+import glob
+import os
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+SIGNAL_DIR = "signals"                            # 실거래 시그널
+BACKTEST_DIR = os.path.join("backtest", "signals")  # 백테스트 시그널
+FLUSH_ROWS = 100       # 실거래 기록: 이만큼 쌓이면 기록
+FLUSH_SECONDS = 60     # 실거래 기록: 마지막 기록 후 이 시간이 지나면 다음 행에서 기록
+COLUMNS = ["time", "ticker", "strategy", "signal", "price"]
+SIGNAL_CODES = {"buy": 1, "sell": -1}
+SIGNAL_NAMES = np.array([None, "buy", "sell"], dtype=object)  # 코드 0 / 1 / -1 순서로 인덱싱
+
+
+class SignalRecorder:
+    def __init__(self, root, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.buffers = defaultdict(list)  # 전략 → [(time, ticker, signal, price)]
+        self.pending = 0
+        self.flushed_at = time.time()
+        self.lock = threading.Lock()
+
+    def append(self, timestamp, ticker, strategy, signal, price):
+        with self.lock:
+            self.buffers[strategy].append((timestamp, ticker, signal, price))
+            self.pending += 1
+            due = self.pending >= self.flush_rows or (
+                self.flush_seconds is not None and time.time() - self.flushed_at >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def extend(self, rows):
+        """(시각, 티커, 전략, 시그널, 가격) 여러 행 추가"""
+        with self.lock:
+            for timestamp, ticker, strategy, signal, price in rows:
+                self.buffers[strategy].append((timestamp, ticker, signal, price))
+                self.pending += 1
+            due = self.pending >= self.flush_rows
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            buffers, self.buffers = self.buffers, defaultdict(list)
+            self.pending = 0
+            self.flushed_at = time.time()
+        for strategy, rows in buffers.items():
+            if not rows:
+                continue
+            times, tickers, signals, prices = zip(*rows)
+            write_signals(strategy, times, tickers, signals, prices, root=self.root)
+
+
+def write_signals(strategy, times, tickers, signals, prices, root=BACKTEST_DIR):
+    """컬럼 배열을 일 단위 파티션 파트 파일로 한 번에 기록 (DataFrame 컬럼도 그대로 전달 가능)"""
+    times = pd.to_datetime(pd.Index(times)).values.astype("datetime64[ns]")
+    if len(times) == 0:
+        return
+    ticker_names, ticker_codes = np.unique(np.asarray(tickers, dtype=str), return_inverse=True)
+    signal_values = np.asarray(signals, dtype=object)
+    codes = np.where(signal_values == "buy", 1, np.where(signal_values == "sell", -1, 0)).astype(np.int8)
+    prices = np.asarray(prices, dtype=np.float64)
+
+    days = times.astype("datetime64[D]")
+    for day in np.unique(days):
+        mask = days == day
+        directory = os.path.join(root, strategy, str(day))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{time.time_ns()}-{os.getpid()}.npz")
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    time=times[mask].astype(np.int64),
+                    tickers=ticker_names,
+                    ticker=ticker_codes[mask].astype(np.int32),
+                    signal=codes[mask],
+                    price=prices[mask],
+                )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ 시그널 기록 실패 ({path}): {e}")
+
+
+def read_signals(strategy, root=BACKTEST_DIR, start=None, end=None, legacy_csv=None):
+    """전략 시그널 → DataFrame[time, ticker, strategy, signal, price] (시간순)
+
+    start/end (날짜 또는 시각) 가 있으면 해당 일 파티션만 읽는다.
+    저장된 파트가 없고 legacy_csv 가 있으면 예전 헤더 없는 CSV 를 읽는다.
+    """
+    paths = sorted(glob.glob(os.path.join(root, strategy, "*", "*.npz")))
+    if start is not None or end is not None:
+        first = str(pd.Timestamp(start).date()) if start is not None else None
+        last = str(pd.Timestamp(end).date()) if end is not None else None
+        paths = [p for p in paths if (first is None or _day_of(p) >= first) and (last is None or _day_of(p) <= last)]
+
+    if not paths:
+        if legacy_csv and os.path.exists(legacy_csv):
+            return read_legacy_csv(legacy_csv)
+        return pd.DataFrame(columns=COLUMNS)
+
+    times, tickers, codes, prices = [], [], [], []
+    for path in paths:
+        with np.load(path) as data:
+            times.append(data["time"])
+            tickers.append(pd.Categorical.from_codes(data["ticker"], categories=data["tickers"]))
+            codes.append(data["signal"])
+            prices.append(data["price"])
+
+    df = pd.DataFrame({
+        "time": pd.to_datetime(np.concatenate(times)),
+        "ticker": union_categoricals(tickers),
+        "strategy": strategy,
+        "signal": SIGNAL_NAMES[np.concatenate(codes)],
+        "price": np.concatenate(prices),
+    })
+    if start is not None:
+        df = df[df["time"] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df["time"] <= pd.Timestamp(end)]
+    if not df["time"].is_monotonic_increasing:
+        df = df.sort_values("time", kind="stable")
+    return df.reset_index(drop=True)
+
+
+def read_legacy_csv(path):
+    """log_signal 이 예전에 남긴 헤더 없는 CSV"""
+    df = pd.read_csv(path, names=COLUMNS)
+    df["time"] = pd.to_datetime(df["time"])
+    return df.sort_values("time", kind="stable").reset_index(drop=True)
+
+
+def _day_of(path):
+    return os.path.basename(os.path.dirname(path))
+
+
+recorder = SignalRecorder(SIGNAL_DIR)
+backtest_recorder = SignalRecorder(BACKTEST_DIR, flush_rows=1_000_000, flush_seconds=None)
+atexit.register(recorder.flush)
+atexit.register(backtest_recorder.flush)
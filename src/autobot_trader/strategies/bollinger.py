@@ -1,16 +1,34 @@
 import pandas as pd
+from autobot_trader.strategies.indicators import to_signal
+
+
+def compute_bollinger_signals(df: pd.DataFrame, window: int = 20, num_std: float = 2) -> pd.DataFrame:
+    """전체 구간 볼린저 밴드 지표와 봉별 시그널 계산"""
+    close = df["close"]
+    ma = close.rolling(window=window).mean()
+    stddev = close.rolling(window=window).std()
+    upper = ma + num_std * stddev
+    lower = ma - num_std * stddev
+
+    prev_close = close.shift(1)
+    buy = (prev_close < lower.shift(1)) & (close > lower)
+    sell = (prev_close > upper.shift(1)) & (close < upper)
+    return pd.DataFrame({
+        "ma20": ma,
+        "stddev": stddev,
+        "upper": upper,
+        "lower": lower,
+        "signal": to_signal(df.index, buy, sell),
+    }, index=df.index)
+
 
 def get_bollinger_signal(df=None, amount=12000):
     if df is None or len(df) < 20:
         return None
-    df = df.copy()
-    df['ma20'] = df['close'].rolling(window=20).mean()
-    df['stddev'] = df['close'].rolling(window=20).std()
-    df['upper'] = df['ma20'] + 2 * df['stddev']
-    df['lower'] = df['ma20'] - 2 * df['stddev']
+    signal = compute_bollinger_signals(df)["signal"].iloc[-1]
 
-    if df['close'].iloc[-2] < df['lower'].iloc[-2] and df['close'].iloc[-1] > df['lower'].iloc[-1]:
+    if signal == "buy":
         return {"signal": "buy", "reason": "볼린저 하단 반등 발생", "amount": amount}
-    elif df['close'].iloc[-2] > df['upper'].iloc[-2] and df['close'].iloc[-1] < df['upper'].iloc[-1]:
+    elif signal == "sell":
         return {"signal": "sell", "reason": "볼린저 상단 돌파 실패 후 하락", "amount": None}
     return None
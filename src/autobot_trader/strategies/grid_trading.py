@@ -1,82 +1,129 @@
+import numpy as np
 import pandas as pd
-import json
-import os
-from datetime import datetime
 
 # 설정값
 GRID_COUNT = 10
-STATE_FILE = "grid_state.json"
-COIN_UNIT = 0.001  # 매수 수량
+GRID_WINDOW = 30   # 그리드 상/하단을 정하는 최근 봉 수
+BUY_LEVELS = 4     # 하단 0~3 레벨에서만 매수
+SELL_GAP = 4       # 매수 가격 + 4칸에서 매도
+
+def compute_grid_levels(df: pd.DataFrame) -> pd.DataFrame:
+    """전체 구간 봉별 동적 그리드 하단/상단/간격/현재 레벨 계산"""
+    grid_low = df["low"].rolling(GRID_WINDOW).min()
+    grid_high = df["high"].rolling(GRID_WINDOW).max()
+    grid_step = (grid_high - grid_low) / GRID_COUNT
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw_level = np.floor((df["close"] - grid_low) / grid_step)
+    level = raw_level.where(grid_step > 0).clip(0, GRID_COUNT - 1)
+    return pd.DataFrame({
+        "grid_low": grid_low,
+        "grid_high": grid_high,
+        "grid_step": grid_step,
+        "level": level,
+    }, index=df.index)
+
+def compute_grid_trading_signals(df: pd.DataFrame) -> pd.DataFrame:
+    """전체 구간 그리드 매매 시그널 계산 (보유 레벨은 메모리에서만 추적)"""
+    grid = compute_grid_levels(df)
+    levels = grid["level"].to_numpy()
+    signals = np.full(len(levels), None, dtype=object)
+    held = set()
+
+    # 레벨이 직전 봉과 같으면 보유 상태가 바뀌지 않으므로 레벨이 바뀌는 봉만 순회
+    valid = ~np.isnan(levels)
+    changed = np.flatnonzero(valid & np.concatenate(([True], levels[1:] != levels[:-1])))
+    for i, level in zip(changed.tolist(), levels[changed].astype(int).tolist()):
+        if level not in held and level < BUY_LEVELS:
+            held.add(level)
+            signals[i] = "buy"
+        sold = [hold_level for hold_level in held if level >= hold_level + SELL_GAP]
+        if sold:
+            held.difference_update(sold)
+            signals[i] = "sell"
+
+    grid["signal"] = signals
+    return grid
 
 def get_dynamic_grid(df: pd.DataFrame):
-    """최근 30일 기준 동적 그리드 구간 계산"""
-    grid_low = df["low"].rolling(30).min().iloc[-1]
-    grid_high = df["high"].rolling(30).max().iloc[-1]
+    """최근 GRID_WINDOW 봉 기준 동적 그리드 구간 계산 (마지막 구간만 필요하므로 rolling 없이 tail 사용)"""
+    recent = df.iloc[-GRID_WINDOW:]
+    grid_low, grid_high = recent["low"].min(), recent["high"].max()
     grid_step = (grid_high - grid_low) / GRID_COUNT
     grid_levels = [grid_low + i * grid_step for i in range(GRID_COUNT + 1)]
     return grid_low, grid_high, grid_step, grid_levels
 
-def load_state():
-    """보유 상태 불러오기"""
-    if not os.path.exists(STATE_FILE):
-        return {}
-    with open(STATE_FILE, "r") as f:
-        return json.load(f)
-
-def save_state(state: dict):
-    """보유 상태 저장"""
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
-
 def get_current_level(price: float, grid_low: float, grid_step: float):
     level = int((price - grid_low) // grid_step)
     return max(0, min(GRID_COUNT - 1, level))
 
-def get_grid_trading_signal(df: pd.DataFrame):
-    """그리드 트레이딩 시그널 생성"""
-    try:
-        if df is None or len(df) < 30:
-            print("[grid_trading] 데이터 부족 또는 None")
-            return None
-
-        price = df["close"].iloc[-1]
-        grid_low, grid_high, grid_step, grid_levels = get_dynamic_grid(df)
-        level = get_current_level(price, grid_low, grid_step)
-        state = load_state()
+def grid_signal(grid_low, grid_high, price, amount):
+    """그리드 구간 → 통합 시그널 dict (signal="grid", 실제 주문은 plan_grid_orders 로 계산)"""
+    grid_step = (grid_high - grid_low) / GRID_COUNT
+    if not grid_step > 0:
+        return None
+    level = get_current_level(price, grid_low, grid_step)
+    return {
+        "signal": "grid",
+        "reason": f"그리드 {grid_low:,.0f}~{grid_high:,.0f} (현재 레벨 {level})",
+        "amount": amount,
+        "grid_low": grid_low,
+        "grid_step": grid_step,
+        "level": level,
+        "price": price,
+    }
 
-        signals = []
+def plan_grid_orders(signal, holdings, volume=None):
+    """그리드 시그널 + 티커의 레벨 상태 → (새 지정가 주문 목록, 취소할 레벨 목록)
 
-        # 매수 조건
-        if f"grid_{level}" not in state and level <= 3:
-            signals.append({
-                "action": "buy",
+    holdings: {level: {"state": "buy_wait" | "held" | "sell_wait" | "cancelling" | "inactive", "buy_price", "quantity", ...}}
+    volume: 장부의 전략 보유 수량 (None 이면 한도 없음)
+    - 비어 있는 하단 레벨 중 현재가보다 낮은 레벨에 매수 주문 (확인 안 된 이전 기록 "inactive" 레벨은 빈 레벨로 봄)
+    - 체결 기록("filled")이 있는 보유 레벨은 매수 가격 + SELL_GAP 칸에 매도 주문
+      (매도 대기 수량을 포함한 합계가 volume 을 넘지 않도록 자름)
+    - 그리드가 움직여 가격이 반 칸 이상 어긋난 매수 대기 주문은 취소 (다음 실행에서 새 가격으로 다시 주문)
+    """
+    grid_low, grid_step, price = signal["grid_low"], signal["grid_step"], signal["price"]
+    amount = signal.get("amount") or 0
+    orders, cancels = [], []
+    sellable = float("inf") if volume is None else volume
+    sellable -= sum(
+        info.get("sell_volume", info["quantity"]) for info in holdings.values() if info["state"] == "sell_wait"
+    )
+    for level, info in sorted(holdings.items()):
+        if info["state"] == "buy_wait" and abs(info["buy_price"] - (grid_low + level * grid_step)) > grid_step / 2:
+            cancels.append(level)
+        elif info["state"] == "held" and info.get("filled"):
+            sell_volume = round(min(info["quantity"], sellable), 8)
+            if sell_volume <= 0:
+                continue
+            sellable -= sell_volume
+            orders.append({
                 "level": level,
-                "price": round(grid_levels[level], 0),
-                "quantity": COIN_UNIT
+                "side": "sell",
+                "price": info["buy_price"] + SELL_GAP * grid_step,
+                "volume": sell_volume,
             })
-            state[f"grid_{level}"] = {
-                "buy_price": round(grid_levels[level], 0),
-                "quantity": COIN_UNIT,
-                "timestamp": datetime.now().isoformat()
-            }
+    for level in range(BUY_LEVELS):
+        level_price = grid_low + level * grid_step
+        free = holdings.get(level, {}).get("state", "inactive") == "inactive"
+        if free and level_price < price and amount > 0:
+            orders.append({
+                "level": level,
+                "side": "buy",
+                "price": level_price,
+                "volume": round(amount / level_price, 8),
+            })
+    return orders, cancels
 
-        # 매도 조건 (레벨 4 이상 차이날 경우)
-        for key in list(state.keys()):
-            hold_level = int(key.split("_")[1])
-            if level >= hold_level + 4:
-                buy_price = state[key]["buy_price"]
-                quantity = state[key]["quantity"]
-                signals.append({
-                    "action": "sell",
-                    "level": hold_level,
-                    "price": price,
-                    "quantity": quantity,
-                    "buy_price": buy_price
-                })
-                del state[key]
+def get_grid_trading_signal(df: pd.DataFrame, amount=10000):
+    """그리드 트레이딩 시그널 생성 (주문 배치/보유 상태는 grid_executor 가 티커별로 관리)"""
+    try:
+        if df is None or len(df) < GRID_WINDOW:
+            print("[grid_trading] 데이터 부족 또는 None")
+            return None
 
-        save_state(state)
-        return signals if signals else None
+        grid_low, grid_high, _, _ = get_dynamic_grid(df)
+        return grid_signal(grid_low, grid_high, df["close"].iloc[-1], amount)
 
     except Exception as e:
         print(f"[grid_trading] 전략 실행 오류: {e}")
@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+
+
+def rolling_rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    """단순 이동평균 기반 RSI (기존 전략들과 동일한 계산식)"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.rolling(window=period).mean()
+    avg_loss = loss.rolling(window=period).mean()
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def to_signal(index, buy, sell) -> pd.Series:
+    """매수/매도 불리언 배열을 'buy' / 'sell' / None 시그널 컬럼으로 변환 (매수 우선)"""
+    values = np.select([np.asarray(buy, dtype=bool), np.asarray(sell, dtype=bool)], ["buy", "sell"], default=None)
+    return pd.Series(values, index=index, dtype=object)
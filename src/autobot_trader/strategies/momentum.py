@@ -1,25 +1,28 @@
-import pyupbit
+import pandas as pd
+from autobot_trader.strategies.indicators import rolling_rsi, to_signal
+
+
+def compute_momentum_signals(df: pd.DataFrame, period: int = 14, upper: float = 70, lower: float = 30) -> pd.DataFrame:
+    """전체 구간 RSI 모멘텀 지표와 봉별 시그널 계산"""
+    rsi = calculate_rsi(df["close"], period)
+    return pd.DataFrame({
+        "rsi": rsi,
+        "signal": to_signal(df.index, rsi > upper, rsi < lower),
+    }, index=df.index)
+
 
 def get_momentum_signal(df=None, amount=10000):
     if df is None or len(df) < 15:
         return None
 
-    df = df.copy()
-    df.loc[:, "rsi"] = calculate_rsi(df["close"])
-    curr_rsi = df["rsi"].iloc[-1]
+    last = compute_momentum_signals(df).iloc[-1]
+    curr_rsi = last["rsi"]
 
-    if curr_rsi > 70:
+    if last["signal"] == "buy":
         return {"signal": "buy", "reason": f"RSI 강세 돌파 ({curr_rsi:.2f})", "amount": amount}
-    elif curr_rsi < 30:
+    elif last["signal"] == "sell":
         return {"signal": "sell", "reason": f"RSI 약세 하락 ({curr_rsi:.2f})", "amount": None}
     return None
 
 def calculate_rsi(series, period=14):
-    delta = series.diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return rolling_rsi(series, period)
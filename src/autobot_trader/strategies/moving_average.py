@@ -1,13 +1,29 @@
-import pyupbit
+import pandas as pd
+from autobot_trader.strategies.indicators import to_signal
+
+
+def compute_moving_average_signals(df: pd.DataFrame, short: int = 5, long: int = 20) -> pd.DataFrame:
+    """전체 구간 단기/장기 이동평균 교차 시그널 계산"""
+    ma_short = df["close"].rolling(window=short).mean()
+    ma_long = df["close"].rolling(window=long).mean()
+    prev_short, prev_long = ma_short.shift(1), ma_long.shift(1)
+
+    buy = (prev_short < prev_long) & (ma_short > ma_long)
+    sell = (prev_short > prev_long) & (ma_short < ma_long)
+    return pd.DataFrame({
+        "ma_short": ma_short,
+        "ma_long": ma_long,
+        "signal": to_signal(df.index, buy, sell),
+    }, index=df.index)
+
 
 def get_moving_average_signal(df=None, amount=10000):
     if df is None or len(df) < 30:
         return None
-    ma5 = df["close"].rolling(window=5).mean()
-    ma20 = df["close"].rolling(window=20).mean()
+    signal = compute_moving_average_signals(df)["signal"].iloc[-1]
 
-    if ma5.iloc[-2] < ma20.iloc[-2] and ma5.iloc[-1] > ma20.iloc[-1]:
+    if signal == "buy":
         return {"signal": "buy", "reason": "5일선이 20일선을 상향 돌파", "amount": amount}
-    elif ma5.iloc[-2] > ma20.iloc[-2] and ma5.iloc[-1] < ma20.iloc[-1]:
+    elif signal == "sell":
         return {"signal": "sell", "reason": "5일선이 20일선을 하향 이탈", "amount": None}
-    return None
\ No newline at end of file
+    return None
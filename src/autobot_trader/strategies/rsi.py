@@ -1,36 +1,41 @@
 import pandas as pd
 from autobot_trader.telegram_bot import send_message
+from autobot_trader.strategies.indicators import rolling_rsi, to_signal
+
+
+def compute_rsi_signals(df: pd.DataFrame, period: int = 14, lower: float = 30, upper: float = 70) -> pd.DataFrame:
+    """전체 구간 RSI 과매도 반등 / 과매수 하락 시그널 계산"""
+    rsi = rolling_rsi(df["close"], period)
+    prev_rsi = rsi.shift(1)
+    buy = (prev_rsi < lower) & (rsi > lower)
+    sell = (prev_rsi > upper) & (rsi < upper)
+    return pd.DataFrame({
+        "rsi": rsi,
+        "signal": to_signal(df.index, buy, sell),
+    }, index=df.index)
+
 
 def get_rsi_signal(df=None, period=14, amount=8000):
     if df is None or len(df) < period + 1:
         return None
 
-    df = df.copy()
-    delta = df['close'].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    df['rsi'] = rsi
-
-    prev_rsi = df['rsi'].iloc[-2]
-    curr_rsi = df['rsi'].iloc[-1]
+    frame = compute_rsi_signals(df, period)
+    prev_rsi = frame["rsi"].iloc[-2]
+    curr_rsi = frame["rsi"].iloc[-1]
+    signal = frame["signal"].iloc[-1]
     print(f"[RSI] 전 RSI: {prev_rsi:.2f}, 현 RSI: {curr_rsi:.2f}")
 
-    if prev_rsi < 30 and curr_rsi > 30:
+    if signal == "buy":
         return {
             "signal": "buy",
             "reason": f"RSI 반등 (전: {prev_rsi:.2f} → 현: {curr_rsi:.2f})",
             "amount": amount
         }
-    elif prev_rsi > 70 and curr_rsi < 70:
+    elif signal == "sell":
         return {
             "signal": "sell",
             "reason": f"RSI 하락 (전: {prev_rsi:.2f} → 현: {curr_rsi:.2f})",
             "amount": None
         }
 
-    return None
\ No newline at end of file
+    return None
@@ -0,0 +1,349 @@
+import math
+import operator
+from collections import deque
+
+from autobot_trader.strategies.grid_trading import GRID_WINDOW, grid_signal
+
+# 실시간 전략 평가용 증분 지표
+# 마감된 봉을 하나씩 push 하면 과거 데이터를 다시 계산하지 않고 O(1) 로 현재 시그널을 돌려준다.
+# 시그널 조건과 반환 dict 형식은 strategies/*.py 의 get_*_signal 과 동일하다.
+
+NAN = float("nan")
+
+
+class RollingMean:
+    """고정 윈도우 이동평균 (누적합 기반 O(1) 갱신)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window:
+            return NAN
+        return self.total / self.window
+
+
+class RollingStats:
+    """고정 윈도우 평균/표본표준편차 (슬라이딩 Welford)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            new_mean = self.mean + (value - old) / self.window
+            self.m2 += (value - old) * (value - new_mean + old - self.mean)
+            self.mean = new_mean
+        else:
+            n = len(self.values) + 1
+            delta = value - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (value - self.mean)
+        self.values.append(value)
+        self.m2 = max(self.m2, 0.0)
+
+    @property
+    def std(self):
+        if len(self.values) < self.window or self.window < 2:
+            return NAN
+        return math.sqrt(self.m2 / (self.window - 1))
+
+
+class RollingRSI:
+    """증분 RSI. 기본은 기존 전략과 같은 단순 이동평균식, wilder=True 면 Wilder 평활"""
+
+    def __init__(self, period=14, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        self.prev_close = None
+        self.gains = RollingMean(period)
+        self.losses = RollingMean(period)
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+        self.count = 0
+
+    def update(self, close):
+        # 첫 봉은 diff 가 없으므로 pandas 구현과 같이 상승/하락폭 0 으로 취급
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.count += 1
+
+        if self.wilder and self.count > self.period:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        else:
+            self.avg_gain = self.gains.update(gain)
+            self.avg_loss = self.losses.update(loss)
+        return self.value
+
+    @property
+    def value(self):
+        if math.isnan(self.avg_gain) or math.isnan(self.avg_loss):
+            return NAN
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else NAN
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class RollingMin:
+    """고정 윈도우 최솟값 (단조 deque, 분할상환 O(1) 갱신)"""
+
+    dominated = operator.ge  # 새 값보다 크거나 같은 뒤쪽 값은 다시 최솟값이 될 수 없음
+
+    def __init__(self, window):
+        self.window = window
+        self.items = deque()  # (순번, 값), 값이 단조 증가
+        self.count = 0
+
+    def update(self, value):
+        while self.items and self.dominated(self.items[-1][1], value):
+            self.items.pop()
+        self.items.append((self.count, value))
+        if self.items[0][0] <= self.count - self.window:
+            self.items.popleft()
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return NAN
+        return self.items[0][1]
+
+
+class RollingMax(RollingMin):
+    """고정 윈도우 최댓값 (단조 deque)"""
+
+    dominated = operator.le
+
+
+class CrossoverState:
+    """두 선의 교차 상태 추적. inclusive=True 면 직전 봉의 동일값도 교차 전으로 인정"""
+
+    def __init__(self, inclusive=False):
+        self.inclusive = inclusive
+        self.prev_diff = NAN
+
+    def update(self, fast, slow):
+        diff = fast - slow
+        prev, self.prev_diff = self.prev_diff, diff
+        if math.isnan(prev) or math.isnan(diff):
+            return None
+        if diff > 0 and (prev < 0 or (self.inclusive and prev == 0)):
+            return "up"
+        if diff < 0 and (prev > 0 or (self.inclusive and prev == 0)):
+            return "down"
+        return None
+
+
+class StrategyStream:
+    """전략별 증분 평가 기본 클래스 (마감된 봉을 push → 시그널 dict 또는 None)"""
+
+    name = None
+    warmup = 2
+    default_amount = 10000
+
+    def __init__(self, amount=None):
+        self.amount = self.default_amount if amount is None else amount
+        self.bars = 0
+        self.last_time = None
+
+    def update(self, candle, timestamp=None, amount=None):
+        self.bars += 1
+        self.last_time = timestamp
+        result = self.on_candle(candle, self.amount if amount is None else amount)
+        return result if self.bars >= self.warmup else None
+
+    def seed(self, df):
+        """과거 마감 봉으로 지표 상태를 채움"""
+        for timestamp, candle in zip(df.index, df.to_dict("records")):
+            self.update(candle, timestamp)
+
+    @property
+    def ready(self):
+        return self.bars >= self.warmup
+
+    def on_candle(self, candle, amount):
+        raise NotImplementedError
+
+
+class BollingerStream(StrategyStream):
+    name = "bollinger"
+    default_amount = 12000
+
+    def __init__(self, window=20, num_std=2, amount=None):
+        super().__init__(amount)
+        self.warmup = window + 1
+        self.num_std = num_std
+        self.stats = RollingStats(window)
+        self.prev = None
+
+    def on_candle(self, candle, amount):
+        close = candle["close"]
+        self.stats.update(close)
+        mean, std = self.stats.mean, self.stats.std
+        upper, lower = mean + self.num_std * std, mean - self.num_std * std
+        prev, self.prev = self.prev, (close, upper, lower)
+        if prev is None:
+            return None
+        prev_close, prev_upper, prev_lower = prev
+
+        if prev_close < prev_lower and close > lower:
+            return {"signal": "buy", "reason": "볼린저 하단 반등 발생", "amount": amount}
+        elif prev_close > prev_upper and close < upper:
+            return {"signal": "sell", "reason": "볼린저 상단 돌파 실패 후 하락", "amount": None}
+        return None
+
+
+class MovingAverageStream(StrategyStream):
+    name = "moving_average"
+    warmup = 30
+
+    def __init__(self, short=5, long=20, amount=None):
+        super().__init__(amount)
+        self.ma_short = RollingMean(short)
+        self.ma_long = RollingMean(long)
+        self.cross = CrossoverState()
+
+    def on_candle(self, candle, amount):
+        close = candle["close"]
+        cross = self.cross.update(self.ma_short.update(close), self.ma_long.update(close))
+        if cross == "up":
+            return {"signal": "buy", "reason": "5일선이 20일선을 상향 돌파", "amount": amount}
+        elif cross == "down":
+            return {"signal": "sell", "reason": "5일선이 20일선을 하향 이탈", "amount": None}
+        return None
+
+
+class TrendFollowingStream(StrategyStream):
+    name = "trend_following"
+    default_amount = 15000
+
+    def __init__(self, short=20, long=100, amount=None):
+        super().__init__(amount)
+        self.warmup = long + 1
+        self.short_ma = RollingMean(short)
+        self.long_ma = RollingMean(long)
+        self.cross = CrossoverState(inclusive=True)
+
+    def on_candle(self, candle, amount):
+        close = candle["close"]
+        cross = self.cross.update(self.short_ma.update(close), self.long_ma.update(close))
+        if cross == "up":
+            return {"signal": "buy", "reason": "단기추세가 장기추세를 상향 돌파", "amount": amount}
+        elif cross == "down":
+            return {"signal": "sell", "reason": "단기추세가 장기추세를 하향 이탈", "amount": None}
+        return None
+
+
+class RSIStream(StrategyStream):
+    name = "rsi"
+    default_amount = 8000
+
+    def __init__(self, period=14, lower=30, upper=70, wilder=False, amount=None):
+        super().__init__(amount)
+        self.warmup = period + 1
+        self.lower, self.upper = lower, upper
+        self.rsi = RollingRSI(period, wilder=wilder)
+        self.prev_rsi = NAN
+
+    def on_candle(self, candle, amount):
+        prev_rsi, curr_rsi = self.prev_rsi, self.rsi.update(candle["close"])
+        self.prev_rsi = curr_rsi
+
+        if prev_rsi < self.lower and curr_rsi > self.lower:
+            return {
+                "signal": "buy",
+                "reason": f"RSI 반등 (전: {prev_rsi:.2f} → 현: {curr_rsi:.2f})",
+                "amount": amount
+            }
+        elif prev_rsi > self.upper and curr_rsi < self.upper:
+            return {
+                "signal": "sell",
+                "reason": f"RSI 하락 (전: {prev_rsi:.2f} → 현: {curr_rsi:.2f})",
+                "amount": None
+            }
+        return None
+
+
+class MomentumStream(StrategyStream):
+    name = "momentum"
+
+    def __init__(self, period=14, upper=70, lower=30, amount=None):
+        super().__init__(amount)
+        self.warmup = period + 1
+        self.upper, self.lower = upper, lower
+        self.rsi = RollingRSI(period)
+
+    def on_candle(self, candle, amount):
+        curr_rsi = self.rsi.update(candle["close"])
+        if curr_rsi > self.upper:
+            return {"signal": "buy", "reason": f"RSI 강세 돌파 ({curr_rsi:.2f})", "amount": amount}
+        elif curr_rsi < self.lower:
+            return {"signal": "sell", "reason": f"RSI 약세 하락 ({curr_rsi:.2f})", "amount": None}
+        return None
+
+
+class VolatilityBreakoutStream(StrategyStream):
+    name = "volatility_breakout"
+
+    def __init__(self, k=0.5, amount=None):
+        super().__init__(amount)
+        self.k = k
+        self.prev = None
+
+    def on_candle(self, candle, amount):
+        prev, self.prev = self.prev, candle
+        if prev is None:
+            return None
+        target_price = prev["close"] + (prev["high"] - prev["low"]) * self.k
+        if candle["close"] > target_price:
+            return {"signal": "buy", "reason": f"가격이 돌파 기준({target_price:.2f}) 상회", "amount": amount}
+        return None
+
+
+class GridTradingStream(StrategyStream):
+    name = "grid_trading"
+
+    def __init__(self, window=GRID_WINDOW, amount=None):
+        super().__init__(amount)
+        self.warmup = window
+        self.low = RollingMin(window)
+        self.high = RollingMax(window)
+
+    def on_candle(self, candle, amount):
+        grid_low = self.low.update(candle["low"])
+        grid_high = self.high.update(candle["high"])
+        if math.isnan(grid_low):
+            return None
+        return grid_signal(grid_low, grid_high, candle["close"], amount)
+
+
+STREAMS = {
+    stream.name: stream
+    for stream in (
+        BollingerStream,
+        MovingAverageStream,
+        TrendFollowingStream,
+        RSIStream,
+        MomentumStream,
+        VolatilityBreakoutStream,
+        GridTradingStream,
+    )
+}
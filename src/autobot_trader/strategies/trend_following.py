@@ -1,13 +1,29 @@
-import pyupbit
+import pandas as pd
+from autobot_trader.strategies.indicators import to_signal
+
+
+def compute_trend_following_signals(df: pd.DataFrame, short: int = 20, long: int = 100) -> pd.DataFrame:
+    """전체 구간 단기/장기 추세선 교차 시그널 계산"""
+    short_ma = df["close"].rolling(window=short).mean()
+    long_ma = df["close"].rolling(window=long).mean()
+    prev_short, prev_long = short_ma.shift(1), long_ma.shift(1)
+
+    buy = (short_ma > long_ma) & (prev_short <= prev_long)
+    sell = (short_ma < long_ma) & (prev_short >= prev_long)
+    return pd.DataFrame({
+        "short_ma": short_ma,
+        "long_ma": long_ma,
+        "signal": to_signal(df.index, buy, sell),
+    }, index=df.index)
+
 
 def get_trend_following_signal(df=None, amount=15000):
     if df is None or len(df) < 100:
         return None
-    short_ma = df["close"].rolling(window=20).mean()
-    long_ma = df["close"].rolling(window=100).mean()
+    signal = compute_trend_following_signals(df)["signal"].iloc[-1]
 
-    if short_ma.iloc[-1] > long_ma.iloc[-1] and short_ma.iloc[-2] <= long_ma.iloc[-2]:
+    if signal == "buy":
         return {"signal": "buy", "reason": "단기추세가 장기추세를 상향 돌파", "amount": amount}
-    elif short_ma.iloc[-1] < long_ma.iloc[-1] and short_ma.iloc[-2] >= long_ma.iloc[-2]:
+    elif signal == "sell":
         return {"signal": "sell", "reason": "단기추세가 장기추세를 하향 이탈", "amount": None}
-    return None
\ No newline at end of file
+    return None
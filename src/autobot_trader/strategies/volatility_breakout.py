@@ -1,15 +1,27 @@
 import pandas as pd
+from autobot_trader.strategies.indicators import to_signal
+
+
+def compute_volatility_breakout_signals(df: pd.DataFrame, k: float = 0.5) -> pd.DataFrame:
+    """전체 구간 변동성 돌파 목표가와 봉별 시그널 계산"""
+    prev = df.shift(1)
+    target = prev["close"] + (prev["high"] - prev["low"]) * k
+    buy = df["close"] > target
+    return pd.DataFrame({
+        "target": target,
+        "signal": to_signal(df.index, buy, False),
+    }, index=df.index)
+
 
 def get_volatility_breakout_signal(df: pd.DataFrame, k: float = 0.5, amount=10000):
     if df is None or len(df) < 2:
         return None
-    yesterday = df.iloc[-2]
-    today = df.iloc[-1]
-    target_price = yesterday["close"] + (yesterday["high"] - yesterday["low"]) * k
-    current_price = today["close"]
+    last = compute_volatility_breakout_signals(df, k).iloc[-1]
+    target_price = last["target"]
+    current_price = df["close"].iloc[-1]
 
     print(f"[volatility_breakout] Target: {target_price:.2f}, Current: {current_price:.2f}")
 
-    if current_price > target_price:
+    if last["signal"] == "buy":
         return {"signal": "buy", "reason": f"가격이 돌파 기준({target_price:.2f}) 상회", "amount": amount}
     return None
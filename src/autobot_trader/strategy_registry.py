@@ -0,0 +1,166 @@
+# src/autobot_trader/strategy_registry.py
+# 전략 레지스트리 (전략 추가 = 항목 하나)
+# - 전략별 시그널 함수/벡터화 함수/증분 스트림, 인터벌, 예산, 중복 매수 쿨다운, 워밍업 봉 수를 한 곳에 선언
+# - 실행 시점은 인터벌 봉 마감 (candle_scheduler)
+# - 함수는 "모듈:이름" 경로로만 기록하고 처음 호출할 때 import → 러너 시작 시 pandas 등 전략 의존성을 읽지 않음
+# - 플러그인
+#   1) entry point: 설치된 패키지가 ENTRY_POINT_GROUP 그룹에 {전략 이름: 항목 dict} 를 반환하는 객체를 등록
+#   2) 설정 파일: STRATEGY_CONFIG(기본 strategies.json) 에 {전략 이름: 항목 dict} → 새 전략 추가 또는 기본값 덮어쓰기
+#      ("enabled": false 면 해당 전략 제외)
+#
+# 항목 예) {"signal": "my_pkg.breakout:get_signal", "compute": "my_pkg.breakout:compute_signals",
+#           "stream": None, "interval": "minute15", "budget": 10000, "cooldown": 30, "warmup": 40}
+
+import importlib
+import json
+import os
+from importlib.metadata import entry_points
+
+ENTRY_POINT_GROUP = "autobot_trader.strategies"
+CONFIG_PATH = os.getenv("STRATEGY_CONFIG", "strategies.json")
+
+DEFAULTS = {
+    "signal": None,      # get_*_signal(df, amount=...) 실거래 시그널 함수
+    "compute": None,     # compute_*_signals(df) 전체 구간 벡터화 함수 (백테스트)
+    "stream": None,      # StrategyStream 하위 클래스 (봉 하나씩 증분 계산, 없으면 매번 OHLCV 조회)
+    "interval": "day",
+    "budget": 10000,     # 기본 주문 금액 (KRW)
+    "cooldown": 30,      # 중복 매수 제한 (분)
+    "warmup": 2,         # 시그널 계산에 필요한 최소 봉 수
+}
+
+BUILTIN_STRATEGIES = {
+    "moving_average": {
+        "signal": "autobot_trader.strategies.moving_average:get_moving_average_signal",
+        "compute": "autobot_trader.strategies.moving_average:compute_moving_average_signals",
+        "stream": "autobot_trader.strategies.streaming:MovingAverageStream",
+        "interval": "minute30", "budget": 10000, "cooldown": 30, "warmup": 30,
+    },
+    "rsi": {
+        "signal": "autobot_trader.strategies.rsi:get_rsi_signal",
+        "compute": "autobot_trader.strategies.rsi:compute_rsi_signals",
+        "stream": "autobot_trader.strategies.streaming:RSIStream",
+        "interval": "minute1", "budget": 8000, "cooldown": 10, "warmup": 15,
+    },
+    "bollinger": {
+        "signal": "autobot_trader.strategies.bollinger:get_bollinger_signal",
+        "compute": "autobot_trader.strategies.bollinger:compute_bollinger_signals",
+        "stream": "autobot_trader.strategies.streaming:BollingerStream",
+        "interval": "minute15", "budget": 12000, "cooldown": 30, "warmup": 21,
+    },
+    "trend_following": {
+        "signal": "autobot_trader.strategies.trend_following:get_trend_following_signal",
+        "compute": "autobot_trader.strategies.trend_following:compute_trend_following_signals",
+        "stream": "autobot_trader.strategies.streaming:TrendFollowingStream",
+        "interval": "minute60", "budget": 15000, "cooldown": 60, "warmup": 101,
+    },
+    "grid_trading": {
+        "signal": "autobot_trader.strategies.grid_trading:get_grid_trading_signal",
+        "compute": "autobot_trader.strategies.grid_trading:compute_grid_trading_signals",
+        "stream": "autobot_trader.strategies.streaming:GridTradingStream",
+        "interval": "minute1", "budget": 10000, "cooldown": 5, "warmup": 30,
+    },
+    "volatility_breakout": {
+        "signal": "autobot_trader.strategies.volatility_breakout:get_volatility_breakout_signal",
+        "compute": "autobot_trader.strategies.volatility_breakout:compute_volatility_breakout_signals",
+        "stream": "autobot_trader.strategies.streaming:VolatilityBreakoutStream",
+        "interval": "day", "budget": 10000, "cooldown": 1440, "warmup": 2,
+    },
+    "momentum": {
+        "signal": "autobot_trader.strategies.momentum:get_momentum_signal",
+        "compute": "autobot_trader.strategies.momentum:compute_momentum_signals",
+        "stream": "autobot_trader.strategies.streaming:MomentumStream",
+        "interval": "minute15", "budget": 10000, "cooldown": 30, "warmup": 15,
+    },
+}
+
+_LOADED = {}  # "모듈:이름" → 객체
+
+
+def load_object(path):
+    """"모듈:이름" → 객체 (처음 요청할 때만 import)"""
+    obj = _LOADED.get(path)
+    if obj is None:
+        module_name, _, attr = path.partition(":")
+        obj = getattr(importlib.import_module(module_name), attr)
+        _LOADED[path] = obj
+    return obj
+
+
+class LazyFunction:
+    """호출 시점에 import 하는 함수 참조 (러너가 전략 모듈을 미리 읽지 않도록)"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, *args, **kwargs):
+        return load_object(self.path)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<LazyFunction {self.path}>"
+
+
+def _merge(registry, entries, source):
+    for name, entry in entries.items():
+        if entry.get("enabled", True) is False:
+            registry.pop(name, None)
+            continue
+        base = registry.get(name, DEFAULTS)
+        spec = {**base, **{key: value for key, value in entry.items() if key != "enabled"}}
+        if not spec["signal"]:
+            print(f"⚠️ 전략 레지스트리: {name} 시그널 함수 없음 ({source}) → 제외")
+            continue
+        registry[name] = spec
+
+
+def _plugin_entries():
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            yield ep.name, ep.load()
+        except Exception as e:
+            print(f"⚠️ 전략 플러그인 로드 실패 ({ep.name}): {e}")
+
+
+def load_registry(config_path=CONFIG_PATH):
+    """기본 전략 + entry point 플러그인 + 설정 파일 → {전략 이름: 항목}"""
+    registry = {}
+    _merge(registry, BUILTIN_STRATEGIES, "기본")
+    for source, entries in _plugin_entries():
+        _merge(registry, entries, source)
+    if config_path and os.path.exists(config_path):
+        try:
+            with open(config_path, encoding="utf-8") as f:
+                _merge(registry, json.load(f), config_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 전략 설정 파일 오류 ({config_path}): {e}")
+    return registry
+
+
+STRATEGIES = load_registry()
+
+
+def get_signal_function(name):
+    """전략 이름 → 실거래 시그널 함수 (LazyFunction)"""
+    return LazyFunction(STRATEGIES[name]["signal"])
+
+
+def get_compute_function(name):
+    """전략 이름 → 벡터화 시그널 함수 (등록이 없으면 strategies/<name>.py 의 compute_<name>_signals)"""
+    spec = STRATEGIES.get(name, {})
+    path = spec.get("compute") or f"autobot_trader.strategies.{name}:compute_{name}_signals"
+    return load_object(path)
+
+
+def get_stream_class(name):
+    """전략 이름 → 증분 스트림 클래스 (없으면 None)"""
+    path = STRATEGIES.get(name, {}).get("stream")
+    return load_object(path) if path else None
+
+
+def get_lookback(names):
+    """전략들이 시그널 계산에 필요한 마감 봉 수 (가장 긴 워밍업)"""
+    return max((STRATEGIES.get(name, DEFAULTS)["warmup"] for name in names), default=DEFAULTS["warmup"])
+
+
+def has_stream(name):
+    return bool(STRATEGIES.get(name, {}).get("stream"))
@@ -1,25 +1,136 @@
+import asyncio
+import atexit
 import os
-from telegram.ext import ApplicationBuilder, MessageHandler, ContextTypes
-from telegram import Update
-from telegram.ext import filters
+import queue
+import threading
+import time
+
+import requests
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+SEND_TIMEOUT = (3.05, 10)    # (연결, 응답) 초
+COALESCE_SECONDS = 1.0       # 이 시간 안에 쌓인 메시지는 한 통으로 합쳐 전송
+MIN_SEND_INTERVAL = 1.0      # 같은 채팅방 전송 간격 (텔레그램 권장: 채팅방당 초당 1건)
+MAX_MESSAGE_LENGTH = 4096    # 텔레그램 메시지 최대 길이
+MAX_RETRIES = 5
+MAX_BACKOFF = 30.0
+QUEUE_SIZE = 1000
+
+
+class TelegramNotifier:
+    """전송 큐 + 백그라운드 스레드. send() 는 큐에 넣고 바로 반환하므로 주문 흐름이 기다리지 않음"""
+
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.session = None
+        self.thread = None
+        self.start_lock = threading.Lock()
+        self.last_sent = 0.0
+
+    def send(self, message):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            print(f"⚠️ 알림 큐가 가득 차 메시지를 버립니다: {message[:50]}")
+
+    def flush(self, timeout=10.0):
+        """큐에 남은 메시지가 전송될 때까지 최대 timeout 초 대기 (종료 직전 호출)"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def _ensure_started(self):
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        self.session = requests.Session()
+        self.session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + COALESCE_SECONDS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                for text in self._pack(batch):
+                    self._deliver(text)
+            except Exception as e:
+                print(f"❌ Telegram 전송 실패: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    @staticmethod
+    def _pack(messages):
+        """여러 메시지를 최대 길이 안에서 빈 줄로 이어 붙임"""
+        chunks, current = [], ""
+        for message in messages:
+            for start in range(0, max(len(message), 1), MAX_MESSAGE_LENGTH):
+                part = message[start:start + MAX_MESSAGE_LENGTH]
+                if current and len(current) + 2 + len(part) > MAX_MESSAGE_LENGTH:
+                    chunks.append(current)
+                    current = ""
+                current = f"{current}\n\n{part}" if current else part
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _deliver(self, text):
+        url = f"https://api.telegram.org/bot{os.getenv('TELEGRAM_TOKEN')}/sendMessage"
+        payload = {
+            "chat_id": os.getenv("TELEGRAM_CHAT_ID"),
+            "text": text,
+            "parse_mode": "HTML"
+        }
+        backoff = 1.0
+        for attempt in range(1, MAX_RETRIES + 1):
+            wait = self.last_sent + MIN_SEND_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                response = self.session.post(url, data=payload, timeout=SEND_TIMEOUT)
+                self.last_sent = time.monotonic()
+                if response.ok:
+                    return
+                if response.status_code == 429:
+                    # 텔레그램이 알려 준 대기 시간만큼 쉬고 재시도
+                    retry_after = response.json().get("parameters", {}).get("retry_after", backoff)
+                    time.sleep(float(retry_after))
+                    continue
+                if response.status_code < 500:
+                    print(f"❌ Telegram 전송 실패: {response.status_code} {response.text[:200]}")
+                    return
+                error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = e
+            print(f"⚠️ Telegram 전송 재시도 {attempt}/{MAX_RETRIES}: {error}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+        print(f"❌ Telegram 전송 포기: {text[:50]}")
+
+
+notifier = TelegramNotifier()
+atexit.register(notifier.flush)
+
 def send_message(message):
-    import requests
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "HTML"
-    }
-    try:
-        requests.post(url, data=payload)
-    except Exception as e:
-        print(f"❌ Telegram 전송 실패: {e}")
+    # 큐에 넣고 바로 반환 (전송은 백그라운드 스레드가 담당)
+    notifier.send(message)
 
 def listen_for_commands(handler_function):
+    from telegram import Update
+    from telegram.ext import ApplicationBuilder, MessageHandler, ContextTypes, filters
+
     async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         text = update.message.text
         handler_function(text)
@@ -28,3 +139,29 @@ def listen_for_commands(handler_function):
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     print("🤖 텔레그램 명령어 수신 대기 중...")
     app.run_polling()
+
+async def start_command_listener(handler_function, executor=None):
+    """실행 중인 이벤트 루프에서 명령어 수신 시작 (run_polling 과 달리 바로 반환) → app
+
+    핸들러는 executor 스레드에서 실행되어 이벤트 루프(전략 실행)를 막지 않는다.
+    python-telegram-bot 은 여기서 처음 import 한다 (알림 전송만 쓰는 스크립트는 읽지 않음).
+    """
+    from telegram import Update
+    from telegram.ext import ApplicationBuilder, MessageHandler, ContextTypes, filters
+
+    async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, handler_function, update.message.text)
+
+    app = ApplicationBuilder().token(os.getenv("TELEGRAM_TOKEN")).build()
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message, block=False))
+    await app.initialize()
+    await app.start()
+    await app.updater.start_polling()
+    print("🤖 텔레그램 명령어 수신 대기 중...")
+    return app
+
+async def stop_command_listener(app):
+    await app.updater.stop()
+    await app.stop()
+    await app.shutdown()
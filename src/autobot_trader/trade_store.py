@@ -0,0 +1,323 @@
+# src/autobot_trader/trade_store.py
+# 거래 기록 SQLite 저장소
+# - 스레드별로 연결을 하나씩 유지 (매 호출마다 connect/close 하지 않음)
+# - WAL 모드: 전략 스레드의 쓰기와 명령어 조회가 서로 막지 않음
+# - (ticker, strategy, timestamp) 복합 인덱스로 최근 거래 조회를 인덱스 탐색 한 번으로 처리
+# - 스키마 버전(PRAGMA user_version) 기반 마이그레이션으로 기존 trade_history.db 도 자동 갱신
+# - 전략/티커별 손익 집계(pnl_summary)와 FIFO 미청산 로트(open_lots)를 거래 저장과 같은 트랜잭션에서 갱신
+
+import sqlite3
+import threading
+from datetime import datetime
+
+DB_PATH = "trade_history.db"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+MIGRATIONS = [
+    # 1: 기존 trades 테이블 + 최근 거래 조회용 복합 인덱스
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            ticker TEXT,
+            side TEXT,
+            volume REAL,
+            price REAL,
+            strategy TEXT
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_trades_ticker_strategy_time ON trades (ticker, strategy, timestamp)",
+    ],
+    # 2: 손익 집계 + FIFO 로트 (기존 거래로 채움)
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS pnl_summary (
+            strategy TEXT,
+            ticker TEXT,
+            buy_value REAL DEFAULT 0,
+            sell_value REAL DEFAULT 0,
+            realized_pnl REAL DEFAULT 0,
+            open_volume REAL DEFAULT 0,
+            open_cost REAL DEFAULT 0,
+            trade_count INTEGER DEFAULT 0,
+            last_trade TEXT,
+            PRIMARY KEY (strategy, ticker)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS open_lots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            strategy TEXT,
+            ticker TEXT,
+            timestamp TEXT,
+            volume REAL,
+            price REAL
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_open_lots_strategy_ticker ON open_lots (strategy, ticker, id)",
+        lambda conn: rebuild_pnl(conn),
+    ],
+    # 3: 실제 체결 수수료 + 거래소 주문 ID (기존 거래는 수수료 0)
+    [
+        "ALTER TABLE trades ADD COLUMN fee REAL DEFAULT 0",
+        "ALTER TABLE trades ADD COLUMN order_uuid TEXT",
+    ],
+    # 4: 리스크 엔진 트레일링 스탑용 보유 중 최고가
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS position_peaks (
+            strategy TEXT,
+            ticker TEXT,
+            peak_price REAL,
+            PRIMARY KEY (strategy, ticker)
+        )
+        ''',
+    ],
+    # 5: 잔고 대사로 줄인 전략 포지션 기록 (rebuild_pnl 이 거래 사이에 다시 적용)
+    [
+        '''
+        CREATE TABLE IF NOT EXISTS position_adjustments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            strategy TEXT,
+            ticker TEXT,
+            volume REAL,
+            after_trade_id INTEGER,
+            reason TEXT
+        )
+        ''',
+    ],
+]
+
+# 자주 쓰는 쿼리는 고정 문자열로 두어 연결별 statement 캐시에서 재사용
+INSERT_TRADE = '''
+    INSERT INTO trades (timestamp, ticker, side, volume, price, strategy, fee, order_uuid)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+SELECT_LAST_TRADE = '''
+    SELECT timestamp, side FROM trades
+    WHERE ticker = ? AND strategy = ?
+    ORDER BY timestamp DESC LIMIT 1
+'''
+SELECT_OPEN_LOTS = "SELECT id, volume, price FROM open_lots WHERE strategy = ? AND ticker = ? ORDER BY id"
+INSERT_LOT = "INSERT INTO open_lots (strategy, ticker, timestamp, volume, price) VALUES (?, ?, ?, ?, ?)"
+UPDATE_LOT = "UPDATE open_lots SET volume = ? WHERE id = ?"
+DELETE_LOT = "DELETE FROM open_lots WHERE id = ?"
+REDUCE_OPEN = '''
+    UPDATE pnl_summary SET open_volume = MAX(open_volume - ?, 0), open_cost = MAX(open_cost - ?, 0)
+    WHERE strategy = ? AND ticker = ?
+'''
+INSERT_ADJUSTMENT = '''
+    INSERT INTO position_adjustments (timestamp, strategy, ticker, volume, after_trade_id, reason)
+    VALUES (?, ?, ?, ?, (SELECT COALESCE(MAX(id), 0) FROM trades), ?)
+'''
+UPSERT_PNL = '''
+    INSERT INTO pnl_summary (strategy, ticker, buy_value, sell_value, realized_pnl, open_volume, open_cost, trade_count, last_trade)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
+    ON CONFLICT (strategy, ticker) DO UPDATE SET
+        buy_value = buy_value + excluded.buy_value,
+        sell_value = sell_value + excluded.sell_value,
+        realized_pnl = realized_pnl + excluded.realized_pnl,
+        open_volume = MAX(open_volume + excluded.open_volume, 0),
+        open_cost = MAX(open_cost + excluded.open_cost, 0),
+        trade_count = trade_count + 1,
+        last_trade = MAX(COALESCE(last_trade, ''), excluded.last_trade)
+'''
+SELECT_OPEN_POSITIONS = '''
+    SELECT p.strategy, p.ticker, p.open_volume, p.open_cost, k.peak_price
+    FROM pnl_summary p
+    LEFT JOIN position_peaks k ON k.strategy = p.strategy AND k.ticker = p.ticker
+    WHERE p.open_volume > 1e-12
+'''
+UPSERT_PEAK = '''
+    INSERT INTO position_peaks (strategy, ticker, peak_price) VALUES (?, ?, ?)
+    ON CONFLICT (strategy, ticker) DO UPDATE SET peak_price = excluded.peak_price
+'''
+SELECT_PNL_BY_STRATEGY = '''
+    SELECT strategy, SUM(buy_value), SUM(sell_value), SUM(realized_pnl),
+           SUM(open_cost), SUM(trade_count), MAX(last_trade)
+    FROM pnl_summary GROUP BY strategy
+'''
+
+_local = threading.local()
+_migrate_lock = threading.Lock()
+
+
+def get_connection():
+    """현재 스레드 전용 연결 (최초 호출 시 생성 + 마이그레이션)"""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        conn = sqlite3.connect(DB_PATH, timeout=10, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        migrate(conn)
+        _local.conn = conn
+        _local.path = DB_PATH
+    return conn
+
+
+def migrate(conn):
+    """user_version 이후의 마이그레이션만 순서대로 적용
+
+    sqlite3 모듈은 DDL 앞에서 트랜잭션을 시작하지 않으므로 BEGIN/COMMIT 을 직접 실행한다.
+    → 스키마 변경과 user_version 갱신이 한 트랜잭션 (중간에 실패하면 둘 다 롤백)
+    """
+    with _migrate_lock:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            if conn.in_transaction:
+                conn.commit()
+            conn.execute("BEGIN")
+            try:
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"🗄️ 거래 DB 스키마 v{target} 적용")
+
+
+def now_str():
+    return datetime.now().strftime(TIME_FORMAT)
+
+
+def insert_trade(ticker, side, volume, price, strategy, timestamp=None, fee=0.0, order_uuid=None):
+    conn = get_connection()
+    with conn:
+        timestamp = timestamp or now_str()
+        conn.execute(INSERT_TRADE, (timestamp, ticker, side, volume, price, strategy, fee, order_uuid))
+        apply_fill(conn, timestamp, ticker, side, volume, price, strategy, fee)
+
+
+def insert_trades(rows):
+    """(timestamp, ticker, side, volume, price, strategy[, fee, order_uuid]) 여러 건을 한 트랜잭션으로 저장"""
+    rows = [tuple(row) + (0.0, None)[len(row) - 6:] for row in rows]
+    conn = get_connection()
+    with conn:
+        conn.executemany(INSERT_TRADE, rows)
+        for row in rows:
+            apply_fill(conn, *row[:7])
+
+
+def apply_fill(conn, timestamp, ticker, side, volume, price, strategy, fee=0.0):
+    """체결 1건을 FIFO 로트와 손익 집계에 반영 (호출자의 트랜잭션 안에서 실행)
+
+    매수 수수료는 로트 원가에 포함하고, 매도 수수료는 실현손익에서 뺀다.
+    """
+    volume, price, fee = float(volume or 0), float(price or 0), float(fee or 0)
+    value = volume * price
+    if side == "buy":
+        cost = value + fee
+        conn.execute(INSERT_LOT, (strategy, ticker, timestamp, volume, cost / volume if volume else price))
+        conn.execute(UPSERT_PNL, (strategy, ticker, value, 0, 0, volume, cost, timestamp))
+        return
+
+    # 매도: 가장 오래된 매수 로트부터 차감하며 실현손익 계산
+    matched_volume, matched_cost = consume_lots(conn, strategy, ticker, volume)
+    realized = matched_volume * price - matched_cost
+    if volume:
+        realized -= fee * matched_volume / volume
+    # 매수 기록이 없는 수량(추적 이전 보유분)은 원가를 알 수 없어 실현손익에서 제외
+    conn.execute(UPSERT_PNL, (strategy, ticker, 0, value, realized, -matched_volume, -matched_cost, timestamp))
+
+
+def consume_lots(conn, strategy, ticker, volume):
+    """오래된 로트부터 volume 만큼 차감 → (차감된 수량, 차감된 원가)"""
+    remaining, matched_volume, matched_cost = volume, 0.0, 0.0
+    for lot_id, lot_volume, lot_price in conn.execute(SELECT_OPEN_LOTS, (strategy, ticker)).fetchall():
+        if remaining <= 0:
+            break
+        matched = min(lot_volume, remaining)
+        matched_volume += matched
+        matched_cost += matched * lot_price
+        remaining -= matched
+        if lot_volume - matched > 1e-12:
+            conn.execute(UPDATE_LOT, (lot_volume - matched, lot_id))
+        else:
+            conn.execute(DELETE_LOT, (lot_id,))
+    return matched_volume, matched_cost
+
+
+def apply_adjustment(conn, strategy, ticker, volume):
+    """손익 없이 포지션 수량만 줄임 (거래소 잔고가 장부보다 적을 때)"""
+    matched_volume, matched_cost = consume_lots(conn, strategy, ticker, float(volume or 0))
+    conn.execute(REDUCE_OPEN, (matched_volume, matched_cost, strategy, ticker))
+
+
+def adjust_position(strategy, ticker, volume, reason):
+    conn = get_connection()
+    with conn:
+        conn.execute(INSERT_ADJUSTMENT, (now_str(), strategy, ticker, volume, reason))
+        apply_adjustment(conn, strategy, ticker, volume)
+
+
+def rebuild_pnl(conn):
+    """trades 전체로 손익 집계와 FIFO 로트를 다시 계산 (마이그레이션/복구용)"""
+    conn.execute("DELETE FROM pnl_summary")
+    conn.execute("DELETE FROM open_lots")
+    # v2 마이그레이션 시점에는 fee 컬럼이 아직 없음
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(trades)")}
+    fee = "COALESCE(fee, 0)" if "fee" in columns else "0"
+    rows = conn.execute(f"SELECT id, timestamp, ticker, side, volume, price, strategy, {fee} FROM trades ORDER BY id").fetchall()
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    adjustments = []
+    if "position_adjustments" in tables:
+        adjustments = conn.execute(
+            "SELECT after_trade_id, strategy, ticker, volume FROM position_adjustments ORDER BY after_trade_id, id"
+        ).fetchall()
+    pending = 0
+    for trade_id, *row in rows:
+        while pending < len(adjustments) and adjustments[pending][0] < trade_id:
+            apply_adjustment(conn, *adjustments[pending][1:])
+            pending += 1
+        apply_fill(conn, *row)
+    for adjustment in adjustments[pending:]:
+        apply_adjustment(conn, *adjustment[1:])
+
+
+def get_last_trade(ticker, strategy):
+    """(마지막 거래 시각 문자열, side) 또는 None"""
+    return get_connection().execute(SELECT_LAST_TRADE, (ticker, strategy)).fetchone()
+
+
+def get_pnl_summary():
+    """전략별 손익 집계 (실현손익 내림차순)
+
+    각 항목: strategy, buy_value, sell_value, realized_pnl, open_cost, trade_count, last_trade
+    """
+    rows = get_connection().execute(SELECT_PNL_BY_STRATEGY).fetchall()
+    keys = ("strategy", "buy_value", "sell_value", "realized_pnl", "open_cost", "trade_count", "last_trade")
+    summary = [dict(zip(keys, row)) for row in rows]
+    return sorted(summary, key=lambda item: item["realized_pnl"], reverse=True)
+
+
+def get_open_positions(strategy=None, ticker=None):
+    """미청산 포지션 (전략/티커별 FIFO 잔여 수량과 원가, 저장된 최고가)
+
+    각 항목: strategy, ticker, volume, cost, peak_price (저장된 값이 없으면 None)
+    """
+    query, params = SELECT_OPEN_POSITIONS, ()
+    if strategy is not None:
+        query += " AND p.strategy = ? AND p.ticker = ?"
+        params = (strategy, ticker)
+    keys = ("strategy", "ticker", "volume", "cost", "peak_price")
+    return [dict(zip(keys, row)) for row in get_connection().execute(query, params).fetchall()]
+
+
+def save_peaks(rows):
+    """(strategy, ticker, peak_price) 여러 건 저장"""
+    conn = get_connection()
+    with conn:
+        conn.executemany(UPSERT_PEAK, rows)
+
+
+def delete_peak(strategy, ticker):
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM position_peaks WHERE strategy = ? AND ticker = ?", (strategy, ticker))
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+from autobot_trader.async_runner import AsyncStrategyRunner, RateLimiter
+
+
+def run_submitted(runner, calls):
+    async def main():
+        tasks = [runner.submit(key, func, *args) for key, func, *args in calls]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+
+def test_concurrency_is_bounded():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+
+    runner = AsyncStrategyRunner(None, max_concurrency=2, rate=1000)
+    run_submitted(runner, [(f"job{i}", work) for i in range(6)])
+
+    assert state["peak"] == 2
+    assert sum(report["runs"] for report in runner.latency_report().values()) == 6
+
+
+def test_rate_limiter_spaces_starts():
+    starts = []
+
+    async def main():
+        limiter = RateLimiter(20)
+
+        async def start():
+            await limiter.wait()
+            starts.append(time.monotonic())
+
+        await asyncio.gather(*(start() for _ in range(5)))
+
+    asyncio.run(main())
+
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.05 - 0.01
+    assert starts[-1] - starts[0] >= 0.2 - 0.01
+
+
+def test_failing_job_does_not_stop_others():
+    done = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    runner = AsyncStrategyRunner(None, max_concurrency=2, rate=1000)
+    run_submitted(runner, [("bad", fail), ("good1", done.append, 1), ("good2", done.append, 2)])
+
+    assert sorted(done) == [1, 2]
+    assert set(runner.latency_report()) == {"bad", "good1", "good2"}
+
+
+def test_run_forever_keeps_running_after_job_error():
+    runs = {"bad": 0, "good": 0}
+
+    def run_func(name, func, ticker):
+        runs[name] += 1
+        func()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    runner = AsyncStrategyRunner(run_func, rate=1000)
+    runner.add_job("bad", fail, "KRW-BTC", every=0.05)
+    runner.add_job("good", lambda: None, "KRW-BTC", every=0.05)
+
+    async def main():
+        try:
+            await asyncio.wait_for(runner.run_forever(), timeout=0.3)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(main())
+
+    assert runs["bad"] >= 2
+    assert runs["good"] >= 2
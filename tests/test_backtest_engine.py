@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from autobot_trader.backtest_engine import run_backtest, summarize
+
+
+def frame(rows):
+    """[(close, high, low)] → 1분봉 OHLCV"""
+    return pd.DataFrame(
+        [{"open": close, "high": high, "low": low, "close": close, "volume": 1.0} for close, high, low in rows],
+        index=pd.date_range("2024-01-01 09:00", periods=len(rows), freq="min"),
+    )
+
+
+def backtest(df, signals, **kwargs):
+    options = {"budget": 10_000, "fee": 0.0, "slippage": 0.0, "take_profit": 0.05, "stop_loss": -0.03, "cooldown": 0}
+    options.update(kwargs)
+    return run_backtest(df, "rsi", signals=signals, **options)
+
+
+def test_take_profit_and_stop_loss_use_high_and_low():
+    df = frame([(100, 100, 100), (101, 106, 100), (100, 100, 100), (99, 100, 96), (99, 99, 99)])
+    trades, equity = backtest(df, ["buy", None, "buy", None, None])
+    assert list(trades["side"]) == ["buy", "sell", "buy", "sell"]
+    assert list(trades["reason"]) == ["signal", "take_profit", "signal", "stop_loss"]
+    assert trades["price"].iloc[1] == pytest.approx(105.0)   # 목표가에 체결 (봉 고가 106 이 아니라)
+    assert trades["price"].iloc[3] == pytest.approx(97.0)    # 손절가에 체결 (봉 저가 96 이 아니라)
+    # 두 번째 매수는 예산(10,000) 만큼만 → 익절 수익 500 은 현금으로 남음
+    assert equity["equity"].iloc[-1] == pytest.approx(10_500 - 10_000 * 0.03)
+
+
+def test_fee_and_slippage():
+    df = frame([(100, 100, 100), (102, 102, 102)])
+    trades, equity = backtest(df, ["buy", "sell"], fee=0.001, slippage=0.01)
+    buy, sell = trades.iloc[0], trades.iloc[1]
+    assert buy["price"] == pytest.approx(101.0)
+    assert buy["value"] + buy["fee"] == pytest.approx(10_000)
+    assert sell["price"] == pytest.approx(102 * 0.99)
+    assert sell["fee"] == pytest.approx(sell["value"] * 0.001)
+    assert sell["pnl"] == pytest.approx(sell["value"] - sell["fee"] - 10_000)
+    assert equity["cash"].iloc[-1] == pytest.approx(10_000 + sell["pnl"])
+    assert summarize(trades, equity)["trade_count"] == 1
+
+
+def test_cooldown_only_blocks_repeat_buys_while_holding():
+    df = frame([(100, 100, 100)] * 4)
+    # 보유 중 재매수는 쿨다운으로 막힘
+    trades, _ = backtest(df, ["buy", "buy", None, None], budget=5_000, initial_cash=20_000, cooldown=10)
+    assert list(trades["side"]) == ["buy"]
+    # 매도 후에는 쿨다운과 관계없이 바로 다시 매수 (실거래 러너와 동일)
+    trades, _ = backtest(df, ["buy", "sell", "buy", None], cooldown=10)
+    assert list(trades["side"]) == ["buy", "sell", "buy"]
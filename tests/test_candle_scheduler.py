@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from autobot_trader.candle_scheduler import CandleScheduler, next_candle_close
+
+KST = timezone(timedelta(hours=9))
+
+
+def ts(*args):
+    return datetime(*args, tzinfo=KST).timestamp()
+
+
+@pytest.mark.parametrize("interval, now, expected", [
+    ("minute1", ts(2024, 3, 6, 10, 15, 30), ts(2024, 3, 6, 10, 16)),
+    ("minute15", ts(2024, 3, 6, 10, 15), ts(2024, 3, 6, 10, 30)),   # 경계 시각이면 다음 봉 마감
+    ("minute60", ts(2024, 3, 6, 10, 59, 59), ts(2024, 3, 6, 11)),
+    ("minute240", ts(2024, 3, 6, 10, 0), ts(2024, 3, 6, 13)),      # 4시간봉은 KST 09/13/17/21/01/05시
+    ("day", ts(2024, 3, 6, 8, 59), ts(2024, 3, 6, 9)),             # 일봉은 KST 09:00 마감
+    ("day", ts(2024, 3, 6, 9, 0), ts(2024, 3, 7, 9)),
+    ("week", ts(2024, 3, 6, 12), ts(2024, 3, 11, 9)),               # 수요일 → 다음 월요일 09:00
+    ("week", ts(2024, 3, 11, 8, 59), ts(2024, 3, 11, 9)),
+    ("month", ts(2024, 2, 15, 12), ts(2024, 3, 1, 9)),
+    ("month", ts(2024, 12, 31, 23), ts(2025, 1, 1, 9)),
+    ("month", ts(2025, 1, 1, 8, 59), ts(2025, 1, 1, 9)),
+])
+def test_next_candle_close(interval, now, expected):
+    assert next_candle_close(interval, now) == expected
+
+
+def test_run_pending_runs_due_intervals_once():
+    calls = []
+    scheduler = CandleScheduler(delay=1.0)
+    scheduler.add("minute1", calls.append, "minute1")
+    scheduler.add("minute60", calls.append, "minute60")
+    now = ts(2024, 3, 6, 10, 15, 30)
+    scheduler.next_run = {"minute1": ts(2024, 3, 6, 10, 16) + 1.0, "minute60": ts(2024, 3, 6, 11) + 1.0}
+
+    assert scheduler.run_pending(now) == []
+    assert scheduler.run_pending(ts(2024, 3, 6, 10, 16, 1)) == ["minute1"]
+    assert calls == ["minute1"]
+    assert scheduler.next_run["minute1"] > ts(2024, 3, 6, 10, 16, 1)
+
+
+def test_run_pending_keeps_going_after_job_error():
+    calls = []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    scheduler = CandleScheduler(delay=0.0)
+    scheduler.add("minute1", broken)
+    scheduler.add("minute1", calls.append, "ok")
+    scheduler.next_run["minute1"] = 0.0
+    scheduler.run_pending(1.0)
+    assert calls == ["ok"]
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from autobot_trader import candle_store
+from autobot_trader.candle_store import KST, CandleStore
+
+START = pd.Timestamp("2024-01-01 12:00:30")
+
+
+class FakeUpbit:
+    """현재 시각까지 1분봉을 돌려주는 pyupbit.get_ohlcv 대역 (마지막 봉은 형성 중)"""
+
+    def __init__(self):
+        self.now = START
+        self.calls = []
+
+    def get_ohlcv(self, ticker, interval="day", count=200, to=None):
+        self.calls.append(count)
+        end = self.now.floor("min") if to is None else pd.Timestamp(to) - pd.Timedelta(minutes=1)
+        index = pd.date_range(end=end, periods=count, freq="min")
+        close = [float(ts.hour * 60 + ts.minute) for ts in index]
+        return pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close, "volume": 1.0, "value": close},
+            index=index,
+        )
+
+
+@pytest.fixture
+def upbit(monkeypatch):
+    fake = FakeUpbit()
+    monkeypatch.setattr(candle_store.pyupbit, "get_ohlcv", fake.get_ohlcv)
+    monkeypatch.setattr(candle_store, "now_kst", lambda: fake.now.to_pydatetime())
+    monkeypatch.setattr(
+        candle_store.time, "time", lambda: fake.now.to_pydatetime().replace(tzinfo=KST).timestamp()
+    )
+    return fake
+
+
+def test_cache_hit_skips_fetch_until_candle_closes(upbit, tmp_path):
+    store = CandleStore(cache_dir=str(tmp_path))
+    first = store.get_ohlcv("KRW-BTC", interval="minute1", count=5)
+    upbit.now = START + pd.Timedelta(seconds=20)
+    second = store.get_ohlcv("KRW-BTC", interval="minute1", count=5)
+
+    assert upbit.calls == [5]
+    pd.testing.assert_frame_equal(first, second)
+
+    # 디스크에는 마감된 봉만 남음
+    reloaded = CandleStore(cache_dir=str(tmp_path)).get_ohlcv("KRW-BTC", interval="minute1", count=5, offline=True)
+    assert reloaded.index[-1] == pd.Timestamp("2024-01-01 11:59")
+
+
+def test_tail_fetches_only_missing_candles(upbit, tmp_path):
+    store = CandleStore(cache_dir=str(tmp_path))
+    store.get_ohlcv("KRW-BTC", interval="minute1", count=5)
+    upbit.now = START + pd.Timedelta(minutes=2)
+    df = store.get_ohlcv("KRW-BTC", interval="minute1", count=5)
+
+    # 12:00 봉(형성 중이던 봉) 재조회 + 12:01, 12:02 + 여유 1개
+    assert upbit.calls == [5, 4]
+    assert list(df.index) == list(pd.date_range("2024-01-01 11:58", periods=5, freq="min"))
+    assert df["close"].iloc[-1] == 12 * 60 + 2
+
+
+def test_stale_cache_refetches_only_requested_count(upbit, tmp_path):
+    store = CandleStore(cache_dir=str(tmp_path))
+    store.get_ohlcv("KRW-BTC", interval="minute1", count=5)
+    upbit.now = START + pd.Timedelta(days=2)
+    df = store.get_ohlcv("KRW-BTC", interval="minute1", count=5)
+
+    assert upbit.calls == [5, 5]
+    assert len(store.entries[("KRW-BTC", "minute1")]["frame"]) == 5
+    assert df.index[-1] == upbit.now.floor("min")
+    assert df.index.to_series().diff().dropna().eq(pd.Timedelta(minutes=1)).all()
+
+
+def test_closed_candles_drop_forming_bar(upbit, tmp_path, monkeypatch):
+    monkeypatch.setattr(candle_store, "store", CandleStore(cache_dir=str(tmp_path)))
+    df = upbit.get_ohlcv("KRW-BTC", interval="minute1", count=3)
+
+    assert len(candle_store.closed_candles(df, "minute1", now=datetime(2024, 1, 1, 12, 0, 30))) == 2
+    assert len(candle_store.closed_candles(df, "minute1", now=datetime(2024, 1, 1, 12, 1))) == 3
+
+    closed = candle_store.get_closed_ohlcv("KRW-BTC", interval="minute1", count=3)
+    assert upbit.calls[-1] == 4
+    assert list(closed.index) == list(pd.date_range("2024-01-01 11:57", periods=3, freq="min"))
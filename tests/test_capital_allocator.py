@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autobot_trader import capital_allocator, trade_store
+from autobot_trader.capital_allocator import CapitalAllocator
+
+
+class FakeSnapshot:
+    def __init__(self, cash):
+        self.cash = cash
+
+    def get_balance(self, currency):
+        return self.cash
+
+
+def make_allocator(cash, policy="fixed", budgets=None):
+    allocator = CapitalAllocator(FakeSnapshot(cash), budgets=budgets or {"rsi": 10_000, "momentum": 10_000}, policy=policy)
+    allocator.refresh(force=True)
+    return allocator
+
+
+def test_reservations_cannot_overdraw_cash():
+    allocator = make_allocator(25_000)
+    first = allocator.reserve("rsi", 20_000)
+    second = allocator.reserve("momentum", 20_000)   # 남은 5,000 만 예약
+    assert allocator.reserved(first) == 20_000
+    assert allocator.reserved(second) == 5_000
+    assert allocator.reserve("rsi", 10_000) is None  # 최소 주문 금액 미만
+    assert allocator.available() == 0
+    assert allocator.status()["by_strategy"] == {"rsi": 20_000, "momentum": 5_000}
+
+
+def test_release_refunds_unspent_part():
+    allocator = make_allocator(50_000)
+    reservation = allocator.reserve("rsi", 20_000)
+    allocator.release(reservation, spent=12_345.0)
+    assert allocator.available() == pytest.approx(50_000 - 12_345.0)
+    failed = allocator.reserve("rsi", 20_000)
+    allocator.release(failed)                        # 주문 실패 → 전액 반환
+    assert allocator.available() == pytest.approx(50_000 - 12_345.0)
+    allocator.credit(1_000.0)                        # 매도 대금
+    assert allocator.available() == pytest.approx(50_000 - 12_345.0 + 1_000.0)
+
+
+def test_reserve_without_balance_returns_none():
+    allocator = make_allocator(None)
+    assert allocator.reserve("rsi", 10_000) is None
+    assert allocator.available() is None
+
+
+def test_fixed_budget_scales_down_with_cash():
+    assert make_allocator(100_000).budget("rsi") == 10_000
+    assert make_allocator(10_000).budget("rsi") == 5_000   # 현금 / 기준 예산 합계 = 0.5
+
+
+def test_performance_budget_weights_realized_return(monkeypatch):
+    monkeypatch.setattr(trade_store, "get_pnl_summary", lambda: [
+        {"strategy": "rsi", "buy_value": 100_000, "realized_pnl": 20_000},
+        {"strategy": "momentum", "buy_value": 100_000, "realized_pnl": -90_000},
+    ])
+    allocator = make_allocator(100_000, policy="performance")
+    assert allocator.budget("rsi") == 12_000
+    assert allocator.budget("momentum") == 5_000            # 하한 0.5
+    assert allocator.budget("unknown") == 10_000
+
+
+def test_volatility_budget_targets_daily_volatility(monkeypatch):
+    rng = np.random.default_rng(0)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, capital_allocator.VOLATILITY_LOOKBACK + 1))
+    df = pd.DataFrame({"close": closes})
+    monkeypatch.setattr(capital_allocator, "get_ohlcv", lambda *args, **kwargs: df)
+    monkeypatch.setattr(capital_allocator, "STRATEGY_INTERVALS", {"rsi": "day"})
+    allocator = make_allocator(1_000_000, policy="volatility")
+
+    daily = np.std(np.diff(closes) / closes[:-1])
+    expected = np.clip(capital_allocator.TARGET_DAILY_VOLATILITY / daily, 0.5, 2.0)
+    assert allocator.weight("rsi", "KRW-BTC") == pytest.approx(expected)
+    assert allocator.budget("rsi", "KRW-BTC") == int(10_000 * expected)
+
+    # 캐시된 캔들이 부족하면 기본 가중치
+    monkeypatch.setattr(capital_allocator, "get_ohlcv", lambda *args, **kwargs: None)
+    assert allocator.budget("rsi", "KRW-BTC") == 10_000
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        CapitalAllocator(FakeSnapshot(0), policy="random")
@@ -0,0 +1,73 @@
+import pytest
+
+from autobot_trader.grid_executor import GridExecutor
+from autobot_trader.grid_state import GridStateStore
+
+
+class FakeAllocator:
+    def __init__(self, cash):
+        self.cash = cash
+        self.amounts = {}
+
+    def reserve(self, strategy, amount):
+        self.amounts[len(self.amounts) + 1] = amount
+        return len(self.amounts)
+
+    def reserved(self, reservation):
+        return self.amounts[reservation]
+
+    def release(self, reservation, spent=0.0):
+        self.cash -= spent
+
+    def credit(self, amount):
+        self.cash += amount
+
+
+class FakeExecutor:
+    """지정가 주문을 받은 가격 그대로 전부 체결 (수수료 0.05%)"""
+
+    def __init__(self):
+        self.orders = {}
+
+    def place_orders(self, orders, strategy=None):
+        results = []
+        for order in orders:
+            order_uuid = f"uuid-{len(self.orders)}"
+            self.orders[order_uuid] = order
+            results.append({"uuid": order_uuid, "price": str(order["price"])})
+        return results
+
+    def get_orders(self, uuids, ticker=None):
+        return {
+            order_uuid: {
+                "uuid": order_uuid, "state": "done", "ord_type": "limit",
+                "side": "bid" if self.orders[order_uuid]["side"] == "buy" else "ask",
+                "price": self.orders[order_uuid]["price"],
+                "executed_volume": self.orders[order_uuid]["volume"],
+                "paid_fee": self.orders[order_uuid]["price"] * self.orders[order_uuid]["volume"] * 0.0005,
+            }
+            for order_uuid in uuids
+        }
+
+    def cancel_orders(self, uuids):
+        return list(uuids)
+
+
+def test_buy_reserved_at_tick_price_and_fee_debited(tmp_path):
+    store = GridStateStore(str(tmp_path / "grid"), str(tmp_path / "none.json"), recorded_volume=lambda ticker: 0.0)
+    allocator = FakeAllocator(1_000_000.0)
+    executor = FakeExecutor()
+    grid = GridExecutor(executor, store, allocator)
+    # 레벨 가격 80,123 / 81,123 ... → 호가 단위(10원) 로 내림한 가격으로 주문
+    signal = {"grid_low": 80_123.0, "grid_step": 1_000.0, "price": 90_000.0, "amount": 10_000}
+    grid.rebalance("grid_trading", "KRW-BTC", signal)
+    prices = sorted(order["price"] for order in executor.orders.values())
+    assert prices == [80_120, 81_120, 82_120, 83_120]
+
+    spent = sum(order["price"] * order["volume"] for order in executor.orders.values())
+    assert allocator.cash == pytest.approx(1_000_000.0 - spent)
+
+    grid.sync("grid_trading", "KRW-BTC")
+    # 전부 체결 → 미체결 반환 없이 수수료만 추가 차감
+    assert allocator.cash == pytest.approx(1_000_000.0 - spent * 1.0005)
+    assert all(info["state"] == "held" and info["filled"] for info in store.holdings("KRW-BTC").values())
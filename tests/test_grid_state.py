@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from autobot_trader.grid_state import LEGACY_TICKER, GridStateStore
+from autobot_trader.strategies.grid_trading import plan_grid_orders
+
+
+def level(state="held", quantity=1.0, buy_price=100.0, **extra):
+    return {"state": state, "uuid": None, "buy_price": buy_price, "quantity": quantity, "timestamp": "t", **extra}
+
+
+def make_store(tmp_path, volume=0.0, compact_every=1000):
+    return GridStateStore(
+        root=str(tmp_path / "grid_state"),
+        legacy_file=str(tmp_path / "grid_state.json"),
+        compact_every=compact_every,
+        recorded_volume=lambda ticker: volume,
+    )
+
+
+def test_journal_replay(tmp_path):
+    store = make_store(tmp_path)
+    store.put("KRW-BTC", 0, level("buy_wait"))
+    store.put("KRW-BTC", 0, level("held", filled=True))
+    store.put("KRW-BTC", 1, level("buy_wait"))
+    store.put("KRW-ETH", 2, level("held"))
+    assert store.close("KRW-BTC", 1)["state"] == "buy_wait"
+    assert store.close("KRW-BTC", 1) is None
+    store.close_files()
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.holdings("KRW-BTC") == {0: level("held", filled=True)}
+    assert sorted(reloaded.tickers()) == ["KRW-BTC", "KRW-ETH"]
+    assert reloaded.seq == store.seq
+
+
+def test_compaction_writes_snapshot_and_truncates_journal(tmp_path):
+    store = make_store(tmp_path, compact_every=3)
+    for i in range(4):
+        store.put("KRW-BTC", i, level(quantity=i + 1.0))
+    store.close_files()
+
+    with open(store.snapshot_path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["seq"] == 3
+    assert set(snapshot["tickers"]["KRW-BTC"]) == {"0", "1", "2"}
+    with open(store.journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+    reloaded = make_store(tmp_path)
+    assert sorted(reloaded.holdings("KRW-BTC")) == [0, 1, 2, 3]
+    assert reloaded.holdings("KRW-BTC")[3]["quantity"] == 4.0
+
+
+def test_replay_skips_entries_already_in_snapshot(tmp_path):
+    store = make_store(tmp_path)
+    store.put("KRW-BTC", 0, level())
+    store.close("KRW-BTC", 0)
+    store.close_files()
+    # 스냅샷을 쓴 직후 저널을 비우기 전에 종료된 경우: 스냅샷 seq 이하 저널 줄은 다시 적용하지 않음
+    with open(store.journal_path, encoding="utf-8") as f:
+        journal = f.read()
+    store.compact()
+    store.close_files()
+    with open(store.journal_path, "w", encoding="utf-8") as f:
+        f.write(journal + '{"op": "put", "ticker": "KRW-BTC", "level": 1, "info": {"state": "held"}, "seq": 3}\n{"op"')
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.holdings("KRW-BTC") == {1: {"state": "held"}}
+    assert reloaded.seq == 3
+
+
+def write_legacy(tmp_path, levels):
+    with open(tmp_path / "grid_state.json", "w", encoding="utf-8") as f:
+        json.dump({f"level_{lv}": {"buy_price": 100.0, "quantity": qty, "timestamp": "t"} for lv, qty in levels}, f)
+
+
+@pytest.mark.parametrize("volume, states", [
+    (0.0, {0: "inactive", 1: "inactive"}),
+    (1.0, {0: "held", 1: "inactive"}),
+    (3.0, {0: "held", 1: "held"}),
+])
+def test_legacy_levels_held_only_when_recorded(tmp_path, volume, states):
+    write_legacy(tmp_path, [(0, 1.0), (1, 2.0)])
+    store = make_store(tmp_path, volume=volume)
+    holdings = store.holdings(LEGACY_TICKER)
+    assert {lv: info["state"] for lv, info in holdings.items()} == states
+    assert all(info.get("filled") for info in holdings.values() if info["state"] == "held")
+    assert not (tmp_path / "grid_state.json").exists()
+    assert (tmp_path / "grid_state.json.migrated").exists()
+
+
+def test_legacy_open_entries_replay_as_inactive(tmp_path):
+    store = make_store(tmp_path)
+    store.put("KRW-BTC", 0, level("held", filled=True, quantity=1.0))
+    store.close_files()
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        for seq, lv in ((2, 1), (3, 2)):
+            f.write(json.dumps({"op": "open", "ticker": "KRW-BTC", "level": lv, "buy_price": 90.0,
+                                "quantity": 1.0, "timestamp": "t", "seq": seq}) + "\n")
+
+    # 거래 DB 보유 2.0 중 1.0 은 이미 추적 중인 레벨 0 몫 → 이전 형식 레벨은 하나만 보유로 인정
+    reloaded = make_store(tmp_path, volume=2.0)
+    states = {lv: info["state"] for lv, info in reloaded.holdings("KRW-BTC").items()}
+    assert states == {0: "held", 1: "held", 2: "inactive"}
+
+
+def test_plan_skips_unconfirmed_levels_and_caps_sells():
+    signal = {"grid_low": 80.0, "grid_step": 10.0, "price": 200.0, "amount": 1000}
+    holdings = {
+        0: level("held", quantity=1.0, filled=True),
+        1: level("held", quantity=1.0),                 # 체결 기록 없음
+        2: level("inactive", quantity=1.0),
+        3: level("sell_wait", quantity=1.0, filled=True, sell_volume=0.5),
+    }
+    orders, cancels = plan_grid_orders(signal, holdings, volume=1.0)
+    sells = [order for order in orders if order["side"] == "sell"]
+    buys = [order["level"] for order in orders if order["side"] == "buy"]
+    assert sells == [{"level": 0, "side": "sell", "price": 140.0, "volume": 0.5}]
+    assert buys == [2]
+    assert cancels == []
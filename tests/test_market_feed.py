@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autobot_trader.market_feed import CLOSE_GRACE_MS, CandleBuilder, MarketFeed, ReplayServer, ohlcv_to_trades
+
+MINUTE = 60_000
+
+
+def trade(ts_ms, price, volume=1.0, ticker="KRW-BTC"):
+    return json.dumps({
+        "type": "trade", "code": ticker, "trade_price": price, "trade_volume": volume, "trade_timestamp": ts_ms,
+    })
+
+
+def test_replay_feed_matches_source_ohlcv():
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, 6))
+    df = pd.DataFrame({
+        "open": close + 0.5, "high": close + 2.0, "low": close - 2.0, "close": close, "volume": rng.random(6) + 1,
+    }, index=pd.date_range("2024-01-01 09:00", periods=6, freq="min"))
+    candles = []
+
+    async def scenario():
+        server = ReplayServer(ohlcv_to_trades(df, "KRW-BTC", "minute1"), port=0, speed=0)
+        ws_server = await server.start()
+        feed = MarketFeed(["KRW-BTC"], ["minute1"], on_candle=lambda *args: candles.append(args),
+                          url=f"ws://localhost:{server.port}")
+        task = asyncio.create_task(feed.run())
+        try:
+            for _ in range(100):
+                if len(candles) >= 4:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            task.cancel()
+            ws_server.close()
+            await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    # 첫 봉은 연결 직후 만든 봉이라 전달하지 않고, 마지막 봉은 다음 체결이 없어 아직 열려 있음
+    expected = df.iloc[1:5]
+    assert [timestamp for _, _, timestamp, _ in candles[:4]] == list(expected.index)
+    for (ticker, interval, _, candle), (_, row) in zip(candles, expected.iterrows()):
+        assert (ticker, interval) == ("KRW-BTC", "minute1")
+        for column in ("open", "high", "low", "close", "volume"):
+            assert candle[column] == pytest.approx(row[column])
+
+
+def test_builder_skips_partial_first_candle_and_late_trades():
+    builder = CandleBuilder("KRW-BTC", "minute1")
+    builder.add_trade(30_000, 100.0, 1.0)
+    assert builder.add_trade(MINUTE, 101.0, 1.0) is None   # 중간부터 받은 첫 봉은 버림
+    builder.add_trade(MINUTE + 10_000, 105.0, 2.0)
+    assert builder.add_trade(MINUTE - 1, 1.0, 100.0) is None  # 이미 닫은 봉의 늦은 체결
+    builder.add_trade(MINUTE + 20_000, 99.0, 1.0)
+
+    assert builder.close_if_due(2 * MINUTE + CLOSE_GRACE_MS - 1) is None
+    timestamp, candle = builder.close_if_due(2 * MINUTE + CLOSE_GRACE_MS)
+    assert timestamp == pd.Timestamp("1970-01-01 09:01")
+    assert (candle["open"], candle["high"], candle["low"], candle["close"]) == (101.0, 105.0, 99.0, 99.0)
+    assert candle["volume"] == pytest.approx(4.0)
+    assert builder.close_if_due(10 * MINUTE) is None
+
+
+def test_reset_drops_open_candle_across_reconnect():
+    candles = []
+    feed = MarketFeed(["KRW-BTC"], ["minute1"], on_candle=lambda *args: candles.append(args))
+    feed.connected = True
+    for ts, price in ((0, 100.0), (MINUTE, 101.0), (2 * MINUTE, 102.0)):
+        feed.handle_message(trade(ts, price))
+    assert [candle["close"] for *_, candle in candles] == [101.0]
+    assert feed.covers("KRW-BTC", "minute1", now_ms=2 * MINUTE + 1000)
+
+    # 끊긴 동안의 체결이 빠진 봉(2분 봉)은 버리고, 재연결 후 첫 봉도 REST 에 맡김
+    feed.connected = False
+    feed.reset()
+    assert feed.exchange_now_ms() is None
+    feed.connected = True
+    for ts, price in ((5 * MINUTE + 30_000, 110.0), (6 * MINUTE, 111.0), (7 * MINUTE, 112.0)):
+        feed.handle_message(trade(ts, price))
+    assert [candle["close"] for *_, candle in candles] == [101.0, 111.0]
+    assert not feed.covers("KRW-BTC", "minute1", now_ms=6 * MINUTE + 1000)
+    assert feed.covers("KRW-BTC", "minute1", now_ms=7 * MINUTE + 1000)
+    assert not feed.covers("KRW-BTC", "minute5", now_ms=7 * MINUTE + 1000)
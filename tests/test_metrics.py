@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from autobot_trader.metrics import equity_curve, exit_returns, pair_trades, summarize_trades
+
+
+def signals(rows):
+    return pd.DataFrame(rows, columns=["time", "ticker", "strategy", "signal", "price"]).assign(
+        time=lambda df: pd.to_datetime(df["time"])
+    )
+
+
+def test_two_buys_one_sell_is_one_trade():
+    df = signals([
+        ("2024-01-01", "KRW-BTC", "rsi", "buy", 100.0),
+        ("2024-01-02", "KRW-BTC", "rsi", "buy", 100.0),
+        ("2024-01-03", "KRW-BTC", "rsi", "sell", 150.0),
+    ])
+    trades = pair_trades(df, fee=0.0)
+    assert len(trades) == 2
+    assert list(trades["return_pct"]) == pytest.approx([50.0, 50.0])
+
+    # 두 랏을 각각 복리로 쌓으면 125% 가 되지만, 같은 매도로 청산된 한 거래이므로 50%
+    summary = summarize_trades(trades)
+    assert summary["total_return"] == pytest.approx(50.0)
+    assert summary["trade_count"] == 1
+    assert list(exit_returns(trades)) == pytest.approx([50.0])
+    assert list(equity_curve(trades)["cumulative"]) == pytest.approx([1.5, 1.5])
+
+
+def test_lots_averaged_then_compounded_with_drawdown():
+    df = signals([
+        ("2024-01-01", "KRW-BTC", "rsi", "buy", 100.0),
+        ("2024-01-02", "KRW-BTC", "rsi", "buy", 200.0),
+        ("2024-01-03", "KRW-BTC", "rsi", "sell", 150.0),   # +50%, -25% → 평균 +12.5%
+        ("2024-01-04", "KRW-BTC", "rsi", "buy", 150.0),
+        ("2024-01-05", "KRW-BTC", "rsi", "sell", 120.0),   # -20%
+    ])
+    trades = equity_curve(pair_trades(df, fee=0.0))
+    assert list(trades["cumulative"]) == pytest.approx([1.125, 1.125, 0.9])
+    summary = summarize_trades(trades)
+    assert summary["total_return"] == pytest.approx(-10.0)
+    assert summary["mdd"] == pytest.approx(-20.0)
+    assert summary["win_rate"] == pytest.approx(50.0)
@@ -0,0 +1,95 @@
+import pytest
+import requests
+
+from autobot_trader import order_executor
+from autobot_trader.order_executor import OrderError, OrderExecutor, summarize_order
+
+
+class FakeApi:
+    """_request 대체: (method, path) 별로 준비한 응답/예외를 순서대로 돌려줌"""
+
+    def __init__(self, responses):
+        self.responses = {key: list(values) for key, values in responses.items()}
+        self.calls = []
+
+    def __call__(self, method, path, params):
+        self.calls.append((method, path, dict(params)))
+        result = self.responses[(method, path)].pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def count(self, method, path):
+        return sum(1 for call in self.calls if call[:2] == (method, path))
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(order_executor.time, "sleep", lambda seconds: None)
+    return OrderExecutor("access", "secret")
+
+
+def market_params():
+    return {"market": "KRW-BTC", "side": "bid", "price": "10000", "ord_type": "price", "identifier": "rsi-KRW-BTC-bid-1"}
+
+
+def test_timeout_then_lookup_finds_order_without_second_post(executor):
+    placed = {"uuid": "u1", "identifier": "rsi-KRW-BTC-bid-1", "state": "wait"}
+    executor._request = api = FakeApi({
+        ("POST", "/orders"): [requests.Timeout("read timeout")],
+        ("GET", "/order"): [placed],
+    })
+    assert executor._place(market_params()) == placed
+    assert api.count("POST", "/orders") == 1
+    assert api.calls[1][2] == {"identifier": "rsi-KRW-BTC-bid-1"}
+
+
+def test_retryable_error_resends_same_identifier(executor):
+    executor._request = api = FakeApi({
+        ("POST", "/orders"): [OrderError(500, "server"), {"uuid": "u2"}],
+        ("GET", "/order"): [OrderError(404, "not found")],
+    })
+    assert executor._place(market_params()) == {"uuid": "u2"}
+    posts = [params for method, path, params in api.calls if method == "POST"]
+    assert len(posts) == 2 and posts[0]["identifier"] == posts[1]["identifier"]
+
+
+def test_non_retryable_error_is_not_resent(executor):
+    executor._request = api = FakeApi({
+        ("POST", "/orders"): [OrderError(400, "insufficient_funds")],
+        ("GET", "/order"): [OrderError(404, "not found")],
+    })
+    with pytest.raises(OrderError) as excinfo:
+        executor._place(market_params())
+    assert excinfo.value.status == 400
+    assert api.count("POST", "/orders") == 1
+
+
+def test_summarize_order_uses_trades():
+    order = {
+        "uuid": "u1", "side": "bid", "state": "done", "paid_fee": "5.5", "executed_volume": "0.3",
+        "trades": [
+            {"price": "100", "volume": "0.1", "funds": "10"},
+            {"price": "110", "volume": "0.2"},   # funds 가 없으면 가격 × 수량
+        ],
+    }
+    fill = summarize_order(order)
+    assert fill["executed_volume"] == pytest.approx(0.3)
+    assert fill["funds"] == pytest.approx(32.0)
+    assert fill["avg_price"] == pytest.approx(32.0 / 0.3)
+    assert fill["fee"] == pytest.approx(5.5)
+    assert fill["side"] == "buy" and fill["filled"]
+
+
+def test_summarize_order_without_trades():
+    batch = {"uuid": "u2", "side": "ask", "state": "done", "executed_volume": "2", "executed_funds": "250"}
+    assert summarize_order(batch)["avg_price"] == pytest.approx(125.0)
+
+    limit = {"uuid": "u3", "side": "bid", "state": "cancel", "ord_type": "limit", "price": "90", "executed_volume": "1.5"}
+    fill = summarize_order(limit)
+    assert fill["funds"] == pytest.approx(135.0)
+    assert fill["avg_price"] == pytest.approx(90.0)
+    assert fill["side"] == "buy" and fill["fee"] == 0.0
+
+    empty = summarize_order({"uuid": "u4", "side": "bid", "state": "cancel"})
+    assert empty["avg_price"] == 0.0 and not empty["filled"]
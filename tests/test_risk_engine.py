@@ -0,0 +1,96 @@
+import pytest
+
+from autobot_trader import risk_engine, trade_store
+from autobot_trader.risk_engine import RiskEngine
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_store, "DB_PATH", str(tmp_path / "trades.db"))
+    return trade_store.get_connection()
+
+
+def buy(strategy, ticker, volume, price):
+    trade_store.insert_trade(ticker, "buy", volume, price, strategy, "2024-01-01 00:00:00")
+
+
+def make_engine(exits, **kwargs):
+    engine = RiskEngine(
+        on_exit=lambda *args: exits.append(args),
+        take_profit=0.05, stop_loss=-0.03, trailing_stop=0.02, min_order=5000, **kwargs,
+    )
+    engine.load()
+    return engine
+
+
+def test_each_exit_fires_once_and_exclude_is_honoured(db):
+    buy("rsi", "KRW-BTC", 1.0, 100_000.0)
+    buy("momentum", "KRW-BTC", 1.0, 90_000.0)
+    buy("bollinger", "KRW-ETH", 1.0, 10_000.0)
+    buy("grid_trading", "KRW-BTC", 1.0, 100_000.0)
+    exits = []
+    engine = make_engine(exits, exclude=["grid_trading"])
+    assert {(p["strategy"], p["ticker"]) for p in engine.positions()} == {
+        ("rsi", "KRW-BTC"), ("momentum", "KRW-BTC"), ("bollinger", "KRW-ETH"),
+    }
+
+    engine.on_price("KRW-BTC", 96_000.0)   # rsi -4% 손절, momentum +6.7% 익절
+    engine.on_price("KRW-BTC", 95_000.0)   # 재요청 대기 중 → 다시 요청하지 않음
+    engine.check_prices({"KRW-BTC": 94_000.0, "KRW-ETH": 10_100.0})
+    assert sorted((strategy, ticker) for strategy, ticker, _, _ in exits) == [
+        ("momentum", "KRW-BTC"), ("rsi", "KRW-BTC"),
+    ]
+    reasons = {strategy: reason for strategy, _, _, reason in exits}
+    assert reasons["rsi"].startswith("손절") and reasons["momentum"].startswith("익절")
+
+    # 트레일링 스탑: +3% 고점 뒤 고점 대비 -2% 에서 한 번만
+    engine.on_price("KRW-ETH", 10_300.0)
+    engine.on_price("KRW-ETH", 10_090.0)
+    engine.on_price("KRW-ETH", 10_050.0)
+    assert [(strategy, reason[:4]) for strategy, _, _, reason in exits[2:]] == [("bollinger", "트레일링")]
+
+
+def test_retry_after_delay_when_position_remains(db, monkeypatch):
+    buy("rsi", "KRW-BTC", 1.0, 100_000.0)
+    exits = []
+    engine = make_engine(exits)
+    clock = [1000.0]
+    monkeypatch.setattr(risk_engine.time, "monotonic", lambda: clock[0])
+    engine.on_price("KRW-BTC", 90_000.0)
+    clock[0] += risk_engine.EXIT_RETRY_SECONDS - 1
+    engine.on_price("KRW-BTC", 90_000.0)
+    assert len(exits) == 1
+    clock[0] += 1
+    engine.on_price("KRW-BTC", 90_000.0)
+    assert len(exits) == 2
+
+
+def test_dust_position_is_flagged_not_retried(db, monkeypatch):
+    buy("rsi", "KRW-BTC", 0.00004, 100_000.0)   # 4,000원어치
+    exits = []
+    engine = make_engine(exits)
+    clock = [1000.0]
+    monkeypatch.setattr(risk_engine.time, "monotonic", lambda: clock[0])
+    for _ in range(3):
+        engine.on_price("KRW-BTC", 90_000.0)
+        clock[0] += risk_engine.EXIT_RETRY_SECONDS * 2
+    assert exits == []
+
+    # 추가 매수로 최소 주문 금액을 넘으면 다시 감시
+    buy("rsi", "KRW-BTC", 0.1, 100_000.0)
+    engine.sync("rsi", "KRW-BTC")
+    engine.on_price("KRW-BTC", 90_000.0)
+    assert [(strategy, ticker) for strategy, ticker, _, _ in exits] == [("rsi", "KRW-BTC")]
+
+
+def test_peak_is_persisted_and_reloaded(db):
+    buy("rsi", "KRW-BTC", 1.0, 100_000.0)
+    engine = make_engine([])
+    engine.on_price("KRW-BTC", 104_000.0)
+    engine.save()
+
+    exits = []
+    reloaded = make_engine(exits)
+    assert reloaded.positions()[0]["peak"] == pytest.approx(104_000.0)
+    reloaded.on_price("KRW-BTC", 101_900.0)   # 재시작 후에도 저장된 고점 기준 트레일링 스탑
+    assert len(exits) == 1
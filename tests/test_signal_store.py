@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+from autobot_trader import signal_store
+from autobot_trader.signal_store import SignalRecorder, read_signals, write_signals
+
+
+def test_write_read_round_trip_partitions_by_day(tmp_path):
+    times = ["2024-01-01 09:00", "2024-01-01 15:30", "2024-01-02 10:00", "2024-02-01 00:00"]
+    write_signals("rsi", times, ["KRW-BTC", "KRW-ETH", "KRW-BTC", "KRW-XRP"],
+                  ["buy", "sell", None, "buy"], [100.0, 2.5, 101.0, 0.7], root=str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path / "rsi")) == ["2024-01-01", "2024-01-02", "2024-02-01"]
+
+    df = read_signals("rsi", root=str(tmp_path))
+    assert list(df.columns) == signal_store.COLUMNS
+    assert list(df["time"]) == list(pd.to_datetime(times))
+    assert list(df["ticker"].astype(str)) == ["KRW-BTC", "KRW-ETH", "KRW-BTC", "KRW-XRP"]
+    assert list(df["signal"]) == ["buy", "sell", None, "buy"]
+    assert list(df["price"]) == [100.0, 2.5, 101.0, 0.7]
+    assert (df["strategy"] == "rsi").all()
+
+    ranged = read_signals("rsi", root=str(tmp_path), start="2024-01-01 12:00", end="2024-01-02")
+    assert list(ranged["time"]) == [pd.Timestamp("2024-01-01 15:30")]
+
+
+def test_recorder_buffers_until_flush(tmp_path):
+    recorder = SignalRecorder(str(tmp_path), flush_rows=3, flush_seconds=None)
+    recorder.append("2024-01-01 09:02", "KRW-BTC", "rsi", "sell", 102.0)
+    recorder.append("2024-01-01 09:01", "KRW-BTC", "rsi", "buy", 101.0)
+    assert read_signals("rsi", root=str(tmp_path)).empty
+
+    recorder.append("2024-01-01 09:03", "KRW-BTC", "momentum", "buy", 103.0)
+    df = read_signals("rsi", root=str(tmp_path))
+    # 파트 파일 안의 순서와 관계없이 시간순으로 반환
+    assert list(df["signal"]) == ["buy", "sell"]
+    assert len(read_signals("momentum", root=str(tmp_path))) == 1
+
+
+def test_legacy_csv_fallback(tmp_path):
+    legacy = tmp_path / "signal_log.csv"
+    legacy.write_text(
+        "2024-01-01 09:05:00,KRW-BTC,rsi,sell,105.0\n"
+        "2024-01-01 09:00:00,KRW-BTC,rsi,buy,100.0\n"
+    )
+
+    df = read_signals("rsi", root=str(tmp_path / "signals"), legacy_csv=str(legacy))
+    assert list(df["signal"]) == ["buy", "sell"]
+    assert list(df["price"]) == [100.0, 105.0]
+
+    # 새 형식 파트가 생기면 CSV 는 읽지 않음
+    write_signals("rsi", ["2024-01-02 09:00"], ["KRW-BTC"], ["buy"], [110.0], root=str(tmp_path / "signals"))
+    df = read_signals("rsi", root=str(tmp_path / "signals"), legacy_csv=str(legacy))
+    assert list(df["price"]) == [110.0]
+
+    assert read_signals("rsi", root=str(tmp_path / "none")).empty
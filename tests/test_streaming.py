@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autobot_trader.strategies.grid_trading import compute_grid_levels
+from autobot_trader.strategy_registry import get_compute_function, get_stream_class
+
+VECTORIZED = ["moving_average", "rsi", "bollinger", "trend_following", "volatility_breakout", "momentum"]
+
+
+@pytest.fixture(scope="module")
+def ohlcv():
+    rng = np.random.default_rng(0)
+    n = 400
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.5, n)
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(close, open_) + rng.random(n),
+        "low": np.minimum(close, open_) - rng.random(n),
+        "close": close,
+        "volume": rng.random(n),
+    }, index=pd.date_range("2024-01-01", periods=n, freq="min"))
+
+
+def push_all(stream, df):
+    return [stream.update(candle, timestamp, amount=1000) for timestamp, candle in zip(df.index, df.to_dict("records"))]
+
+
+@pytest.mark.parametrize("name", VECTORIZED)
+def test_stream_matches_vectorized(name, ohlcv):
+    expected = [signal if isinstance(signal, str) else None for signal in get_compute_function(name)(ohlcv)["signal"]]
+    stream = get_stream_class(name)()
+    actual = [result["signal"] if result else None for result in push_all(stream, ohlcv)]
+    # 스트림은 워밍업 봉 수가 차기 전에는 시그널을 내지 않음
+    start = stream.warmup - 1
+    assert any(expected[start:])
+    assert actual[start:] == expected[start:]
+
+
+def test_grid_stream_matches_grid_levels(ohlcv):
+    grid = compute_grid_levels(ohlcv)
+    results = push_all(get_stream_class("grid_trading")(), ohlcv)
+    checked = 0
+    for result, (_, row) in zip(results, grid.iterrows()):
+        if result is None:
+            continue
+        assert result["grid_low"] == pytest.approx(row["grid_low"])
+        assert result["grid_step"] == pytest.approx(row["grid_step"])
+        assert result["level"] == row["level"]
+        checked += 1
+    assert checked == len(ohlcv) - grid["grid_low"].isna().sum()
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+from autobot_trader import trade_store
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_store, "DB_PATH", str(tmp_path / "trades.db"))
+    return trade_store.get_connection()
+
+
+def open_lots(conn, strategy="rsi", ticker="KRW-BTC"):
+    return conn.execute(trade_store.SELECT_OPEN_LOTS, (strategy, ticker)).fetchall()
+
+
+def pnl_row(conn, strategy="rsi", ticker="KRW-BTC"):
+    return conn.execute(
+        "SELECT realized_pnl, open_volume, open_cost FROM pnl_summary WHERE strategy = ? AND ticker = ?",
+        (strategy, ticker),
+    ).fetchone()
+
+
+def test_fifo_partial_sells(db):
+    trade_store.insert_trade("KRW-BTC", "buy", 1.0, 100.0, "rsi", "2024-01-01 00:00:00")
+    trade_store.insert_trade("KRW-BTC", "buy", 1.0, 200.0, "rsi", "2024-01-01 00:01:00")
+
+    # 첫 로트 절반만 매도
+    trade_store.insert_trade("KRW-BTC", "sell", 0.5, 300.0, "rsi", "2024-01-01 00:02:00")
+    assert [(volume, price) for _, volume, price in open_lots(db)] == [(0.5, 100.0), (1.0, 200.0)]
+    realized, volume, cost = pnl_row(db)
+    assert realized == pytest.approx(100.0)
+    assert volume == pytest.approx(1.5)
+    assert cost == pytest.approx(250.0)
+
+    # 첫 로트 나머지 + 두 번째 로트 절반
+    trade_store.insert_trade("KRW-BTC", "sell", 1.0, 300.0, "rsi", "2024-01-01 00:03:00")
+    assert [(volume, price) for _, volume, price in open_lots(db)] == [(0.5, 200.0)]
+    realized, volume, cost = pnl_row(db)
+    assert realized == pytest.approx(100.0 + 300.0 - (50.0 + 100.0))
+    assert volume == pytest.approx(0.5)
+    assert cost == pytest.approx(100.0)
+
+    positions = trade_store.get_open_positions("rsi", "KRW-BTC")
+    assert positions[0]["volume"] == pytest.approx(0.5)
+    assert positions[0]["cost"] == pytest.approx(100.0)
+
+
+def test_fees_in_cost_and_realized(db):
+    trade_store.insert_trade("KRW-BTC", "buy", 2.0, 100.0, "rsi", "2024-01-01 00:00:00", fee=2.0)
+    trade_store.insert_trade("KRW-BTC", "sell", 1.0, 150.0, "rsi", "2024-01-01 00:01:00", fee=1.0)
+    realized, volume, cost = pnl_row(db)
+    # 로트 단가 = (200 + 2) / 2 = 101, 매도 수수료 1 차감
+    assert realized == pytest.approx(150.0 - 101.0 - 1.0)
+    assert cost == pytest.approx(101.0)
+
+
+def test_rebuild_matches_incremental(db):
+    rows = [
+        ("2024-01-01 00:00:00", "KRW-BTC", "buy", 1.0, 100.0, "rsi", 0.1, None),
+        ("2024-01-01 00:01:00", "KRW-BTC", "buy", 2.0, 110.0, "rsi", 0.2, None),
+        ("2024-01-01 00:02:00", "KRW-BTC", "sell", 1.5, 120.0, "rsi", 0.15, None),
+        ("2024-01-01 00:03:00", "KRW-ETH", "buy", 3.0, 10.0, "momentum", 0.0, None),
+    ]
+    trade_store.insert_trades(rows)
+    before = pnl_row(db), open_lots(db)
+    with db:
+        trade_store.rebuild_pnl(db)
+    after = pnl_row(db), open_lots(db)
+    assert before[0] == pytest.approx(after[0])
+    assert [row[1:] for row in before[1]] == [row[1:] for row in after[1]]
+
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / "broken.db"))
+    broken = trade_store.MIGRATIONS[:1] + [["CREATE TABLE extra (id INTEGER)", "NOT VALID SQL"]]
+    monkeypatch.setattr(trade_store, "MIGRATIONS", broken)
+    with pytest.raises(sqlite3.OperationalError):
+        trade_store.migrate(conn)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "trades" in tables and "extra" not in tables